@@ -289,7 +289,11 @@ class APIEntityStateView(HomeAssistantView):
         status_code = HTTPStatus.CREATED if is_new_state else HTTPStatus.OK
         state = hass.states.get(entity_id)
         assert state
-        resp = self.json(state.as_dict(), status_code)
+        resp = web.Response(
+            body=state.as_dict_json,
+            status=status_code,
+            content_type=CONTENT_TYPE_JSON,
+        )
 
         resp.headers.add("Location", f"/api/states/{entity_id}")
 
@@ -5,6 +5,7 @@ from __future__ import annotations
 from collections.abc import Callable
 from datetime import timedelta
 import logging
+from typing import Any
 
 import voluptuous as vol
 
@@ -130,40 +131,44 @@ async def async_attach_trigger(
     trigger_data = trigger_info["trigger_data"]
     _variables = trigger_info["variables"] or {}
 
-    @callback
-    def state_automation_listener(event: Event[EventStateChangedData]) -> None:
-        """Listen for state changes and calls action."""
-        entity = event.data["entity_id"]
-        from_s = event.data["old_state"]
-        to_s = event.data["new_state"]
+    def _value(state: State | None) -> Any:
+        """Return the state or attribute value the trigger matches."""
+        if state is None:
+            return None
+        if attribute is None:
+            return state.state
+        return state.attributes.get(attribute)
 
-        if from_s is None:
-            old_value = None
-        elif attribute is None:
-            old_value = from_s.state
-        else:
-            old_value = from_s.attributes.get(attribute)
-
-        if to_s is None:
-            new_value = None
-        elif attribute is None:
-            new_value = to_s.state
-        else:
-            new_value = to_s.attributes.get(attribute)
+    @callback
+    def state_change_filter(event_data: EventStateChangedData) -> bool:
+        """Return if a state change matches the trigger."""
+        old_value = _value(event_data["old_state"])
+        new_value = _value(event_data["new_state"])
 
         # When we listen for state changes with `match_all`, we
         # will trigger even if just an attribute changes. When
         # we listen to just an attribute, we should ignore all
         # other attribute changes.
         if attribute is not None and old_value == new_value:
-            return
+            return False
 
-        if (
-            not match_from_state(old_value)
-            or not match_to_state(new_value)
-            or (not match_all and old_value == new_value)
-        ):
-            return
+        return (
+            match_from_state(old_value)
+            and match_to_state(new_value)
+            and (match_all or old_value != new_value)
+        )
+
+    @callback
+    def state_automation_listener(event: Event[EventStateChangedData]) -> None:
+        """Listen for state changes and calls action.
+
+        Only called for state changes that pass state_change_filter.
+        """
+        entity = event.data["entity_id"]
+        from_s = event.data["old_state"]
+        to_s = event.data["new_state"]
+        old_value = _value(from_s)
+        new_value = _value(to_s)
 
         @callback
         def call_action() -> None:
@@ -232,7 +237,9 @@ async def async_attach_trigger(
             entity_ids=entity,
         )
 
-    unsub = async_track_state_change_event(hass, entity_ids, state_automation_listener)
+    unsub = async_track_state_change_event(
+        hass, entity_ids, state_automation_listener, event_filter=state_change_filter
+    )
 
     @callback
     def async_remove() -> None:
@@ -17,7 +17,7 @@ from typing import Any, cast
 from lru import LRU
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
 from homeassistant.core import HomeAssistant, ServiceCall, callback
@@ -25,8 +25,10 @@ from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util.task_stats import TaskStats
 
 from .const import DOMAIN
+from .loop_stats import LoopStats
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -40,6 +42,10 @@ SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
 SERVICE_SET_ASYNCIO_DEBUG = "set_asyncio_debug"
 SERVICE_LOG_CURRENT_TASKS = "log_current_tasks"
+SERVICE_START_LOOP_STATS = "start_loop_stats"
+SERVICE_STOP_LOOP_STATS = "stop_loop_stats"
+SERVICE_START_TASK_STATS = "start_task_stats"
+SERVICE_STOP_TASK_STATS = "stop_task_stats"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -63,17 +69,26 @@ SERVICES = (
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_SET_ASYNCIO_DEBUG,
     SERVICE_LOG_CURRENT_TASKS,
+    SERVICE_START_LOOP_STATS,
+    SERVICE_STOP_LOOP_STATS,
+    SERVICE_START_TASK_STATS,
+    SERVICE_STOP_TASK_STATS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 DEFAULT_MAX_OBJECTS = 5
+DEFAULT_SAMPLE_RATE = 10
+DEFAULT_TOP = 20
 
 CONF_ENABLED = "enabled"
 CONF_SECONDS = "seconds"
 CONF_MAX_OBJECTS = "max_objects"
+CONF_SAMPLE_RATE = "sample_rate"
+CONF_TOP = "top"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
+LOOP_STATS = "loop_stats"
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -260,6 +275,43 @@ async def async_setup_entry(  # noqa: C901
                 if not handle.cancelled():
                     _LOGGER.critical("Scheduled: %s", handle)
 
+    @callback
+    def _async_start_loop_stats(call: ServiceCall) -> None:
+        """Start sampling event loop statistics."""
+        if LOOP_STATS in domain_data:
+            raise HomeAssistantError("Event loop stats already started")
+
+        loop_stats = LoopStats(hass, call.data[CONF_SAMPLE_RATE], call.data[CONF_TOP])
+        loop_stats.async_start()
+        domain_data[LOOP_STATS] = loop_stats
+
+    @callback
+    def _async_stop_loop_stats(call: ServiceCall) -> None:
+        """Stop sampling event loop statistics and log them."""
+        if LOOP_STATS not in domain_data:
+            raise HomeAssistantError("Event loop stats not running")
+
+        loop_stats: LoopStats = domain_data.pop(LOOP_STATS)
+        loop_stats.async_stop()
+        _LOGGER.critical("Event loop stats: %s", loop_stats.async_as_dict())
+
+    @callback
+    def _async_start_task_stats(call: ServiceCall) -> None:
+        """Start accounting tasks and executor jobs per integration."""
+        if hass.task_stats is not None:
+            raise HomeAssistantError("Task stats already started")
+
+        hass.task_stats = TaskStats()
+
+    @callback
+    def _async_stop_task_stats(call: ServiceCall) -> None:
+        """Stop accounting tasks and executor jobs and log the counters."""
+        if (task_stats := hass.task_stats) is None:
+            raise HomeAssistantError("Task stats not running")
+
+        hass.task_stats = None
+        _LOGGER.critical("Task stats: %s", task_stats.as_dict())
+
     async def _async_asyncio_debug(call: ServiceCall) -> None:
         """Enable or disable asyncio debug."""
         enabled = call.data[CONF_ENABLED]
@@ -382,6 +434,48 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_LOOP_STATS,
+        _async_start_loop_stats,
+        schema=vol.Schema(
+            {
+                vol.Optional(CONF_SAMPLE_RATE, default=DEFAULT_SAMPLE_RATE): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=1000)
+                ),
+                vol.Optional(CONF_TOP, default=DEFAULT_TOP): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=100)
+                ),
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_LOOP_STATS,
+        _async_stop_loop_stats,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_TASK_STATS,
+        _async_start_task_stats,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_TASK_STATS,
+        _async_stop_task_stats,
+    )
+
+    websocket_api.async_register_command(hass, websocket_loop_stats)
+    websocket_api.async_register_command(hass, websocket_task_stats)
+    websocket_api.async_register_command(hass, websocket_executor_lanes)
+
     return True
 
 
@@ -391,10 +485,76 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    if LOOP_STATS in hass.data[DOMAIN]:
+        hass.data[DOMAIN][LOOP_STATS].async_stop()
+    hass.task_stats = None
     hass.data.pop(DOMAIN)
     return True
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/loop_stats",
+        vol.Optional("reset", default=False): bool,
+    }
+)
+@callback
+def websocket_loop_stats(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the sampled event loop statistics."""
+    loop_stats: LoopStats | None
+    if (domain_data := hass.data.get(DOMAIN)) is None or (
+        loop_stats := domain_data.get(LOOP_STATS)
+    ) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Event loop stats not running"
+        )
+        return
+    connection.send_result(msg["id"], loop_stats.async_as_dict())
+    if msg["reset"]:
+        loop_stats.async_reset()
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/task_stats",
+        vol.Optional("reset", default=False): bool,
+    }
+)
+@callback
+def websocket_task_stats(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the task and executor job counters per integration."""
+    if (task_stats := hass.task_stats) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Task stats not running"
+        )
+        return
+    connection.send_result(msg["id"], task_stats.as_dict())
+    if msg["reset"]:
+        task_stats.async_reset()
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/executor_lanes"})
+@callback
+def websocket_executor_lanes(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the running and queued executor jobs per integration."""
+    connection.send_result(msg["id"], hass.executor_lanes.as_dict())
+
+
 async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     # Imports deferred to avoid loading modules
     # in memory since usually only one part of this
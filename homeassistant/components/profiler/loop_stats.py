@@ -0,0 +1,188 @@
+"""Sampling event loop statistics for the profiler integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, field
+import functools
+import heapq
+from itertools import count
+from time import perf_counter
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.task_stats import callable_domain, coroutine_domain
+
+# Upper bounds of the histogram buckets in seconds, the last bucket
+# collects everything slower than the last bound
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+LAG_PROBE_INTERVAL = 1.0
+
+
+def _empty_histogram() -> list[int]:
+    """Return an empty histogram."""
+    return [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+
+def _histogram_as_dict(histogram: list[int]) -> dict[str, int]:
+    """Return a histogram keyed by the upper bound of its buckets in ms."""
+    bounds = [f"{bound * 1000:g}" for bound in HISTOGRAM_BUCKETS]
+    return dict(zip([*bounds, "inf"], histogram, strict=True))
+
+
+def _describe_callback(target: Any) -> tuple[str, str]:
+    """Return the domain and name of a callback run by the event loop."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    if isinstance(task := getattr(target, "__self__", None), asyncio.Task):
+        coro = task.get_coro()
+        return coroutine_domain(coro), getattr(coro, "__qualname__", repr(coro))
+    return callable_domain(target), getattr(target, "__qualname__", repr(target))
+
+
+@dataclass(slots=True)
+class DurationStats:
+    """Count, total and histogram of durations."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    histogram: list[int] = field(default_factory=_empty_histogram)
+
+    def add(self, duration: float) -> None:
+        """Add a duration."""
+        self.count += 1
+        self.total += duration
+        self.max = max(duration, self.max)
+        for idx, bound in enumerate(HISTOGRAM_BUCKETS):
+            if duration <= bound:
+                self.histogram[idx] += 1
+                return
+        self.histogram[-1] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats as a dict with durations in ms."""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total * 1000 / self.count, 3) if self.count else 0,
+            "max_ms": round(self.max * 1000, 3),
+            "histogram": _histogram_as_dict(self.histogram),
+        }
+
+
+class LoopStats:
+    """Sample the time spent in event loop callbacks.
+
+    Every sample_rate-th callback run by the event loop is timed and the
+    time is attributed to the integration domain of the callback. The lag
+    of the event loop is probed once per LAG_PROBE_INTERVAL.
+
+    Only one instance can be started at a time since the timing hook is
+    installed on asyncio.Handle.
+    """
+
+    def __init__(self, hass: HomeAssistant, sample_rate: int, top: int) -> None:
+        """Initialize the loop stats."""
+        self._hass = hass
+        self._sample_rate = sample_rate
+        self._top = top
+        self._original_run: Any = None
+        self._lag_handle: asyncio.TimerHandle | None = None
+        self._seq = count()
+        self.started = 0.0
+        self.domains: defaultdict[str, DurationStats] = defaultdict(DurationStats)
+        self.lag = DurationStats()
+        self.slowest: list[tuple[float, int, str, str]] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Install the timing hook and start probing the loop lag."""
+        loop = self._hass.loop
+        original_run = self._original_run = asyncio.Handle._run  # noqa: SLF001
+        sample_rate = self._sample_rate
+        record = self._record
+        calls = count()
+
+        def _timed_run(handle: asyncio.Handle) -> None:
+            if next(calls) % sample_rate or handle._loop is not loop:  # noqa: SLF001
+                original_run(handle)
+                return
+            # Describe the callback before running it since a task
+            # step may finish its coroutine
+            domain, name = _describe_callback(handle._callback)  # noqa: SLF001
+            start = perf_counter()
+            try:
+                original_run(handle)
+            finally:
+                record(domain, name, perf_counter() - start)
+
+        asyncio.Handle._run = _timed_run  # type: ignore[method-assign] # noqa: SLF001
+        self.started = perf_counter()
+        self._schedule_lag_probe()
+
+    @callback
+    def async_stop(self) -> None:
+        """Remove the timing hook and stop probing the loop lag."""
+        if self._original_run is not None:
+            asyncio.Handle._run = self._original_run  # type: ignore[method-assign] # noqa: SLF001
+            self._original_run = None
+        if self._lag_handle is not None:
+            self._lag_handle.cancel()
+            self._lag_handle = None
+
+    @callback
+    def async_reset(self) -> None:
+        """Reset the collected stats."""
+        self.started = perf_counter()
+        self.domains.clear()
+        self.lag = DurationStats()
+        self.slowest.clear()
+
+    def _record(self, domain: str, name: str, duration: float) -> None:
+        """Record the duration of a callback."""
+        self.domains[domain].add(duration)
+        item = (duration, next(self._seq), domain, name)
+        if len(self.slowest) < self._top:
+            heapq.heappush(self.slowest, item)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def _schedule_lag_probe(self) -> None:
+        """Schedule the next loop lag probe."""
+        loop = self._hass.loop
+        when = loop.time() + LAG_PROBE_INTERVAL
+        self._lag_handle = loop.call_at(when, self._lag_probe, when)
+
+    def _lag_probe(self, when: float) -> None:
+        """Record how late the probe ran and schedule the next one."""
+        self.lag.add(max(self._hass.loop.time() - when, 0.0))
+        self._schedule_lag_probe()
+
+    @callback
+    def async_as_dict(self) -> dict[str, Any]:
+        """Return the collected stats."""
+        return {
+            "sample_rate": self._sample_rate,
+            "duration": round(perf_counter() - self.started, 3),
+            "loop_lag": self.lag.as_dict(),
+            "domains": dict(
+                sorted(
+                    (
+                        (domain, stats.as_dict())
+                        for domain, stats in self.domains.items()
+                    ),
+                    key=lambda item: item[1]["total_ms"],
+                    reverse=True,
+                )
+            ),
+            "slowest": [
+                {
+                    "domain": domain,
+                    "callback": name,
+                    "duration_ms": round(duration * 1000, 3),
+                }
+                for duration, _, domain, name in sorted(self.slowest, reverse=True)
+            ],
+        }
@@ -54,6 +54,7 @@ DEFAULT_COMMIT_INTERVAL = 5
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
+CONF_CONTINUOUS_PURGE = "continuous_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
@@ -61,6 +62,7 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_COMMIT_MIN_INTERVAL = "commit_min_interval"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -75,6 +77,18 @@ FILTER_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
 ALLOW_IN_MEMORY_DB = False
 
 
+def validate_commit_min_interval(conf: ConfigType) -> ConfigType:
+    """Validate the commit interval bounds of the adaptive commit interval."""
+    if (min_interval := conf.get(CONF_COMMIT_MIN_INTERVAL)) is not None and (
+        min_interval > conf[CONF_COMMIT_INTERVAL]
+    ):
+        raise vol.Invalid(
+            f"{CONF_COMMIT_MIN_INTERVAL} must not be greater than "
+            f"{CONF_COMMIT_INTERVAL}"
+        )
+    return conf
+
+
 def validate_db_url(db_url: str) -> Any:
     """Validate database URL."""
     # Don't allow on-memory sqlite databases
@@ -96,6 +110,7 @@ CONFIG_SCHEMA = vol.Schema(
                 {
                     vol.Optional(CONF_AUTO_PURGE, default=True): cv.boolean,
                     vol.Optional(CONF_AUTO_REPACK, default=True): cv.boolean,
+                    vol.Optional(CONF_CONTINUOUS_PURGE, default=False): cv.boolean,
                     vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
@@ -104,6 +119,9 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(CONF_COMMIT_MIN_INTERVAL): vol.All(
+                        vol.Coerce(int), vol.Range(min=1)
+                    ),
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -115,6 +133,7 @@ CONFIG_SCHEMA = vol.Schema(
                     ): cv.boolean,
                 }
             ),
+            validate_commit_min_interval,
         )
     },
     extra=vol.ALLOW_EXTRA,
@@ -138,8 +157,10 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     entity_filter = None if _filter.empty_filter else _filter.get_filter()
     auto_purge = conf[CONF_AUTO_PURGE]
     auto_repack = conf[CONF_AUTO_REPACK]
+    continuous_purge = conf[CONF_CONTINUOUS_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    commit_min_interval = conf.get(CONF_COMMIT_MIN_INTERVAL)
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
@@ -158,6 +179,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         auto_repack=auto_repack,
         keep_days=keep_days,
         commit_interval=commit_interval,
+        commit_min_interval=commit_min_interval,
+        continuous_purge=continuous_purge,
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
@@ -0,0 +1,70 @@
+"""Adaptive commit interval of the recorder."""
+
+from __future__ import annotations
+
+from .const import (
+    ADAPTIVE_COMMIT_LATENCY_SHARE,
+    ADAPTIVE_COMMIT_LATENCY_WEIGHT,
+    ADAPTIVE_COMMIT_MAX_PENDING_ROWS,
+)
+
+
+class AdaptiveCommitInterval:
+    """Size the commits of the recorder to its load.
+
+    The interval between commits follows the moving average of the
+    commit latency so the recorder thread spends about
+    ADAPTIVE_COMMIT_LATENCY_SHARE of its time committing. Cheap commits
+    are done often to keep the database fresh, expensive ones are
+    batched. When the queue backlog grows beyond a batch, the interval
+    is doubled since larger batches spread the cost of a commit. The
+    session is committed early once ADAPTIVE_COMMIT_MAX_PENDING_ROWS
+    rows are pending to bound its size.
+
+    The interval stays within min_interval and max_interval.
+
+    All methods except commit_due are called from the recorder thread.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float) -> None:
+        """Initialize the adaptive commit interval."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._commit_latency = 0.0
+        self._first_pending: float | None = None
+
+    def add_pending(self, pending_rows: int, now: float) -> bool:
+        """Account a pending write and return if the session should be committed."""
+        if (first_pending := self._first_pending) is None:
+            self._first_pending = first_pending = now
+        return (
+            pending_rows >= ADAPTIVE_COMMIT_MAX_PENDING_ROWS
+            or now - first_pending >= self.interval
+        )
+
+    def commit_due(self, now: float) -> bool:
+        """Return if a pending write waited for longer than the interval.
+
+        Called from the event loop to commit when no events arrive.
+        """
+        first_pending = self._first_pending
+        return first_pending is not None and now - first_pending >= self.interval
+
+    def committed(self, latency: float, backlog: int) -> None:
+        """Adjust the interval after a commit."""
+        self._first_pending = None
+        if self._commit_latency:
+            latency = (
+                self._commit_latency
+                + (latency - self._commit_latency) * ADAPTIVE_COMMIT_LATENCY_WEIGHT
+            )
+        self._commit_latency = latency
+        interval = latency / ADAPTIVE_COMMIT_LATENCY_SHARE
+        if backlog >= ADAPTIVE_COMMIT_MAX_PENDING_ROWS:
+            interval = max(interval, self.interval * 2)
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+
+    def reset(self) -> None:
+        """Forget the pending writes after the session was closed."""
+        self._first_pending = None
@@ -37,6 +37,7 @@ def ws_info(
         # for the thread state lock which will block the event loop.
         is_running = instance.is_running
         max_backlog = instance.max_backlog
+        commit_interval = instance.effective_commit_interval
     else:
         backlog = None
         migration_in_progress = False
@@ -44,9 +45,11 @@ def ws_info(
         recording = False
         is_running = False
         max_backlog = None
+        commit_interval = None
 
     recorder_info = {
         "backlog": backlog,
+        "commit_interval": commit_interval,
         "max_backlog": max_backlog,
         "migration_in_progress": migration_in_progress,
         "migration_is_live": migration_is_live,
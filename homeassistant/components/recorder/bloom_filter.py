@@ -0,0 +1,101 @@
+"""Bloom filter of the hashes of shared attributes and event data."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+# With 10 bits per item and 7 probes about 1% of the lookups
+# of hashes that are not in a layer are false positives
+BITS_PER_ITEM = 10
+PROBES = 7
+# The first layer is sized for at least this many items, and twice the
+# number of rows in the table to leave room for new rows
+MIN_CAPACITY = 16384
+
+
+class _BloomLayer:
+    """Fixed size bloom filter holding up to capacity hashes."""
+
+    __slots__ = ("_bits", "_size", "capacity", "count")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty layer."""
+        self.capacity = capacity
+        self.count = 0
+        self._size = capacity * BITS_PER_ITEM
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, hash_: int) -> list[int]:
+        """Return the bit positions of a hash.
+
+        The hash is already uniformly distributed, the probes are
+        derived from it by double hashing.
+        """
+        size = self._size
+        step = ((hash_ >> 16 | hash_ << 16) * 0x9E3779B1 & 0xFFFFFFFF) | 1
+        return [(hash_ + probe * step) % size for probe in range(PROBES)]
+
+    def add(self, hash_: int) -> None:
+        """Add a hash to the layer."""
+        bits = self._bits
+        for position in self._positions(hash_):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, hash_: int) -> bool:
+        """Return if the hash may be in the layer."""
+        bits = self._bits
+        return all(
+            bits[position >> 3] & 1 << (position & 7)
+            for position in self._positions(hash_)
+        )
+
+
+class HashBloomFilter:
+    """Remember which 32 bit hashes are in a table.
+
+    A hash that is not in the filter is known not to be in the table
+    so the row can be inserted without looking for a matching row
+    first. Hashes are never removed, a purged row only makes its hash
+    a false positive.
+
+    The false positive rate grows once a layer holds more than its
+    capacity, so a layer of twice the capacity is added instead of
+    loading the hashes of the table again.
+    """
+
+    def __init__(self, count: int) -> None:
+        """Initialize an empty filter sized for a table of count rows."""
+        self._layers = [_BloomLayer(max(count * 2, MIN_CAPACITY))]
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of items the filter holds before it grows."""
+        return sum(layer.capacity for layer in self._layers)
+
+    @property
+    def count(self) -> int:
+        """Return the number of items added to the filter."""
+        return sum(layer.count for layer in self._layers)
+
+    @property
+    def layers(self) -> int:
+        """Return the number of layers of the filter."""
+        return len(self._layers)
+
+    def add(self, hash_: int) -> None:
+        """Add a hash to the filter."""
+        layer = self._layers[-1]
+        if layer.count >= layer.capacity:
+            layer = _BloomLayer(layer.capacity * 2)
+            self._layers.append(layer)
+        layer.add(hash_)
+
+    def update(self, hashes: Iterable[int]) -> None:
+        """Add hashes to the filter."""
+        for hash_ in hashes:
+            self.add(hash_)
+
+    def __contains__(self, hash_: int) -> bool:
+        """Return if the hash may be in the filter."""
+        return any(hash_ in layer for layer in self._layers)
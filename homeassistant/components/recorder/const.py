@@ -30,6 +30,14 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 MAX_QUEUE_BACKLOG_MIN_VALUE = 65000
 MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG = 256 * 1024**2
 
+# The share of its time the recorder thread should spend committing
+# when the commit interval is adaptive
+ADAPTIVE_COMMIT_LATENCY_SHARE = 0.1
+# The weight of the latest commit in the moving average of the latency
+ADAPTIVE_COMMIT_LATENCY_WEIGHT = 0.2
+# The number of pending state and event rows that is committed early
+ADAPTIVE_COMMIT_MAX_PENDING_ROWS = 10000
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
@@ -58,6 +66,7 @@ CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
 LAST_REPORTED_SCHEMA_VERSION = 43
+REF_COUNT_SCHEMA_VERSION = 48
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
@@ -16,7 +16,14 @@ from typing import TYPE_CHECKING, Any, cast
 
 from propcache import cached_property
 import psutil_home_assistant as ha_psutil
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select, update
+from sqlalchemy import (
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    insert,
+    select,
+    update,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import SQLAlchemyError
@@ -50,6 +57,7 @@ from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
 from . import migration, statistics
+from .adaptive_commit import AdaptiveCommitInterval
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
@@ -80,9 +88,11 @@ from .db_schema import (
 from .executor import DBInterruptibleThreadPoolExecutor
 from .migration import (
     EntityIDMigration,
+    EventDataRefCountMigration,
     EventIDPostMigration,
     EventsContextIDMigration,
     EventTypeIDMigration,
+    StateAttributesRefCountMigration,
     StatesContextIDMigration,
 )
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
@@ -92,7 +102,7 @@ from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
-from .table_managers.states import StatesManager
+from .table_managers.states import PendingState, StatesManager
 from .table_managers.states_meta import StatesMetaManager
 from .table_managers.statistics_meta import StatisticsMetaManager
 from .tasks import (
@@ -104,6 +114,7 @@ from .tasks import (
     CompileMissingStatisticsTask,
     DatabaseLockTask,
     ImportStatisticsTask,
+    IncrementalPurgeTask,
     KeepAliveTask,
     PerodicCleanupTask,
     PurgeTask,
@@ -173,6 +184,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        commit_min_interval: int | None = None,
+        continuous_purge: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -183,9 +196,20 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        # Purge in small batches every five minutes instead of purging
+        # a whole day at night
+        self.continuous_purge = continuous_purge
+        self.incremental_purge_pending = False
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
+        # The commit interval adapts to the load between commit_min_interval
+        # and commit_interval when commit_min_interval is set
+        self._adaptive_commit: AdaptiveCommitInterval | None = None
+        if commit_interval and commit_min_interval:
+            self._adaptive_commit = AdaptiveCommitInterval(
+                commit_min_interval, commit_interval
+            )
         self._queue: queue.SimpleQueue[RecorderTask | Event] = queue.SimpleQueue()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -212,6 +236,11 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._event_session_has_pending_writes = False
+        # Event rows with their pending EventTypes and EventData
+        # that will be written at the next commit
+        self._pending_events: list[
+            tuple[dict[str, Any], EventTypes | None, EventData | None]
+        ] = []
 
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
@@ -251,11 +280,24 @@ class Recorder(threading.Thread):
         """Return the number of items in the recorder backlog."""
         return self._queue.qsize()
 
+    @property
+    def effective_commit_interval(self) -> float:
+        """Return the current interval between commits in seconds."""
+        if self._adaptive_commit is None:
+            return self.commit_interval
+        return self._adaptive_commit.interval
+
     @cached_property
     def dialect_name(self) -> SupportedDialect | None:
         """Return the dialect the recorder uses."""
         return self._dialect_name
 
+    @cached_property
+    def _executemany_returning_sorted(self) -> bool:
+        """Return if the database returns the ids of executemany inserts in order."""
+        assert self.engine is not None
+        return self.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+
     @property
     def _using_file_sqlite(self) -> bool:
         """Short version to check if we are using sqlite3 as a file."""
@@ -358,6 +400,13 @@ class Recorder(threading.Thread):
         ):
             self.queue_task(COMMIT_TASK)
 
+    @callback
+    def _async_adaptive_commit(self, now: datetime) -> None:
+        """Queue a commit if the adaptive commit interval passed."""
+        assert self._adaptive_commit is not None
+        if self._adaptive_commit.commit_due(time.monotonic()):
+            self._async_commit(now)
+
     @callback
     def async_add_executor_job[_T](
         self, target: Callable[..., _T], *args: Any
@@ -533,6 +582,14 @@ class Recorder(threading.Thread):
         """Run tasks every five minutes."""
         self.queue_task(ADJUST_LRU_SIZE_TASK)
         self.async_periodic_statistics()
+        if (
+            self.auto_purge
+            and self.continuous_purge
+            and not self.incremental_purge_pending
+        ):
+            self.incremental_purge_pending = True
+            purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
+            self.queue_task(IncrementalPurgeTask(purge_before))
 
     def _adjust_lru_size(self) -> None:
         """Trigger the LRU adjustment.
@@ -643,8 +700,17 @@ class Recorder(threading.Thread):
                 name="Recorder keep alive",
             )
 
+        # If the commit interval is adaptive, we need to check periodically
+        # if a commit is due since no events may arrive to trigger it
+        if adaptive_commit := self._adaptive_commit:
+            self._commit_listener = async_track_time_interval(
+                self.hass,
+                self._async_adaptive_commit,
+                timedelta(seconds=adaptive_commit.min_interval),
+                name="Recorder commit",
+            )
         # If the commit interval is not 0, we need to commit periodically
-        if self.commit_interval:
+        elif self.commit_interval:
             self._commit_listener = async_track_time_interval(
                 self.hass,
                 self._async_commit,
@@ -812,10 +878,16 @@ class Recorder(threading.Thread):
                 EventTypeIDMigration,
                 EntityIDMigration,
                 EventIDPostMigration,
+                StateAttributesRefCountMigration,
+                EventDataRefCountMigration,
             ):
                 migrator = migrator_cls(schema_status.start_version, migration_changes)
                 migrator.do_migrate(self, session)
 
+        # Load the hashes of the shared rows before they are looked up
+        self.state_attributes_manager.queue_load_hash_filter()
+        self.event_data_manager.queue_load_hash_filter()
+
         # We must only set the db ready after we have set the table managers
         # to active if there is no data to migrate.
         #
@@ -1029,30 +1101,37 @@ class Recorder(threading.Thread):
             self._process_state_changed_event_into_session(event)
         else:
             self._process_non_state_changed_event_into_session(event)
-        # Commit if the commit interval is zero
-        if not self.commit_interval:
+        # Commit if the commit interval is zero, or if the adaptive
+        # commit interval passed or its batch is full
+        if not self.commit_interval or (
+            (adaptive_commit := self._adaptive_commit)
+            and self._event_session_has_pending_writes
+            and adaptive_commit.add_pending(
+                len(self._pending_events) + self.states_manager.pending_write_count,
+                time.monotonic(),
+            )
+        ):
             self._commit_event_session_or_retry()
 
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         session = self.event_session
         assert session is not None
-        dbevent = Events.from_event(event)
+        row = Events.row_from_event(event)
 
         # Map the event_type to the EventTypes table
         event_type_manager = self.event_type_manager
-        if pending_event_types := event_type_manager.get_pending(event.event_type):
-            dbevent.event_type_rel = pending_event_types
-        elif event_type_id := event_type_manager.get(event.event_type, session, True):
-            dbevent.event_type_id = event_type_id
-        else:
-            event_types = EventTypes(event_type=event.event_type)
-            event_type_manager.add_pending(event_types)
-            self._add_to_session(session, event_types)
-            dbevent.event_type_rel = event_types
+        event_types = event_type_manager.get_pending(event.event_type)
+        if event_types is None:
+            if event_type_id := event_type_manager.get(event.event_type, session, True):
+                row["event_type_id"] = event_type_id
+            else:
+                event_types = EventTypes(event_type=event.event_type)
+                event_type_manager.add_pending(event_types)
+                self._add_to_session(session, event_types)
 
         if not event.data:
-            self._add_to_session(session, dbevent)
+            self._add_pending_event(row, event_types, None)
             return
 
         event_data_manager = self.event_data_manager
@@ -1062,22 +1141,47 @@ class Recorder(threading.Thread):
         # Map the event data to the EventData table
         shared_data = shared_data_bytes.decode("utf-8")
         # Matching attributes found in the pending commit
-        if pending_event_data := event_data_manager.get_pending(shared_data):
-            dbevent.event_data_rel = pending_event_data
+        if event_data := event_data_manager.get_pending(shared_data):
+            event_data_manager.add_pending_reference(event_data)
         # Matching attributes id found in the cache
         elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
             (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
             and (data_id := event_data_manager.get(shared_data, hash_, session))
         ):
-            dbevent.data_id = data_id
+            row["data_id"] = data_id
+            event_data_manager.add_reference(data_id)
         else:
             # No matching attributes found, save them in the DB
-            dbevent_data = EventData(shared_data=shared_data, hash=hash_)
-            event_data_manager.add_pending(dbevent_data)
-            self._add_to_session(session, dbevent_data)
-            dbevent.event_data_rel = dbevent_data
+            event_data = EventData(shared_data=shared_data, hash=hash_)
+            event_data_manager.add_pending(event_data)
+            self._add_to_session(session, event_data)
 
-        self._add_to_session(session, dbevent)
+        self._add_pending_event(row, event_types, event_data)
+
+    def _add_pending_event(
+        self,
+        row: dict[str, Any],
+        event_types: EventTypes | None,
+        event_data: EventData | None,
+    ) -> None:
+        """Add an event row that will be written at the next commit."""
+        self._event_session_has_pending_writes = True
+        self._pending_events.append((row, event_types, event_data))
+
+    def _write_pending_events(self, session: Session) -> None:
+        """Write the pending events to the session in bulk.
+
+        The EventTypes and EventData of the pending events must have
+        been flushed.
+        """
+        if not (pending_events := self._pending_events):
+            return
+        for row, event_types, event_data in pending_events:
+            if event_types is not None:
+                row["event_type_id"] = event_types.event_type_id
+            if event_data is not None:
+                row["data_id"] = event_data.data_id
+        session.execute(insert(Events), [row for row, _, _ in pending_events])
 
     def _process_state_changed_event_into_session(
         self, event: Event[EventStateChangedData]
@@ -1088,30 +1192,33 @@ class Recorder(threading.Thread):
         entity_removed = not event.data.get("new_state")
         entity_id = event.data["entity_id"]
 
-        dbstate = States.from_event(event)
+        row = States.row_from_event(event)
+        pending_state = PendingState(row)
         old_state = event.data["old_state"]
 
         assert self.event_session is not None
         session = self.event_session
 
         states_manager = self.states_manager
-        if pending_state := states_manager.pop_pending(entity_id):
-            dbstate.old_state = pending_state
-            if old_state:
-                pending_state.last_reported_ts = old_state.last_reported_timestamp
+        if old_pending_state := states_manager.pop_pending(entity_id):
+            pending_state.old_state = old_pending_state
+            if old_state and self.schema_version >= LAST_REPORTED_SCHEMA_VERSION:
+                old_pending_state.row["last_reported_ts"] = (
+                    old_state.last_reported_timestamp
+                )
         elif old_state_id := states_manager.pop_committed(entity_id):
-            dbstate.old_state_id = old_state_id
+            row["old_state_id"] = old_state_id
             if old_state:
                 states_manager.update_pending_last_reported(
                     old_state_id, old_state.last_reported_timestamp
                 )
         if entity_removed:
-            dbstate.state = None
+            row["state"] = None
         else:
-            states_manager.add_pending(entity_id, dbstate)
+            states_manager.add_pending(entity_id, pending_state)
 
         if states_meta_manager.active:
-            dbstate.entity_id = None
+            row["entity_id"] = None
 
         if entity_id is None or not (
             shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
@@ -1120,9 +1227,9 @@ class Recorder(threading.Thread):
 
         # Map the entity_id to the StatesMeta table
         if pending_states_meta := states_meta_manager.get_pending(entity_id):
-            dbstate.states_meta_rel = pending_states_meta
+            pending_state.states_meta = pending_states_meta
         elif metadata_id := states_meta_manager.get(entity_id, session, True):
-            dbstate.metadata_id = metadata_id
+            row["metadata_id"] = metadata_id
         elif states_meta_manager.active and entity_removed:
             # If the entity was removed, we don't need to add it to the
             # StatesMeta table or record it in the pending commit
@@ -1133,14 +1240,14 @@ class Recorder(threading.Thread):
             states_meta = StatesMeta(entity_id=entity_id)
             states_meta_manager.add_pending(states_meta)
             self._add_to_session(session, states_meta)
-            dbstate.states_meta_rel = states_meta
+            pending_state.states_meta = states_meta
 
         # Map the event data to the StateAttributes table
         shared_attrs = shared_attrs_bytes.decode("utf-8")
-        dbstate.attributes = None
         # Matching attributes found in the pending commit
         if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
-            dbstate.state_attributes = pending_event_data
+            pending_state.state_attributes = pending_event_data
+            state_attributes_manager.add_pending_reference(pending_event_data)
         # Matching attributes id found in the cache
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
@@ -1152,15 +1259,17 @@ class Recorder(threading.Thread):
                 )
             )
         ):
-            dbstate.attributes_id = attributes_id
+            row["attributes_id"] = attributes_id
+            state_attributes_manager.add_reference(attributes_id)
         else:
             # No matching attributes found, save them in the DB
             dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
             state_attributes_manager.add_pending(dbstate_attributes)
             self._add_to_session(session, dbstate_attributes)
-            dbstate.state_attributes = dbstate_attributes
+            pending_state.state_attributes = dbstate_attributes
 
-        self._add_to_session(session, dbstate)
+        self._event_session_has_pending_writes = True
+        states_manager.add_pending_write(pending_state)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1207,6 +1316,17 @@ class Recorder(threading.Thread):
         assert self.event_session is not None
         session = self.event_session
         self._commits_without_expire += 1
+        commit_start = time.monotonic()
+
+        # Flush the pending rows the event and state rows refer to so
+        # their ids are known, then write the event and state rows in bulk
+        session.flush()
+        self._write_pending_events(session)
+        self.states_manager.write_pending(
+            session, States, self._executemany_returning_sorted
+        )
+        self.state_attributes_manager.write_ref_counts(session)
+        self.event_data_manager.write_ref_counts(session)
 
         if (
             pending_last_reported
@@ -1226,6 +1346,7 @@ class Recorder(threading.Thread):
         session.commit()
 
         self._event_session_has_pending_writes = False
+        self._pending_events.clear()
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
@@ -1235,6 +1356,8 @@ class Recorder(threading.Thread):
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        if adaptive_commit := self._adaptive_commit:
+            adaptive_commit.committed(time.monotonic() - commit_start, self.backlog)
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1257,6 +1380,9 @@ class Recorder(threading.Thread):
 
     def _close_event_session(self) -> None:
         """Close the event session."""
+        self._pending_events.clear()
+        if self._adaptive_commit:
+            self._adaptive_commit.reset()
         self.states_manager.reset()
         self.state_attributes_manager.reset()
         self.event_data_manager.reset()
@@ -77,7 +77,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 47
+SCHEMA_VERSION = 48
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -312,20 +312,30 @@ class Events(Base):
     @staticmethod
     def from_event(event: Event) -> Events:
         """Create an event database object from a native event."""
+        return Events(**Events.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values of an event row from a native event.
+
+        The event_type_id and data_id are filled in when the row is written.
+        """
         context = event.context
-        return Events(
-            event_type=None,
-            event_data=None,
-            origin_idx=event.origin.idx,
-            time_fired=None,
-            time_fired_ts=event.time_fired_timestamp,
-            context_id=None,
-            context_id_bin=ulid_to_bytes_or_none(context.id),
-            context_user_id=None,
-            context_user_id_bin=uuid_hex_to_bytes_or_none(context.user_id),
-            context_parent_id=None,
-            context_parent_id_bin=ulid_to_bytes_or_none(context.parent_id),
-        )
+        return {
+            "event_type": None,
+            "event_data": None,
+            "origin_idx": event.origin.idx,
+            "time_fired": None,
+            "time_fired_ts": event.time_fired_timestamp,
+            "context_id": None,
+            "context_id_bin": context.id_bin,
+            "context_user_id": None,
+            "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+            "context_parent_id": None,
+            "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+            "event_type_id": None,
+            "data_id": None,
+        }
 
     def to_native(self, validate_entity_id: bool = True) -> Event | None:
         """Convert to a native HA Event."""
@@ -361,6 +371,9 @@ class EventData(Base):
     shared_data: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    # Number of events referring to the row, NULL for rows written
+    # before the reference count was added
+    ref_count: Mapped[int | None] = mapped_column(Integer)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -499,6 +512,15 @@ class States(Base):
     @staticmethod
     def from_event(event: Event[EventStateChangedData]) -> States:
         """Create object from a state_changed event."""
+        return States(**States.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event: Event[EventStateChangedData]) -> dict[str, Any]:
+        """Create the column values of a state row from a state_changed event.
+
+        The old_state_id, attributes_id and metadata_id are filled in
+        when the row is written.
+        """
         state = event.data["new_state"]
         # None state means the state was removed from the state machine
         if state is None:
@@ -518,23 +540,26 @@ class States(Base):
             else:
                 last_reported_ts = state.last_reported_timestamp
         context = event.context
-        return States(
-            state=state_value,
-            entity_id=event.data["entity_id"],
-            attributes=None,
-            context_id=None,
-            context_id_bin=ulid_to_bytes_or_none(context.id),
-            context_user_id=None,
-            context_user_id_bin=uuid_hex_to_bytes_or_none(context.user_id),
-            context_parent_id=None,
-            context_parent_id_bin=ulid_to_bytes_or_none(context.parent_id),
-            origin_idx=event.origin.idx,
-            last_updated=None,
-            last_changed=None,
-            last_updated_ts=last_updated_ts,
-            last_changed_ts=last_changed_ts,
-            last_reported_ts=last_reported_ts,
-        )
+        return {
+            "state": state_value,
+            "entity_id": event.data["entity_id"],
+            "attributes": None,
+            "context_id": None,
+            "context_id_bin": context.id_bin,
+            "context_user_id": None,
+            "context_user_id_bin": uuid_hex_to_bytes_or_none(context.user_id),
+            "context_parent_id": None,
+            "context_parent_id_bin": ulid_to_bytes_or_none(context.parent_id),
+            "origin_idx": event.origin.idx,
+            "last_updated": None,
+            "last_changed": None,
+            "last_updated_ts": last_updated_ts,
+            "last_changed_ts": last_changed_ts,
+            "last_reported_ts": last_reported_ts,
+            "old_state_id": None,
+            "attributes_id": None,
+            "metadata_id": None,
+        }
 
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
@@ -586,6 +611,9 @@ class StateAttributes(Base):
     shared_attrs: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    # Number of states referring to the row, NULL for rows written
+    # before the reference count was added
+    ref_count: Mapped[int | None] = mapped_column(Integer)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -616,10 +644,18 @@ class StateAttributes(Base):
                 exclude_attrs -= _MATCH_ALL_KEEP
         else:
             exclude_attrs = ALL_DOMAIN_EXCLUDE_ATTRS
-        encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
-        bytes_result = encoder(
-            {k: v for k, v in state.attributes.items() if k not in exclude_attrs}
-        )
+        attributes = state.attributes
+        if exclude_attrs.isdisjoint(attributes):
+            # Nothing to exclude, reuse the JSON the State already has since
+            # it is shared with the websocket and api serializations
+            bytes_result = state.attributes_json
+            if dialect == PSQL_DIALECT and b"\\u0000" in bytes_result:
+                bytes_result = json_bytes_strip_null(attributes)
+        else:
+            encoder = json_bytes_strip_null if dialect == PSQL_DIALECT else json_bytes
+            bytes_result = encoder(
+                {k: v for k, v in attributes.items() if k not in exclude_attrs}
+            )
         if len(bytes_result) > MAX_STATE_ATTRS_BYTES:
             _LOGGER.warning(
                 "State attributes for %s exceed maximum size of %s bytes. "
@@ -52,6 +52,7 @@ from .const import (
     CONTEXT_ID_AS_BINARY_SCHEMA_VERSION,
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
+    REF_COUNT_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
     SupportedDialect,
 )
@@ -83,18 +84,24 @@ from .models import process_timestamp
 from .models.time import datetime_to_timestamp_or_none
 from .queries import (
     batch_cleanup_entity_ids,
+    count_event_data_references,
+    count_state_attributes_references,
     delete_duplicate_short_term_statistics_row,
     delete_duplicate_statistics_row,
     find_entity_ids_to_migrate,
     find_event_type_to_migrate,
     find_events_context_ids_to_migrate,
     find_states_context_ids_to_migrate,
+    find_uncounted_event_data,
+    find_uncounted_state_attributes,
     find_unmigrated_short_term_statistics_rows,
     find_unmigrated_statistics_rows,
     has_entity_ids_to_migrate,
     has_event_type_to_migrate,
     has_events_context_ids_to_migrate,
     has_states_context_ids_to_migrate,
+    has_uncounted_event_data,
+    has_uncounted_state_attributes,
     has_used_states_entity_ids,
     has_used_states_event_ids,
     migrate_single_short_term_statistics_row_to_timestamp,
@@ -1758,6 +1765,16 @@ class _SchemaVersion47Migrator(_SchemaVersionMigrator, target_version=47):
         )
 
 
+class _SchemaVersion48Migrator(_SchemaVersionMigrator, target_version=48):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The reference counts of existing rows are set in batches by
+        # StateAttributesRefCountMigration and EventDataRefCountMigration,
+        # until then the purge looks for them in the states and events
+        _add_columns(self.session_maker, "state_attributes", ["ref_count INTEGER"])
+        _add_columns(self.session_maker, "event_data", ["ref_count INTEGER"])
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
@@ -2648,6 +2665,68 @@ class EntityIDPostMigration(BaseRunTimeMigrationWithQuery):
         return has_used_states_entity_ids()
 
 
+class StateAttributesRefCountMigration(BaseRunTimeMigrationWithQuery):
+    """Migration to count the states referring to existing state attributes."""
+
+    required_schema_version = REF_COUNT_SCHEMA_VERSION
+    migration_id = "state_attributes_ref_count"
+    task = CommitBeforeMigrationTask
+    # We have to commit before to make sure the pending states
+    # are in the states table when their references are counted
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Count the references of a batch of state attributes."""
+        _LOGGER.debug("Counting state attributes references")
+        with session_scope(session=instance.get_session()) as session:
+            if (
+                attributes_ids := session.execute(
+                    find_uncounted_state_attributes(instance.max_bind_vars)
+                )
+                .scalars()
+                .all()
+            ):
+                session.execute(count_state_attributes_references(attributes_ids))
+            is_done = not attributes_ids
+
+        _LOGGER.debug("Counting state attributes references: done=%s", is_done)
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def needs_migrate_query(self) -> StatementLambdaElement:
+        """Check if the data is migrated."""
+        return has_uncounted_state_attributes()
+
+
+class EventDataRefCountMigration(BaseRunTimeMigrationWithQuery):
+    """Migration to count the events referring to existing event data."""
+
+    required_schema_version = REF_COUNT_SCHEMA_VERSION
+    migration_id = "event_data_ref_count"
+    task = CommitBeforeMigrationTask
+    # We have to commit before to make sure the pending events
+    # are in the events table when their references are counted
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Count the references of a batch of event data."""
+        _LOGGER.debug("Counting event data references")
+        with session_scope(session=instance.get_session()) as session:
+            if (
+                data_ids := session.execute(
+                    find_uncounted_event_data(instance.max_bind_vars)
+                )
+                .scalars()
+                .all()
+            ):
+                session.execute(count_event_data_references(data_ids))
+            is_done = not data_ids
+
+        _LOGGER.debug("Counting event data references: done=%s", is_done)
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def needs_migrate_query(self) -> StatementLambdaElement:
+        """Check if the data is migrated."""
+        return has_uncounted_event_data()
+
+
 def _mark_migration_done(
     session: Session, migration: type[BaseRunTimeMigration]
 ) -> None:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from datetime import datetime
 from itertools import zip_longest
 import logging
@@ -10,6 +10,7 @@ import time
 from typing import TYPE_CHECKING
 
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.util.collection import chunked_or_all
 
@@ -30,7 +31,10 @@ from .queries import (
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    find_attributes_ids_ref_counts_of_states,
+    find_data_ids_ref_counts_of_events,
     find_entity_ids_to_purge,
+    find_event_data_ref_counts,
     find_event_types_to_purge,
     find_events_to_purge,
     find_latest_statistics_runs_run_id,
@@ -38,8 +42,11 @@ from .queries import (
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
     find_short_term_statistics_to_purge,
+    find_state_attributes_ref_counts,
     find_states_to_purge,
     find_statistics_runs_to_purge,
+    update_event_data_ref_counts,
+    update_state_attributes_ref_counts,
 )
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
@@ -53,6 +60,9 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+# Seconds an incremental purge may spend before it yields to the queue
+DEFAULT_INCREMENTAL_PURGE_TIME_BUDGET = 0.5
+
 
 @retryable_database_job("purge")
 def purge_old_data(
@@ -72,40 +82,9 @@ def purge_old_data(
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
     with session_scope(session=instance.get_session()) as session:
-        # Purge a max of max_bind_vars, based on the oldest states or events record
-        has_more_to_purge = False
-        if instance.use_legacy_events_index and _purging_legacy_format(session):
-            _LOGGER.debug(
-                "Purge running in legacy format as there are states with event_id"
-                " remaining"
-            )
-            has_more_to_purge |= _purge_legacy_format(instance, session, purge_before)
-        else:
-            _LOGGER.debug(
-                "Purge running in new format as there are NO states with event_id"
-                " remaining"
-            )
-            # Once we are done purging legacy rows, we use the new method
-            has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
-            )
-            has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before
-            )
-
-        statistics_runs = _select_statistics_runs_to_purge(
-            session, purge_before, instance.max_bind_vars
-        )
-        short_term_statistics = _select_short_term_statistics_to_purge(
-            session, purge_before, instance.max_bind_vars
-        )
-        if statistics_runs:
-            _purge_statistics_runs(session, statistics_runs)
-
-        if short_term_statistics:
-            _purge_short_term_statistics(session, short_term_statistics)
-
-        if has_more_to_purge or statistics_runs or short_term_statistics:
+        if _purge_old_batch(
+            instance, session, purge_before, events_batch_size, states_batch_size
+        ):
             # Return false, as we might not be done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
             return False
@@ -114,20 +93,100 @@ def purge_old_data(
             _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
             return False
 
-        # This purge cycle is finished, clean up old event types and
-        # recorder runs
-        if instance.event_type_manager.active:
-            _purge_old_event_types(instance, session)
-
-        if instance.states_meta_manager.active:
-            _purge_old_entity_ids(instance, session)
-
-        _purge_old_recorder_runs(instance, session, purge_before)
+        _purge_old_metadata(instance, session, purge_before)
     if repack:
         repack_database(instance)
     return True
 
 
+@retryable_database_job("incremental purge")
+def purge_old_data_incrementally(
+    instance: Recorder,
+    purge_before: datetime,
+    time_budget: float = DEFAULT_INCREMENTAL_PURGE_TIME_BUDGET,
+) -> bool:
+    """Purge events and states older than purge_before in small batches.
+
+    Each batch is committed with the attributes and event data it left
+    unused, so the purge can stop after any batch and the next one
+    resumes at the oldest remaining rows. Batches are purged until the
+    time budget is spent so the recorder does not stall while it
+    purges; returns False if there is more to purge.
+    """
+    deadline = time.monotonic() + time_budget
+    while True:
+        with session_scope(session=instance.get_session()) as session:
+            if not _purge_old_batch(instance, session, purge_before, 1, 1):
+                _purge_old_metadata(instance, session, purge_before)
+                return True
+        if time.monotonic() >= deadline:
+            _LOGGER.debug("Incremental purge ran out of its time budget")
+            return False
+
+
+def _purge_old_batch(
+    instance: Recorder,
+    session: Session,
+    purge_before: datetime,
+    events_batch_size: int,
+    states_batch_size: int,
+) -> bool:
+    """Purge a batch of states, events and statistics older than purge_before.
+
+    Returns true if there is more to purge.
+    """
+    # Purge a max of max_bind_vars, based on the oldest states or events record
+    has_more_to_purge = False
+    if instance.use_legacy_events_index and _purging_legacy_format(session):
+        _LOGGER.debug(
+            "Purge running in legacy format as there are states with event_id"
+            " remaining"
+        )
+        has_more_to_purge |= _purge_legacy_format(instance, session, purge_before)
+    else:
+        _LOGGER.debug(
+            "Purge running in new format as there are NO states with event_id"
+            " remaining"
+        )
+        # Once we are done purging legacy rows, we use the new method
+        has_more_to_purge |= _purge_states_and_attributes_ids(
+            instance, session, states_batch_size, purge_before
+        )
+        has_more_to_purge |= _purge_events_and_data_ids(
+            instance, session, events_batch_size, purge_before
+        )
+
+    statistics_runs = _select_statistics_runs_to_purge(
+        session, purge_before, instance.max_bind_vars
+    )
+    short_term_statistics = _select_short_term_statistics_to_purge(
+        session, purge_before, instance.max_bind_vars
+    )
+    if statistics_runs:
+        _purge_statistics_runs(session, statistics_runs)
+
+    if short_term_statistics:
+        _purge_short_term_statistics(session, short_term_statistics)
+
+    return bool(has_more_to_purge or statistics_runs or short_term_statistics)
+
+
+def _purge_old_metadata(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> None:
+    """Clean up old event types, entity ids and recorder runs.
+
+    Called once a purge cycle is finished.
+    """
+    if instance.event_type_manager.active:
+        _purge_old_event_types(instance, session)
+
+    if instance.states_meta_manager.active:
+        _purge_old_entity_ids(instance, session)
+
+    _purge_old_recorder_runs(instance, session, purge_before)
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
@@ -147,7 +206,7 @@ def _purge_legacy_format(
     )
     _purge_state_ids(instance, session, state_ids)
     _purge_unused_attributes_ids(instance, session, attributes_ids)
-    _purge_event_ids(session, event_ids)
+    _purge_event_ids(instance, session, event_ids)
     _purge_unused_data_ids(instance, session, data_ids)
 
     # The database may still have some rows that have an event_id but are not
@@ -234,7 +293,7 @@ def _purge_events_and_data_ids(
         if not event_ids:
             has_remaining_event_ids_to_purge = False
             break
-        _purge_event_ids(session, event_ids)
+        _purge_event_ids(instance, session, event_ids)
         data_ids_batch = data_ids_batch | data_ids
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
@@ -293,6 +352,16 @@ def _select_unused_attributes_ids(
     if not attributes_ids:
         return set()
 
+    to_remove: set[int] = set()
+    if instance.state_attributes_manager.ref_counting:
+        # Rows are unused once their reference count dropped to zero, only
+        # rows written before it was counted are looked up in the states
+        to_remove, attributes_ids = _select_unreferenced_ids(
+            instance, session, find_state_attributes_ref_counts, attributes_ids
+        )
+        if not attributes_ids:
+            return to_remove
+
     seen_ids: set[int] = set()
     if not database_engine.optimizer.slow_range_in_select:
         #
@@ -353,7 +422,7 @@ def _select_unused_attributes_ids(
                 ).all()
                 if attrs_id[0] is not None
             }
-    to_remove = attributes_ids - seen_ids
+    to_remove |= attributes_ids - seen_ids
     _LOGGER.debug(
         "Selected %s shared attributes to remove",
         len(to_remove),
@@ -385,6 +454,15 @@ def _select_unused_event_data_ids(
     if not data_ids:
         return set()
 
+    to_remove: set[int] = set()
+    if instance.event_data_manager.ref_counting:
+        # See _select_unused_attributes_ids
+        to_remove, data_ids = _select_unreferenced_ids(
+            instance, session, find_event_data_ref_counts, data_ids
+        )
+        if not data_ids:
+            return to_remove
+
     seen_ids: set[int] = set()
     # See _select_unused_attributes_ids for why this function
     # branches for non-sqlite databases.
@@ -406,11 +484,34 @@ def _select_unused_event_data_ids(
                 ).all()
                 if data_id[0] is not None
             }
-    to_remove = data_ids - seen_ids
+    to_remove |= data_ids - seen_ids
     _LOGGER.debug("Selected %s shared event data to remove", len(to_remove))
     return to_remove
 
 
+def _select_unreferenced_ids(
+    instance: Recorder,
+    session: Session,
+    find_ref_counts: Callable[[Iterable[int]], StatementLambdaElement],
+    row_ids: set[int],
+) -> tuple[set[int], set[int]]:
+    """Return the ids of rows no longer referenced and of rows without a reference count."""
+    unreferenced_ids: set[int] = set()
+    uncounted_ids: set[int] = set()
+    for row_ids_chunk in chunked_or_all(row_ids, instance.max_bind_vars):
+        for row_id, ref_count in session.execute(find_ref_counts(row_ids_chunk)):
+            if ref_count is None:
+                uncounted_ids.add(row_id)
+            elif ref_count <= 0:
+                unreferenced_ids.add(row_id)
+    _LOGGER.debug(
+        "Selected %s unreferenced and %s uncounted ids",
+        len(unreferenced_ids),
+        len(uncounted_ids),
+    )
+    return unreferenced_ids, uncounted_ids
+
+
 def _purge_unused_data_ids(
     instance: Recorder, session: Session, data_ids_batch: set[int]
 ) -> None:
@@ -510,7 +611,7 @@ def _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
 
 
 def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int]) -> None:
-    """Disconnect states and delete by state id."""
+    """Disconnect states, release their attributes and delete by state id."""
     if not state_ids:
         return
 
@@ -521,6 +622,21 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     disconnected_rows = session.execute(disconnect_states_rows(state_ids))
     _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
 
+    # The attributes are deleted by _purge_unused_attributes_ids
+    # once no states refer to them anymore
+    if instance.state_attributes_manager.ref_counting and (
+        ref_counts := session.execute(
+            find_attributes_ids_ref_counts_of_states(state_ids)
+        ).all()
+    ):
+        session.connection().execute(
+            update_state_attributes_ref_counts(),
+            [
+                {"b_attributes_id": attributes_id, "b_ref_count": -ref_count}
+                for attributes_id, ref_count in ref_counts
+            ],
+        )
+
     deleted_rows = session.execute(delete_states_rows(state_ids))
     _LOGGER.debug("Deleted %s states", deleted_rows)
 
@@ -570,10 +686,22 @@ def _purge_short_term_statistics(
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
 
 
-def _purge_event_ids(session: Session, event_ids: set[int]) -> None:
-    """Delete by event id."""
+def _purge_event_ids(instance: Recorder, session: Session, event_ids: set[int]) -> None:
+    """Release the event data of events and delete by event id."""
     if not event_ids:
         return
+    if instance.event_data_manager.ref_counting and (
+        ref_counts := session.execute(
+            find_data_ids_ref_counts_of_events(event_ids)
+        ).all()
+    ):
+        session.connection().execute(
+            update_event_data_ref_counts(),
+            [
+                {"b_data_id": data_id, "b_ref_count": -ref_count}
+                for data_id, ref_count in ref_counts
+            ],
+        )
     deleted_rows = session.execute(delete_event_rows(event_ids))
     _LOGGER.debug("Deleted %s events", deleted_rows)
 
@@ -705,7 +833,7 @@ def _purge_filtered_states(
     # These are legacy events that are linked to a state that are no longer
     # created but since we did not remove them when we stopped adding new ones
     # we will need to purge them here.
-    _purge_event_ids(session, filtered_event_ids)
+    _purge_event_ids(instance, session, filtered_event_ids)
     unused_attribute_ids_set = _select_unused_attributes_ids(
         instance,
         session,
@@ -755,7 +883,7 @@ def _purge_filtered_events(
         # created but since we did not remove them when we stopped adding new ones
         # we will need to purge them here.
         _purge_state_ids(instance, session, state_ids)
-    _purge_event_ids(session, event_ids_set)
+    _purge_event_ids(instance, session, event_ids_set)
     if unused_data_ids_set := _select_unused_event_data_ids(
         instance, session, set(data_ids), database_engine
     ):
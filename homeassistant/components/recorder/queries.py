@@ -5,7 +5,17 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import delete, distinct, func, lambda_stmt, select, union_all, update
+from sqlalchemy import (
+    bindparam,
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.sql.dml import Update
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
@@ -53,6 +63,172 @@ def get_shared_event_datas(hashes: list[int]) -> StatementLambdaElement:
     )
 
 
+def count_state_attributes() -> StatementLambdaElement:
+    """Count the state attributes rows."""
+    return lambda_stmt(lambda: select(func.count()).select_from(StateAttributes))
+
+
+def find_state_attributes_hashes(
+    start_attributes_id: int, limit: int
+) -> StatementLambdaElement:
+    """Find the hashes of the state attributes after an attributes id."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id, StateAttributes.hash)
+        .where(StateAttributes.attributes_id > start_attributes_id)
+        .order_by(StateAttributes.attributes_id)
+        .limit(limit)
+    )
+
+
+def count_event_data() -> StatementLambdaElement:
+    """Count the event data rows."""
+    return lambda_stmt(lambda: select(func.count()).select_from(EventData))
+
+
+def find_event_data_hashes(start_data_id: int, limit: int) -> StatementLambdaElement:
+    """Find the hashes of the event data after a data id."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.hash)
+        .where(EventData.data_id > start_data_id)
+        .order_by(EventData.data_id)
+        .limit(limit)
+    )
+
+
+def update_state_attributes_ref_counts() -> Update:
+    """Add to the reference counts of state attributes.
+
+    This statement is executed with a list of parameters and is
+    intentionally not a lambda statement.
+    """
+    return (
+        update(StateAttributes)
+        .where(StateAttributes.attributes_id == bindparam("b_attributes_id"))
+        .values(ref_count=StateAttributes.ref_count + bindparam("b_ref_count"))
+    )
+
+
+def update_event_data_ref_counts() -> Update:
+    """Add to the reference counts of event data.
+
+    This statement is executed with a list of parameters and is
+    intentionally not a lambda statement.
+    """
+    return (
+        update(EventData)
+        .where(EventData.data_id == bindparam("b_data_id"))
+        .values(ref_count=EventData.ref_count + bindparam("b_ref_count"))
+    )
+
+
+def find_attributes_ids_ref_counts_of_states(
+    state_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Count the states referring to each attributes id."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id, func.count())
+        .where(States.state_id.in_(state_ids))
+        .where(States.attributes_id.is_not(None))
+        .group_by(States.attributes_id)
+    )
+
+
+def find_data_ids_ref_counts_of_events(
+    event_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Count the events referring to each data id."""
+    return lambda_stmt(
+        lambda: select(Events.data_id, func.count())
+        .where(Events.event_id.in_(event_ids))
+        .where(Events.data_id.is_not(None))
+        .group_by(Events.data_id)
+    )
+
+
+def find_state_attributes_ref_counts(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Find the reference counts of state attributes."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id, StateAttributes.ref_count).where(
+            StateAttributes.attributes_id.in_(attributes_ids)
+        )
+    )
+
+
+def find_event_data_ref_counts(data_ids: Iterable[int]) -> StatementLambdaElement:
+    """Find the reference counts of event data."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.ref_count).where(
+            EventData.data_id.in_(data_ids)
+        )
+    )
+
+
+def find_uncounted_state_attributes(max_bind_vars: int) -> StatementLambdaElement:
+    """Find state attributes without a reference count."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .where(StateAttributes.ref_count.is_(None))
+        .limit(max_bind_vars)
+    )
+
+
+def has_uncounted_state_attributes() -> StatementLambdaElement:
+    """Check if there are state attributes without a reference count."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .where(StateAttributes.ref_count.is_(None))
+        .limit(1)
+    )
+
+
+def count_state_attributes_references(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Set the reference counts of state attributes to the states referring to them."""
+    return lambda_stmt(
+        lambda: update(StateAttributes)
+        .where(StateAttributes.attributes_id.in_(attributes_ids))
+        .values(
+            ref_count=select(func.count())
+            .where(States.attributes_id == StateAttributes.attributes_id)
+            .scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_uncounted_event_data(max_bind_vars: int) -> StatementLambdaElement:
+    """Find event data without a reference count."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id)
+        .where(EventData.ref_count.is_(None))
+        .limit(max_bind_vars)
+    )
+
+
+def has_uncounted_event_data() -> StatementLambdaElement:
+    """Check if there are event data without a reference count."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id).where(EventData.ref_count.is_(None)).limit(1)
+    )
+
+
+def count_event_data_references(data_ids: Iterable[int]) -> StatementLambdaElement:
+    """Set the reference counts of event data to the events referring to them."""
+    return lambda_stmt(
+        lambda: update(EventData)
+        .where(EventData.data_id.in_(data_ids))
+        .values(
+            ref_count=select(func.count())
+            .where(Events.data_id == EventData.data_id)
+            .scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
 def find_event_type_ids(event_types: Iterable[str]) -> StatementLambdaElement:
     """Find an event_type id by event_type."""
     return lambda_stmt(
@@ -2,15 +2,29 @@
 
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+from collections import Counter
 from typing import TYPE_CHECKING, Any
 
 from lru import LRU
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.util.event_type import EventType
 
+from ..bloom_filter import HashBloomFilter
+from ..const import REF_COUNT_SCHEMA_VERSION
+from ..db_schema import EventData, StateAttributes
+from ..tasks import LoadHashFilterTask
+from ..util import session_scope
+
 if TYPE_CHECKING:
     from ..core import Recorder
 
+# Number of hashes loaded into a bloom filter by each recorder task
+HASHES_PER_BATCH = 10000
+
 
 class BaseTableManager[_DataT]:
     """Base class for table managers."""
@@ -74,3 +88,149 @@ class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
         lru = self._id_map
         if new_size > lru.get_size():
             lru.set_size(new_size)
+
+
+class BaseSharedTableManager[_DataT: StateAttributes | EventData](
+    BaseLRUTableManager[_DataT], ABC
+):
+    """Base class for managers of tables with rows shared by their hash.
+
+    The states or events referring to a row are counted in its
+    ref_count so the purge can delete rows that are no longer used
+    without looking for them in the states or events table. A bloom
+    filter of the hashes in the table avoids looking for rows that
+    do not exist yet.
+    """
+
+    def __init__(self, recorder: Recorder, lru_size: int) -> None:
+        """Initialize the shared table manager."""
+        super().__init__(recorder, lru_size)
+        self._hash_filter: HashBloomFilter | None = None
+        self._hash_filter_loaded = False
+        self._hash_filter_queued = False
+        self._hash_filter_last_id = 0
+        self._ref_counts: Counter[int] = Counter()
+
+    @property
+    def ref_counting(self) -> bool:
+        """Return if the references to the rows are counted."""
+        return self.recorder.schema_version >= REF_COUNT_SCHEMA_VERSION
+
+    @abstractmethod
+    def _count_rows(self) -> StatementLambdaElement:
+        """Return the statement counting the rows of the table."""
+
+    @abstractmethod
+    def _find_hashes(self, start_id: int, limit: int) -> StatementLambdaElement:
+        """Return the statement selecting the ids and hashes after an id."""
+
+    @abstractmethod
+    def _update_ref_counts(self) -> tuple[Update, str]:
+        """Return the statement adding to the reference counts and its id parameter."""
+
+    def _may_exist(self, data_hash: int) -> bool:
+        """Return if a row with the hash may exist in the table.
+
+        Every hash may exist until the bloom filter is loaded, it is
+        queued to load in batches if it was not yet.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if self._hash_filter_loaded:
+            assert self._hash_filter is not None
+            return data_hash in self._hash_filter
+        self.queue_load_hash_filter()
+        return True
+
+    def queue_load_hash_filter(self) -> None:
+        """Queue a task to load the bloom filter unless it is loaded or queued."""
+        if self._hash_filter_loaded or self._hash_filter_queued:
+            return
+        self._hash_filter_queued = True
+        self.recorder.queue_task(LoadHashFilterTask(self))
+
+    def load_hash_filter(self) -> None:
+        """Load a batch of hashes into the bloom filter.
+
+        The filter is sized for the rows in the table when the first
+        batch is loaded. Rows inserted while it is loaded are either
+        added when they are pending or found by a later batch since
+        their ids are larger.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._hash_filter_queued = False
+        if self._hash_filter_loaded:
+            return
+        with session_scope(
+            session=self.recorder.get_session(), read_only=True
+        ) as session:
+            if (hash_filter := self._hash_filter) is None:
+                count: int = session.execute(self._count_rows()).scalar_one()
+                hash_filter = self._hash_filter = HashBloomFilter(count)
+                self._hash_filter_last_id = 0
+            rows = session.execute(
+                self._find_hashes(self._hash_filter_last_id, HASHES_PER_BATCH)
+            ).all()
+        hash_filter.update(data_hash for _, data_hash in rows if data_hash is not None)
+        if len(rows) < HASHES_PER_BATCH:
+            self._hash_filter_loaded = True
+            return
+        self._hash_filter_last_id = rows[-1][0]
+        self.queue_load_hash_filter()
+
+    def _add_pending_hash(self, data_hash: int | None) -> None:
+        """Add the hash of a pending row to the bloom filter."""
+        if self._hash_filter is not None and data_hash is not None:
+            self._hash_filter.add(data_hash)
+
+    def add_reference(self, row_id: int) -> None:
+        """Count a pending write referring to a committed row.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if self.ref_counting:
+            self._ref_counts[row_id] += 1
+
+    def write_ref_counts(self, session: Session) -> None:
+        """Add the references of the pending writes to the reference counts.
+
+        The counts are kept until post_commit_pending so they are
+        written again if the commit is retried.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not (ref_counts := self._ref_counts):
+            return
+        stmt, id_param = self._update_ref_counts()
+        session.connection().execute(
+            stmt,
+            [
+                {id_param: row_id, "b_ref_count": ref_count}
+                for row_id, ref_count in ref_counts.items()
+            ],
+        )
+
+    def post_commit_pending(self) -> None:
+        """Forget the reference counts after they were committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._ref_counts.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        # A queued load task starts over with the new database
+        self._hash_filter = None
+        self._hash_filter_loaded = False
+        self._ref_counts.clear()
@@ -7,15 +7,22 @@ import logging
 from typing import TYPE_CHECKING, cast
 
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.core import Event
 from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..db_schema import EventData
-from ..queries import get_shared_event_datas
+from ..queries import (
+    count_event_data,
+    find_event_data_hashes,
+    get_shared_event_datas,
+    update_event_data_ref_counts,
+)
 from ..util import execute_stmt_lambda_element
-from . import BaseLRUTableManager
+from . import BaseSharedTableManager
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -26,13 +33,25 @@ CACHE_SIZE = 2048
 _LOGGER = logging.getLogger(__name__)
 
 
-class EventDataManager(BaseLRUTableManager[EventData]):
+class EventDataManager(BaseSharedTableManager[EventData]):
     """Manage the EventData table."""
 
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
         super().__init__(recorder, CACHE_SIZE)
 
+    def _count_rows(self) -> StatementLambdaElement:
+        """Return the statement counting the rows of the table."""
+        return count_event_data()
+
+    def _find_hashes(self, start_id: int, limit: int) -> StatementLambdaElement:
+        """Return the statement selecting the ids and hashes after an id."""
+        return find_event_data_hashes(start_id, limit)
+
+    def _update_ref_counts(self) -> tuple[Update, str]:
+        """Return the statement adding to the reference counts and its id parameter."""
+        return update_event_data_ref_counts(), "b_data_id"
+
     def serialize_from_event(self, event: Event) -> bytes | None:
         """Serialize event data."""
         try:
@@ -49,11 +68,13 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        if hashes := {
+        hashes = {
             EventData.hash_shared_data_bytes(shared_event_bytes)
             for event in events
             if (shared_event_bytes := self.serialize_from_event(event))
-        }:
+        }
+        # Rows of hashes that are not in the bloom filter do not exist
+        if hashes := {data_hash for data_hash in hashes if self._may_exist(data_hash)}:
             self._load_from_hashes(hashes, session)
 
     def get(self, shared_data: str, data_hash: int, session: Session) -> int | None:
@@ -75,7 +96,9 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         results: dict[str, int | None] = {}
         missing_hashes: set[int] = set()
         for shared_data, data_hash in shared_data_data_hashs:
-            if (data_id := self._id_map.get(shared_data)) is None:
+            if (data_id := self._id_map.get(shared_data)) is None and self._may_exist(
+                data_hash
+            ):
                 missing_hashes.add(data_hash)
 
             results[shared_data] = data_id
@@ -114,6 +137,20 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         assert db_event_data.shared_data is not None
         shared_data: str = db_event_data.shared_data
         self._pending[shared_data] = db_event_data
+        self._add_pending_hash(db_event_data.hash)
+        # The row is created for the event referring to it
+        if self.ref_counting:
+            db_event_data.ref_count = 1
+
+    def add_pending_reference(self, db_event_data: EventData) -> None:
+        """Count a pending write referring to a pending EventData.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if self.ref_counting:
+            assert db_event_data.ref_count is not None
+            db_event_data.ref_count += 1
 
     def post_commit_pending(self) -> None:
         """Call after commit to load the data_ids of the new EventData into the LRU.
@@ -124,6 +161,7 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         for shared_data, db_event_data in self._pending.items():
             self._id_map[shared_data] = db_event_data.data_id
         self._pending.clear()
+        super().post_commit_pending()
 
     def evict_purged(self, data_ids: set[int]) -> None:
         """Evict purged data_ids from the cache when they are no longer used.
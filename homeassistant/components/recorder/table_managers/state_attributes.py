@@ -7,15 +7,22 @@ import logging
 from typing import TYPE_CHECKING, cast
 
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.core import Event, EventStateChangedData
 from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..db_schema import StateAttributes
-from ..queries import get_shared_attributes
+from ..queries import (
+    count_state_attributes,
+    find_state_attributes_hashes,
+    get_shared_attributes,
+    update_state_attributes_ref_counts,
+)
 from ..util import execute_stmt_lambda_element
-from . import BaseLRUTableManager
+from . import BaseSharedTableManager
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -31,13 +38,25 @@ CACHE_SIZE = 2048
 _LOGGER = logging.getLogger(__name__)
 
 
-class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
+class StateAttributesManager(BaseSharedTableManager[StateAttributes]):
     """Manage the StateAttributes table."""
 
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
         super().__init__(recorder, CACHE_SIZE)
 
+    def _count_rows(self) -> StatementLambdaElement:
+        """Return the statement counting the rows of the table."""
+        return count_state_attributes()
+
+    def _find_hashes(self, start_id: int, limit: int) -> StatementLambdaElement:
+        """Return the statement selecting the ids and hashes after an id."""
+        return find_state_attributes_hashes(start_id, limit)
+
+    def _update_ref_counts(self) -> tuple[Update, str]:
+        """Return the statement adding to the reference counts and its id parameter."""
+        return update_state_attributes_ref_counts(), "b_attributes_id"
+
     def serialize_from_event(self, event: Event[EventStateChangedData]) -> bytes | None:
         """Serialize event data."""
         try:
@@ -60,11 +79,13 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        if hashes := {
+        hashes = {
             StateAttributes.hash_shared_attrs_bytes(shared_attrs_bytes)
             for event in events
             if (shared_attrs_bytes := self.serialize_from_event(event))
-        }:
+        }
+        # Rows of hashes that are not in the bloom filter do not exist
+        if hashes := {data_hash for data_hash in hashes if self._may_exist(data_hash)}:
             self._load_from_hashes(hashes, session)
 
     def get(self, shared_attr: str, data_hash: int, session: Session) -> int | None:
@@ -86,7 +107,9 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         results: dict[str, int | None] = {}
         missing_hashes: set[int] = set()
         for shared_attrs, data_hash in shared_attrs_data_hashes:
-            if (attributes_id := self._id_map.get(shared_attrs)) is None:
+            if (
+                attributes_id := self._id_map.get(shared_attrs)
+            ) is None and self._may_exist(data_hash):
                 missing_hashes.add(data_hash)
 
             results[shared_attrs] = attributes_id
@@ -125,6 +148,20 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         assert db_state_attributes.shared_attrs is not None
         shared_attrs: str = db_state_attributes.shared_attrs
         self._pending[shared_attrs] = db_state_attributes
+        self._add_pending_hash(db_state_attributes.hash)
+        # The row is created for the state referring to it
+        if self.ref_counting:
+            db_state_attributes.ref_count = 1
+
+    def add_pending_reference(self, db_state_attributes: StateAttributes) -> None:
+        """Count a pending write referring to a pending StateAttributes.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if self.ref_counting:
+            assert db_state_attributes.ref_count is not None
+            db_state_attributes.ref_count += 1
 
     def post_commit_pending(self) -> None:
         """Call after commit to load the attributes_ids of the new StateAttributes into the LRU.
@@ -135,6 +172,7 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         for shared_attrs, db_state_attributes in self._pending.items():
             self._id_map[shared_attrs] = db_state_attributes.attributes_id
         self._pending.clear()
+        super().post_commit_pending()
 
     def evict_purged(self, attributes_ids: set[int]) -> None:
         """Evict purged attributes_ids from the cache when they are no longer used.
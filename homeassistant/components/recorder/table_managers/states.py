@@ -2,7 +2,28 @@
 
 from __future__ import annotations
 
-from ..db_schema import States
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm.session import Session
+
+from ..db_schema import StateAttributes, States, StatesMeta
+
+
+@dataclass(slots=True)
+class PendingState:
+    """A state row that will be written at the next commit.
+
+    The ids of pending rows it refers to are only known once
+    they have been written, they are filled in when it is written.
+    """
+
+    row: dict[str, Any]
+    old_state: PendingState | None = None
+    states_meta: StatesMeta | None = None
+    state_attributes: StateAttributes | None = None
+    state_id: int | None = None
 
 
 class StatesManager:
@@ -10,11 +31,12 @@ class StatesManager:
 
     def __init__(self) -> None:
         """Initialize the states manager for linking old_state_id."""
-        self._pending: dict[str, States] = {}
-        self._last_committed_id: dict[str, int] = {}
+        self._pending: dict[str, PendingState] = {}
+        self._pending_writes: list[PendingState] = []
+        self._last_committed_id: dict[str, int | None] = {}
         self._last_reported: dict[int, float] = {}
 
-    def pop_pending(self, entity_id: str) -> States | None:
+    def pop_pending(self, entity_id: str) -> PendingState | None:
         """Pop a pending state.
 
         Pending states are states that are in the session but not yet committed.
@@ -35,7 +57,7 @@ class StatesManager:
         """
         return self._last_committed_id.pop(entity_id, None)
 
-    def add_pending(self, entity_id: str, state: States) -> None:
+    def add_pending(self, entity_id: str, state: PendingState) -> None:
         """Add a pending state.
 
         Pending states are states that are in the session but not yet committed.
@@ -45,6 +67,70 @@ class StatesManager:
         """
         self._pending[entity_id] = state
 
+    def add_pending_write(self, state: PendingState) -> None:
+        """Add a pending state that will be written at the next commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_writes.append(state)
+
+    @property
+    def pending_write_count(self) -> int:
+        """Return the number of states that will be written at the next commit."""
+        return len(self._pending_writes)
+
+    def write_pending(
+        self, session: Session, table: type[States], executemany_returning: bool
+    ) -> None:
+        """Write the pending states to the table in bulk.
+
+        The StatesMeta and StateAttributes of the pending states must have
+        been flushed. When the database returns the ids of rows inserted with
+        executemany in order, all states are inserted in one statement and
+        the old_state_id of states whose old state was pending as well is
+        set with one update. Otherwise the states are inserted one by one.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not (pending_writes := self._pending_writes):
+            return
+        for pending_state in pending_writes:
+            row = pending_state.row
+            if (states_meta := pending_state.states_meta) is not None:
+                row["metadata_id"] = states_meta.metadata_id
+            if (state_attributes := pending_state.state_attributes) is not None:
+                row["attributes_id"] = state_attributes.attributes_id
+
+        if not executemany_returning:
+            # The primary key of a single row insert is only available
+            # from the cursor of a core execution
+            connection = session.connection()
+            for pending_state in pending_writes:
+                if (old_state := pending_state.old_state) is not None:
+                    pending_state.row["old_state_id"] = old_state.state_id
+                pending_state.state_id = connection.execute(
+                    insert(table), pending_state.row
+                ).inserted_primary_key[0]
+            return
+
+        state_ids = session.execute(
+            insert(table).returning(table.state_id, sort_by_parameter_order=True),
+            [pending_state.row for pending_state in pending_writes],
+        ).scalars()
+        old_state_ids: list[dict[str, int]] = []
+        for pending_state, state_id in zip(pending_writes, state_ids, strict=True):
+            pending_state.state_id = state_id
+            if (old_state := pending_state.old_state) is not None and (
+                old_state_id := old_state.state_id
+            ) is not None:
+                old_state_ids.append(
+                    {"state_id": state_id, "old_state_id": old_state_id}
+                )
+        if old_state_ids:
+            session.execute(update(table), old_state_ids)
+
     def update_pending_last_reported(
         self, state_id: int, last_reported_timestamp: float
     ) -> None:
@@ -61,9 +147,10 @@ class StatesManager:
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        for entity_id, db_states in self._pending.items():
-            self._last_committed_id[entity_id] = db_states.state_id
+        for entity_id, pending_state in self._pending.items():
+            self._last_committed_id[entity_id] = pending_state.state_id
         self._pending.clear()
+        self._pending_writes.clear()
         self._last_reported.clear()
 
     def reset(self) -> None:
@@ -74,6 +161,7 @@ class StatesManager:
         """
         self._last_committed_id.clear()
         self._pending.clear()
+        self._pending_writes.clear()
 
     def evict_purged_state_ids(self, purged_state_ids: set[int]) -> None:
         """Evict purged states from the committed states.
@@ -25,6 +25,7 @@ _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from .core import Recorder
+    from .table_managers import BaseSharedTableManager
 
 
 @dataclass(slots=True)
@@ -133,6 +134,27 @@ class PurgeTask(RecorderTask):
         )
 
 
+@dataclass(slots=True)
+class IncrementalPurgeTask(RecorderTask):
+    """Object to store information about an incremental purge task."""
+
+    purge_before: datetime
+
+    def run(self, instance: Recorder) -> None:
+        """Purge a time budgeted batch of the database."""
+        finished = True
+        try:
+            finished = purge.purge_old_data_incrementally(instance, self.purge_before)
+        finally:
+            # Also clear the flag when the purge raised so
+            # the next five minute tick queues a new purge
+            if finished:
+                instance.incremental_purge_pending = False
+        if not finished:
+            # Queue the next batch behind the events that arrived meanwhile
+            instance.queue_task(IncrementalPurgeTask(self.purge_before))
+
+
 @dataclass(slots=True)
 class PurgeEntitiesTask(RecorderTask):
     """Object to store entity information about purge task."""
@@ -339,6 +361,17 @@ class AdjustLRUSizeTask(RecorderTask):
         instance._adjust_lru_size()  # noqa: SLF001
 
 
+@dataclass(slots=True)
+class LoadHashFilterTask(RecorderTask):
+    """An object to insert into the recorder queue to load a bloom filter."""
+
+    manager: BaseSharedTableManager
+
+    def run(self, instance: Recorder) -> None:
+        """Load a batch of hashes into the bloom filter."""
+        self.manager.load_hash_filter()
+
+
 @dataclass(slots=True)
 class RefreshEventTypesTask(RecorderTask):
     """An object to insert into the recorder queue to refresh event types."""
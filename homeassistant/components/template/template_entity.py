@@ -52,7 +52,7 @@ from homeassistant.helpers.trigger_template_entity import (
     TEMPLATE_ENTITY_BASE_SCHEMA,
     make_template_entity_base_schema,
 )
-from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.typing import UNDEFINED, ConfigType
 
 from .const import (
     CONF_ATTRIBUTE_TEMPLATES,
@@ -173,6 +173,8 @@ class _TemplateAttribute:
         self.on_update = on_update
         self.async_update = None
         self.none_on_template_error = none_on_template_error
+        # The value last passed to on_update
+        self._last_value: Any = UNDEFINED
 
     @callback
     def async_setup(self) -> None:
@@ -197,8 +199,11 @@ class _TemplateAttribute:
         template: Template,
         last_result: str | TemplateError | None,
         result: str | TemplateError,
-    ) -> None:
-        """Handle a template result event callback."""
+    ) -> bool:
+        """Handle a template result event callback.
+
+        Returns True unless the value passed on is equal to the last one.
+        """
         if isinstance(result, TemplateError):
             _LOGGER.error(
                 (
@@ -211,17 +216,19 @@ class _TemplateAttribute:
                 self._attribute,
                 self._entity.entity_id,
             )
+            # Errors are always passed on as changed
+            self._last_value = UNDEFINED
             if self.none_on_template_error:
                 self._default_update(result)
             else:
                 assert self.on_update
                 self.on_update(result)
-            return
+            return True
 
         if not self.validator:
             assert self.on_update
             self.on_update(result)
-            return
+            return self._value_changed(result)
 
         try:
             validated = self.validator(result)
@@ -241,11 +248,18 @@ class _TemplateAttribute:
             )
             assert self.on_update
             self.on_update(None)
-            return
+            return self._value_changed(None)
 
         assert self.on_update
         self.on_update(validated)
-        return
+        return self._value_changed(validated)
+
+    def _value_changed(self, value: Any) -> bool:
+        """Store the value passed on and return if it changed."""
+        if self._last_value is not UNDEFINED and value == self._last_value:
+            return False
+        self._last_value = value
+        return True
 
 
 class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
@@ -272,6 +286,8 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
         self._template_result_info: TrackTemplateResultInfo | None = None
         self._attr_extra_state_attributes = {}
         self._self_ref_update_count = 0
+        self._suppressed_write_count = 0
+        self._last_written_state: State | None = None
         self._attr_unique_id = unique_id
         self._preview_callback: (
             Callable[
@@ -380,6 +396,11 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
             attribute_key, attribute_template, None, _update_attribute
         )
 
+    @property
+    def suppressed_write_count(self) -> int:
+        """Return the number of template updates that did not write the state."""
+        return self._suppressed_write_count
+
     @property
     def referenced_blueprint(self) -> str | None:
         """Return referenced blueprint or None."""
@@ -453,14 +474,26 @@ class TemplateEntity(Entity):  # pylint: disable=hass-enforce-class-module
                 )
             return
 
+        changed = False
         for update in updates:
             for template_attr in self._template_attrs[update.template]:
-                template_attr.handle_result(
+                changed |= template_attr.handle_result(
                     event, update.template, update.last_result, update.result
                 )
 
         if not self._preview_callback:
+            # Skip calculating the state if no template value changed and
+            # nothing else wrote the state since the last template update
+            if (
+                not changed
+                and not self.force_update
+                and self._last_written_state is not None
+                and self.hass.states.get(self.entity_id) is self._last_written_state
+            ):
+                self._suppressed_write_count += 1
+                return
             self.async_write_ha_state()
+            self._last_written_state = self.hass.states.get(self.entity_id)
             return
 
         try:
@@ -43,6 +43,8 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
+    async_set_template_render_budget,
+    async_template_render_stats,
     async_track_template_result,
 )
 from homeassistant.helpers.json import (
@@ -89,6 +91,8 @@ def async_register_commands(
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
+    async_reg(hass, handle_template_set_render_budget)
+    async_reg(hass, handle_template_stats)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
@@ -693,6 +697,34 @@ def _serialize_entity_sources(
     }
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "template/stats"})
+@decorators.require_admin
+def handle_template_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle template stats command."""
+    connection.send_result(msg["id"], async_template_render_stats(hass))
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "template/set_render_budget",
+        vol.Required("render_budget"): vol.Any(
+            None, vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False))
+        ),
+    }
+)
+@decorators.require_admin
+def handle_template_set_render_budget(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle setting the render time budget of tracked templates."""
+    async_set_template_render_budget(hass, msg["render_budget"])
+    connection.send_result(msg["id"])
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "entity/source"})
 def handle_entity_source(
@@ -21,6 +21,7 @@ from homeassistant.helpers.json import (
     JSON_DUMP,
     find_paths_unserializable_data,
     json_bytes,
+    json_fragment,
 )
 from homeassistant.util.json import format_unserializable_data
 
@@ -169,6 +170,18 @@ def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> b
     The message is constructed without the id which
     will be appended in cached_state_diff_message
     """
+    if (
+        event.data["old_state"] is None
+        and (new_state := event.data["new_state"]) is not None
+    ):
+        # Reuse the compressed state JSON cached on the State
+        # instead of serializing its attributes again
+        try:
+            added = json_fragment(b"{" + new_state.as_compressed_state_json + b"}")
+        except (ValueError, TypeError):
+            pass
+        else:
+            return json_bytes({"type": "event", "event": {ENTITY_EVENT_ADD: added}})
     return (
         _message_to_json_bytes_or_none(
             {"type": "event", "event": _state_diff_event(event)}
@@ -221,9 +234,9 @@ def _state_diff_event(
             additions[COMPRESSED_STATE_CONTEXT]["id"] = new_state_context.id
         else:
             additions[COMPRESSED_STATE_CONTEXT] = new_state_context.id
-    if (old_attributes := old_state.attributes) != (
+    if (old_attributes := old_state.attributes) is not (
         new_attributes := new_state.attributes
-    ):
+    ) and old_attributes != new_attributes:
         if added := {
             key: value
             for key, value in new_attributes.items()
@@ -3023,6 +3023,7 @@ class EntityRegistryDisabledHandler:
             self.hass,
             RELOAD_AFTER_UPDATE_DELAY,
             HassJob(self._async_handle_reload, cancel_on_shutdown=True),
+            coarse=True,
         )
 
     @callback
@@ -12,7 +12,9 @@ from collections.abc import (
     Callable,
     Collection,
     Coroutine,
+    Hashable,
     Iterable,
+    Iterator,
     KeysView,
     Mapping,
     ValuesView,
@@ -23,8 +25,10 @@ from dataclasses import dataclass
 import datetime
 import enum
 import functools
+from heapq import heapify, heappop, heappush
 import inspect
 import logging
+import math
 import os
 import pathlib
 import re
@@ -106,12 +110,18 @@ from .util.async_ import (
     shutdown_run_callback_threadsafe,
 )
 from .util.event_type import EventType
-from .util.executor import InterruptibleThreadPoolExecutor
+from .util.executor import ExecutorLanes, InterruptibleThreadPoolExecutor
 from .util.hass_dict import HassDict
 from .util.json import JsonObjectType
 from .util.read_only_dict import ReadOnlyDict
+from .util.task_stats import TaskStats, executor_job_domain, executor_job_lane
 from .util.timeout import TimeoutManager
-from .util.ulid import ulid_at_time, ulid_now
+from .util.ulid import (
+    bytes_to_ulid,
+    ulid_at_time,
+    ulid_at_time_bytes,
+    ulid_to_bytes_or_none,
+)
 from .util.unit_system import (
     _CONF_UNIT_SYSTEM_IMPERIAL,
     _CONF_UNIT_SYSTEM_US_CUSTOMARY,
@@ -437,6 +447,9 @@ class HomeAssistant:
         self.loop = asyncio.get_running_loop()
         self._tasks: set[asyncio.Future[Any]] = set()
         self._background_tasks: set[asyncio.Future[Any]] = set()
+        # Per integration accounting of tasks and executor jobs, only
+        # set while it is enabled since it adds overhead to every task
+        self.task_stats: TaskStats | None = None
         self.bus = EventBus(self)
         self.services = ServiceRegistry(self)
         self.states = StateMachine(self.bus, self.loop)
@@ -455,6 +468,8 @@ class HomeAssistant:
         self.import_executor = InterruptibleThreadPoolExecutor(
             max_workers=1, thread_name_prefix="ImportExecutor"
         )
+        # Share the workers of the default executor fairly between integrations
+        self.executor_lanes = ExecutorLanes(self.loop, job_lane=executor_job_lane)
         self.loop_thread_id = getattr(self.loop, "_thread_id")
 
     def verify_event_loop_thread(self, what: str) -> None:
@@ -756,9 +771,10 @@ class HomeAssistant:
         if hassjob.job_type is HassJobType.Coroutinefunction:
             if TYPE_CHECKING:
                 hassjob = cast(HassJob[..., Coroutine[Any, Any, _R]], hassjob)
-            task = create_eager_task(
-                hassjob.target(*args), name=hassjob.name, loop=self.loop
-            )
+            coro = hassjob.target(*args)
+            task = create_eager_task(coro, name=hassjob.name, loop=self.loop)
+            if self.task_stats is not None:
+                self.task_stats.async_add_task(task, coro)
             if task.done():
                 return task
         elif hassjob.job_type is HassJobType.Callback:
@@ -831,12 +847,14 @@ class HomeAssistant:
         """
         if eager_start:
             task = create_eager_task(target, name=name, loop=self.loop)
-            if task.done():
-                return task
         else:
             # Use loop.create_task
             # to avoid the extra function call in asyncio.create_task.
             task = self.loop.create_task(target, name=name)
+        if self.task_stats is not None:
+            self.task_stats.async_add_task(task, target)
+        if task.done():
+            return task
         self._tasks.add(task)
         task.add_done_callback(self._tasks.remove)
         return task
@@ -863,12 +881,14 @@ class HomeAssistant:
         """
         if eager_start:
             task = create_eager_task(target, name=name, loop=self.loop)
-            if task.done():
-                return task
         else:
             # Use loop.create_task
             # to avoid the extra function call in asyncio.create_task.
             task = self.loop.create_task(target, name=name)
+        if self.task_stats is not None:
+            self.task_stats.async_add_task(task, target)
+        if task.done():
+            return task
         self._background_tasks.add(task)
         task.add_done_callback(self._background_tasks.remove)
         return task
@@ -878,9 +898,19 @@ class HomeAssistant:
         self, target: Callable[[*_Ts], _T], *args: *_Ts
     ) -> asyncio.Future[_T]:
         """Add an executor job from within the event loop."""
-        task = self.loop.run_in_executor(None, target, *args)
+        current_task = asyncio.current_task()
+        if self.task_stats is not None:
+            # The statistics need the domain of every job
+            domain, integration = executor_job_domain(current_task, target)
+            # Only jobs run for an integration are limited to its lane
+            lane = domain if integration else None
+            task = self.task_stats.async_run_in_executor(
+                self.executor_lanes, domain, lane, target, *args
+            )
+        else:
+            task = self.executor_lanes.async_run_for_task(current_task, target, *args)
 
-        tracked = asyncio.current_task() in self._tasks
+        tracked = current_task in self._tasks
         task_bucket = self._tasks if tracked else self._background_tasks
         task_bucket.add(task)
         task.add_done_callback(task_bucket.remove)
@@ -1248,21 +1278,64 @@ class HomeAssistant:
 class Context:
     """The context that triggered something."""
 
-    __slots__ = ("id", "user_id", "parent_id", "origin_event", "_cache")
+    __slots__ = (
+        "user_id",
+        "parent_id",
+        "origin_event",
+        "_cache",
+        "_created",
+        "_id",
+        "_id_bin",
+    )
 
     def __init__(
         self,
         user_id: str | None = None,
         parent_id: str | None = None,
         id: str | None = None,  # pylint: disable=redefined-builtin
+        *,
+        created: float | None = None,
     ) -> None:
-        """Init the context."""
-        self.id = id or ulid_now()
+        """Init the context.
+
+        created is the timestamp the ULID is generated for when no id is
+        passed, it defaults to the current time.
+        """
+        # Most contexts are never read, so the ULID is only generated when
+        # the id is first accessed. It uses the time the context was
+        # created so ids still sort in creation order.
+        self._id = id or None
+        self._id_bin: bytes | None = None
+        self._created = time.time() if created is None else created
         self.user_id = user_id
         self.parent_id = parent_id
         self.origin_event: Event[Any] | None = None
         self._cache: dict[str, Any] = {}
 
+    @property
+    def id(self) -> str:
+        """Return the id of the context."""
+        if (id_ := self._id) is None:
+            if self._id_bin is None:
+                id_ = self._id = ulid_at_time(self._created)
+            else:
+                id_ = self._id = bytes_to_ulid(self._id_bin)
+        return id_
+
+    @property
+    def id_bin(self) -> bytes | None:
+        """Return the id of the context as ULID bytes.
+
+        Returns None if the context was created with an id that is not a ULID.
+        """
+        if (id_bin := self._id_bin) is None:
+            if (id_ := self._id) is None:
+                id_bin = ulid_at_time_bytes(self._created)
+            elif (id_bin := ulid_to_bytes_or_none(id_)) is None:
+                return None
+            self._id_bin = id_bin
+        return id_bin
+
     def __eq__(self, other: object) -> bool:
         """Compare contexts."""
         return isinstance(other, Context) and self.id == other.id
@@ -1345,7 +1418,7 @@ class Event(Generic[_DataT]):
         self.origin = origin
         self.time_fired_timestamp = time_fired_timestamp or time.time()
         if not context:
-            context = Context(id=ulid_at_time(self.time_fired_timestamp))
+            context = Context(created=self.time_fired_timestamp)
         self.context = context
         if not context.origin_event:
             context.origin_event = self
@@ -1447,6 +1520,10 @@ class _OneTimeListener(Generic[_DataT]):
         return f"<_OneTimeListener {self.listener_job.target}>"
 
 
+# Indexed listeners of an event type, keyed by event data key and then value
+_ListenerIndexType = dict[str, dict[Hashable, list[_FilterableJobType[_DataT]]]]
+
+
 # Empty list, used by EventBus.async_fire_internal
 EMPTY_LIST: list[Any] = []
 
@@ -1461,13 +1538,22 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_debug",
+        "_hass",
+        "_indexed_listeners",
+        "_listeners",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: defaultdict[
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
+        self._indexed_listeners: dict[
+            EventType[Any] | str, _ListenerIndexType[Any]
+        ] = {}
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
         self._hass = hass
@@ -1485,7 +1571,16 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        counts = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, indexes in self._indexed_listeners.items():
+            jobs = {
+                id(filterable_job): filterable_job
+                for index in indexes.values()
+                for filterable_jobs in index.values()
+                for filterable_job in filterable_jobs
+            }
+            counts[event_type] = counts.get(event_type, 0) + len(jobs)
+        return counts
 
     @property
     def listeners(self) -> dict[EventType[Any] | str, int]:
@@ -1551,6 +1646,18 @@ class EventBus:
             )
 
         listeners = self._listeners.get(event_type, EMPTY_LIST)
+        if event_data is not None and (
+            indexes := self._indexed_listeners.get(event_type)
+        ):
+            for key, index in indexes.items():
+                try:
+                    matched = index.get(event_data.get(key))
+                except TypeError:
+                    # The event data value is not hashable and can
+                    # never match an indexed listener
+                    continue
+                if matched:
+                    listeners = listeners + matched
         if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
             match_all_listeners = self._match_all_listeners
         else:
@@ -1607,6 +1714,8 @@ class EventBus:
         listener: Callable[[Event[_DataT]], Coroutine[Any, Any, None] | None],
         event_filter: Callable[[_DataT], bool] | None = None,
         run_immediately: bool | object = _SENTINEL,
+        *,
+        match: Mapping[str, Collection[Hashable]] | None = None,
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -1617,6 +1726,15 @@ class EventBus:
         @callback that returns a boolean value, determines if the
         listener callable should run.
 
+        An optional match, which maps a single event data key to the
+        collection of values that should be matched, e.g.
+        ``{"entity_id": {"light.kitchen"}}``, determines if the listener
+        callable should run. Unlike event_filter, matches are kept in a hash
+        index so the cost of dispatching an event does not grow with the
+        number of listeners that do not match. When both match and
+        event_filter are passed, the event_filter is only called for events
+        that match.
+
         If run_immediately is passed:
           - callbacks will be run right away instead of using call_soon.
           - coroutine functions will be scheduled eagerly.
@@ -1636,6 +1754,8 @@ class EventBus:
         if event_filter is not None and not is_callback_check_partial(event_filter):
             raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
         filterable_job = (HassJob(listener, f"listen {event_type}"), event_filter)
+        if match is not None:
+            return self._async_listen_indexed_job(event_type, filterable_job, match)
         if event_type == EVENT_STATE_REPORTED:
             if not event_filter:
                 raise HomeAssistantError(
@@ -1643,6 +1763,35 @@ class EventBus:
                 )
         return self._async_listen_filterable_job(event_type, filterable_job)
 
+    @callback
+    def _async_listen_indexed_job(
+        self,
+        event_type: EventType[_DataT] | str,
+        filterable_job: _FilterableJobType[_DataT],
+        match: Mapping[str, Collection[Hashable]],
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type matching indexed event data."""
+        if event_type == MATCH_ALL:
+            raise HomeAssistantError(f"Match is not supported for event {event_type}")
+        if len(match) != 1:
+            raise HomeAssistantError(
+                f"Match must contain exactly one event data key, got {list(match)}"
+            )
+        key, values = next(iter(match.items()))
+        # A single string is a collection of characters, which is never what
+        # the caller intended
+        values = (values,) if isinstance(values, str) else tuple(set(values))
+        index = self._indexed_listeners.setdefault(event_type, {}).setdefault(key, {})
+        for value in values:
+            index.setdefault(value, []).append(filterable_job)
+        return functools.partial(
+            self._async_remove_indexed_listener,
+            event_type,
+            key,
+            values,
+            filterable_job,
+        )
+
     @callback
     def _async_listen_filterable_job(
         self,
@@ -1743,6 +1892,35 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_remove_indexed_listener(
+        self,
+        event_type: EventType[_DataT] | str,
+        key: str,
+        values: tuple[Hashable, ...],
+        filterable_job: _FilterableJobType[_DataT],
+    ) -> None:
+        """Remove an indexed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            indexes = self._indexed_listeners[event_type]
+            index = indexes[key]
+            for value in values:
+                filterable_jobs = index[value]
+                filterable_jobs.remove(filterable_job)
+                if not filterable_jobs:
+                    del index[value]
+            if not index:
+                del indexes[key]
+            if not indexes:
+                del self._indexed_listeners[event_type]
+        except (KeyError, ValueError):
+            _LOGGER.exception(
+                "Unable to remove unknown job listener %s", filterable_job
+            )
+
 
 class CompressedState(TypedDict):
     """Compressed dict of a state."""
@@ -1911,10 +2089,21 @@ class State:
             as_dict["context"] = ReadOnlyDict(context)
         return ReadOnlyDict(as_dict)
 
+    @under_cached_property
+    def attributes_json(self) -> bytes:
+        """Return a JSON string of the attributes of the State.
+
+        The JSON string is shared with the next State of the same entity
+        when the attributes did not change.
+        """
+        return json_bytes(self.attributes)
+
     @under_cached_property
     def as_dict_json(self) -> bytes:
         """Return a JSON string of the State."""
-        return json_bytes(self._as_dict)
+        return json_bytes(
+            {**self._as_dict, "attributes": json_fragment(self.attributes_json)}
+        )
 
     @under_cached_property
     def json_fragment(self) -> json_fragment:
@@ -1957,7 +2146,11 @@ class State:
 
         It is used for sending multiple states in a single message.
         """
-        return json_bytes({self.entity_id: self.as_compressed_state})[1:-1]
+        compressed_state: dict[str, Any] = {
+            **self.as_compressed_state,
+            COMPRESSED_STATE_ATTRIBUTES: json_fragment(self.attributes_json),
+        }
+        return json_bytes({self.entity_id: compressed_state})[1:-1]
 
     @classmethod
     def from_dict(cls, json_dict: dict[str, Any]) -> Self | None:
@@ -2023,17 +2216,128 @@ class State:
         )
 
 
+def _numeric_state(state: str) -> float | None:
+    """Return a state as a finite number, or None if it is not numeric."""
+    try:
+        value = float(state)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+class NumericStates(Collection[float]):
+    """Numeric states of the entities of a domain with running aggregates.
+
+    The sum is kept exact as the non overlapping partials math.fsum adds
+    up. The minimum and maximum are kept in heaps, entries of values that
+    have since changed are dropped when they reach the top of a heap.
+    """
+
+    __slots__ = ("_max_heap", "_min_heap", "_partials", "_values")
+
+    def __init__(self, values: dict[str, float]) -> None:
+        """Initialize the numeric states."""
+        self._values = values
+        self._partials: list[float] = []
+        for value in values.values():
+            self._add_to_sum(value)
+        self._min_heap: list[tuple[float, str]] = []
+        self._max_heap: list[tuple[float, str]] = []
+        self._rebuild_heaps()
+
+    def __contains__(self, value: object) -> bool:
+        """Return if a value is one of the numeric states."""
+        return value in self._values.values()
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterate over the numeric states."""
+        return iter(self._values.values())
+
+    def __len__(self) -> int:
+        """Return the number of numeric states."""
+        return len(self._values)
+
+    def set(self, entity_id: str, value: float | None) -> None:
+        """Set the numeric state of an entity, None removes it."""
+        values = self._values
+        if (old_value := values.pop(entity_id, None)) is not None:
+            self._add_to_sum(-old_value)
+        if value is None:
+            return
+        values[entity_id] = value
+        self._add_to_sum(value)
+        if len(self._min_heap) + len(self._max_heap) > 4 * len(values) + 32:
+            self._rebuild_heaps()
+            return
+        heappush(self._min_heap, (value, entity_id))
+        heappush(self._max_heap, (-value, entity_id))
+
+    def _rebuild_heaps(self) -> None:
+        """Rebuild the heaps without the entries of changed values."""
+        self._min_heap = [
+            (value, entity_id) for entity_id, value in self._values.items()
+        ]
+        self._max_heap = [
+            (-value, entity_id) for entity_id, value in self._values.items()
+        ]
+        heapify(self._min_heap)
+        heapify(self._max_heap)
+
+    def _add_to_sum(self, value: float) -> None:
+        """Add a value to the partials of the sum."""
+        partials = self._partials
+        idx = 0
+        for partial in partials:
+            if abs(value) < abs(partial):
+                value, partial = partial, value
+            high = value + partial
+            low = partial - (high - value)
+            if low:
+                partials[idx] = low
+                idx += 1
+            value = high
+        partials[idx:] = [value]
+
+    def sum(self) -> float:
+        """Return the sum of the numeric states."""
+        return math.fsum(self._partials)
+
+    def min(self) -> float:
+        """Return the minimum, there must be at least one numeric state."""
+        heap = self._min_heap
+        values = self._values
+        while values.get(heap[0][1]) != heap[0][0]:
+            heappop(heap)
+        return heap[0][0]
+
+    def max(self) -> float:
+        """Return the maximum, there must be at least one numeric state."""
+        heap = self._max_heap
+        values = self._values
+        while values.get(heap[0][1]) != -heap[0][0]:
+            heappop(heap)
+        return -heap[0][0]
+
+
 class States(UserDict[str, State]):
     """Container for states, maps entity_id -> State.
 
-    Maintains an additional index:
+    Maintains additional indexes:
     - domain -> dict[str, State]
+    - domain -> state -> number of entities with that state
+    - domain -> NumericStates
+
+    The state counts and numeric states are only maintained for domains
+    with a consumer added with add_domain_aggregates_consumer.
     """
 
     def __init__(self) -> None:
         """Initialize the container."""
         super().__init__()
         self._domain_index: defaultdict[str, dict[str, State]] = defaultdict(dict)
+        self._domain_state_counts: dict[str, dict[str, int]] = {}
+        self._domain_numeric_index: dict[str, NumericStates] = {}
+        self._domain_aggregate_consumers: dict[str, int] = {}
 
     def values(self) -> ValuesView[State]:
         """Return the underlying values to avoid __iter__ overhead."""
@@ -2041,15 +2345,87 @@ class States(UserDict[str, State]):
 
     def __setitem__(self, key: str, entry: State) -> None:
         """Add an item."""
+        old_entry = self.data.get(key)
         self.data[key] = entry
-        self._domain_index[entry.domain][entry.entity_id] = entry
+        domain = entry.domain
+        self._domain_index[domain][entry.entity_id] = entry
+        if (old_entry is not None and old_entry.state == entry.state) or (
+            counts := self._domain_state_counts.get(domain)
+        ) is None:
+            return
+        if old_entry is not None:
+            self._discount_state(counts, old_entry.state)
+        counts[entry.state] = counts.get(entry.state, 0) + 1
+        self._domain_numeric_index[domain].set(key, _numeric_state(entry.state))
 
     def __delitem__(self, key: str) -> None:
         """Remove an item."""
         entry = self[key]
-        del self._domain_index[entry.domain][entry.entity_id]
+        domain = entry.domain
+        del self._domain_index[domain][entry.entity_id]
+        if (counts := self._domain_state_counts.get(domain)) is not None:
+            self._discount_state(counts, entry.state)
+            self._domain_numeric_index[domain].set(key, None)
         super().__delitem__(key)
 
+    @staticmethod
+    def _discount_state(counts: dict[str, int], state: str) -> None:
+        """Remove an entity with a state from the state counts of its domain."""
+        if (count := counts[state]) == 1:
+            del counts[state]
+        else:
+            counts[state] = count - 1
+
+    def domain_state_counts(self, key: str) -> Mapping[str, int]:
+        """Get the number of entities of a domain by state.
+
+        The states of the domain are counted if it has no consumer.
+        """
+        if (counts := self._domain_state_counts.get(key)) is not None:
+            return counts
+        counts = {}
+        # Avoid polluting _domain_index with non-existing domains
+        for state in self._domain_index.get(key, {}).values():
+            counts[state.state] = counts.get(state.state, 0) + 1
+        return counts
+
+    def domain_numeric_states(self, key: str) -> NumericStates:
+        """Get the numeric states of a domain.
+
+        The numeric states are collected if the domain has no consumer.
+        """
+        if (numeric := self._domain_numeric_index.get(key)) is not None:
+            return numeric
+        return NumericStates(
+            {
+                entity_id: value
+                for entity_id, state in self._domain_index.get(key, {}).items()
+                if (value := _numeric_state(state.state)) is not None
+            }
+        )
+
+    def add_domain_aggregates_consumer(self, key: str) -> Callable[[], None]:
+        """Maintain the state counts and numeric states of a domain.
+
+        They are maintained until every consumer called the returned
+        function to remove itself.
+        """
+        consumers = self._domain_aggregate_consumers
+        if (count := consumers.get(key, 0)) == 0:
+            self._domain_state_counts[key] = dict(self.domain_state_counts(key))
+            self._domain_numeric_index[key] = self.domain_numeric_states(key)
+        consumers[key] = count + 1
+
+        def _remove_consumer() -> None:
+            if (count := consumers[key]) > 1:
+                consumers[key] = count - 1
+                return
+            del consumers[key]
+            del self._domain_state_counts[key]
+            del self._domain_numeric_index[key]
+
+        return _remove_consumer
+
     def domain_entity_ids(self, key: str) -> KeysView[str] | tuple[()]:
         """Get all entity_ids for a domain."""
         # Avoid polluting _domain_index with non-existing domains
@@ -2065,6 +2441,27 @@ class States(UserDict[str, State]):
         return self._domain_index[key].values()
 
 
+# The arguments of StateMachine.async_set_internal
+type StateUpdateType = tuple[
+    str,  # entity_id
+    str,  # new_state
+    Mapping[str, Any] | None,  # attributes
+    bool,  # force_update
+    Context | None,  # context
+    StateInfo | None,  # state_info
+    float,  # timestamp
+]
+
+# The arguments of EventBus.async_fire_internal for a state change
+type _StateEventType = tuple[
+    EventType[EventStateChangedData] | EventType[EventStateReportedData],
+    EventStateChangedData | EventStateReportedData,
+    EventOrigin,
+    Context,
+    float,
+]
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
@@ -2124,6 +2521,35 @@ class StateMachine:
             len(self._states.domain_entity_ids(domain)) for domain in domain_filter
         )
 
+    @callback
+    def async_domain_state_counts(self, domain: str) -> Mapping[str, int]:
+        """Return the number of entities of a domain by state.
+
+        The counts are maintained as states change while the domain is
+        tracked with async_track_domain_aggregates, so this does not iterate
+        the states. This method must be run in the event loop.
+        """
+        return self._states.domain_state_counts(domain.lower())
+
+    @callback
+    def async_domain_numeric_states(self, domain: str) -> NumericStates:
+        """Return the finite numeric states of a domain.
+
+        The numeric states are only maintained as states change while the
+        domain is tracked with async_track_domain_aggregates. This method
+        must be run in the event loop.
+        """
+        return self._states.domain_numeric_states(domain.lower())
+
+    @callback
+    def async_track_domain_aggregates(self, domain: str) -> CALLBACK_TYPE:
+        """Maintain the state counts and numeric states of a domain.
+
+        Returns a function to stop tracking them. This method must be
+        run in the event loop.
+        """
+        return self._states.add_domain_aggregates_consumer(domain.lower())
+
     def all(self, domain_filter: str | Iterable[str] | None = None) -> list[State]:
         """Create a list of all states."""
         return run_callback_threadsafe(
@@ -2284,6 +2710,67 @@ class StateMachine:
             timestamp or time.time(),
         )
 
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+    ) -> None:
+        """Set the state of multiple entities, add entities if they do not exist.
+
+        states is an iterable of (entity_id, new_state, attributes) tuples.
+
+        The states are stored in the order they were passed before any
+        state_changed event is fired, the events are then fired in the
+        same order. States are not validated up front: if a state is
+        invalid, the states before it stay stored and their events are
+        still fired, the states after it are not set and the error is
+        raised.
+
+        This method must be run in the event loop.
+        """
+        timestamp = time.time()
+        self.async_set_many_internal(
+            [
+                (
+                    entity_id.lower(),
+                    str(new_state),
+                    attributes or {},
+                    force_update,
+                    context,
+                    None,
+                    timestamp,
+                )
+                for entity_id, new_state, attributes in states
+            ]
+        )
+
+    @callback
+    def async_set_many_internal(self, updates: Iterable[StateUpdateType]) -> None:
+        """Set the state of multiple entities, add entities if they do not exist.
+
+        Each update is a tuple of the arguments of async_set_internal.
+
+        This method is intended to only be used by core internally
+        and should not be considered a stable API. We will make
+        breaking changes to this function in the future and it
+        should not be used in integrations.
+
+        This method must be run in the event loop.
+        """
+        events: list[_StateEventType] = []
+        try:
+            # extend appends every event as soon as it is created, so the
+            # events of the updates before a failed one are kept
+            events.extend(self._async_update_state(*update) for update in updates)
+        finally:
+            # Every state that made it into the state machine must have
+            # its event fired, even if a later update in the batch failed
+            fire = self._bus.async_fire_internal
+            for event in events:
+                fire(*event)
+
     @callback
     def async_set_internal(
         self,
@@ -2304,6 +2791,30 @@ class StateMachine:
 
         This method must be run in the event loop.
         """
+        self._bus.async_fire_internal(
+            *self._async_update_state(
+                entity_id,
+                new_state,
+                attributes,
+                force_update,
+                context,
+                state_info,
+                timestamp,
+            )
+        )
+
+    @callback
+    def _async_update_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Mapping[str, Any] | None,
+        force_update: bool,
+        context: Context | None,
+        state_info: StateInfo | None,
+        timestamp: float,
+    ) -> _StateEventType:
+        """Update the state of an entity and return the event to fire."""
         # Most cases the key will be in the dict
         # so we optimize for the happy path as
         # python 3.11+ has near zero overhead for
@@ -2318,7 +2829,11 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == attributes
+            # The attributes are often passed back unchanged as the
+            # ReadOnlyDict of the old state so check identity first
+            # to avoid comparing every attribute
+            old_attributes = old_state.attributes
+            same_attr = attributes is old_attributes or old_attributes == attributes
             last_changed = old_state.last_changed if same_state else None
 
         # It is much faster to convert a timestamp to a utc datetime object
@@ -2335,7 +2850,7 @@ class StateMachine:
         now = dt_util.utc_from_timestamp(timestamp)
 
         if context is None:
-            context = Context(id=ulid_at_time(timestamp))
+            context = Context(created=timestamp)
 
         if same_state and same_attr:
             # mypy does not understand this is only possible if old_state is not None
@@ -2343,17 +2858,17 @@ class StateMachine:
             old_state.last_reported = now  # type: ignore[union-attr]
             old_state._cache["last_reported_timestamp"] = timestamp  # type: ignore[union-attr] # noqa: SLF001
             # Avoid creating an EventStateReportedData
-            self._bus.async_fire_internal(  # type: ignore[misc]
+            return (
                 EVENT_STATE_REPORTED,
                 {
                     "entity_id": entity_id,
                     "old_last_reported": old_last_reported,
                     "new_state": old_state,
                 },
-                context=context,
-                time_fired=timestamp,
+                EventOrigin.local,
+                context,
+                timestamp,
             )
-            return
 
         if same_attr:
             if TYPE_CHECKING:
@@ -2375,6 +2890,12 @@ class StateMachine:
             timestamp,
         )
         if old_state is not None:
+            if same_attr and (
+                attributes_json := old_state._cache.get("attributes_json")  # noqa: SLF001
+            ):
+                # The attributes are shared with the old state
+                # so its serialized attributes can be shared as well
+                state._cache["attributes_json"] = attributes_json  # noqa: SLF001
             old_state.expire()
         self._states[entity_id] = state
         state_changed_data: EventStateChangedData = {
@@ -2382,11 +2903,12 @@ class StateMachine:
             "old_state": old_state,
             "new_state": state,
         }
-        self._bus.async_fire_internal(
+        return (
             EVENT_STATE_CHANGED,
             state_changed_data,
-            context=context,
-            time_fired=timestamp,
+            EventOrigin.local,
+            context,
+            timestamp,
         )
 
 
@@ -382,6 +382,64 @@ def async_numeric_state(
     attribute: str | None = None,
 ) -> bool:
     """Test a numeric state condition."""
+    return _async_numeric_state(
+        hass,
+        entity,
+        below,
+        above,
+        value_template,
+        {} if value_template is None else dict(variables or {}),
+        attribute,
+        {},
+    )
+
+
+def _async_numeric_limit(
+    hass: HomeAssistant, key: str, entity_id: str, limits: dict[str, float | None]
+) -> float | None:
+    """Return the state of a 'below' or 'above' entity as a number.
+
+    Returns None if the entity is unavailable or unknown. Resolved limits
+    are stored in limits, so they are only looked up once when a condition
+    checks multiple entities.
+    """
+    if entity_id in limits:
+        return limits[entity_id]
+    if not (limit_entity := hass.states.get(entity_id)):
+        raise ConditionErrorMessage(
+            "numeric_state", f"unknown '{key}' entity {entity_id}"
+        )
+    if limit_entity.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+        limits[entity_id] = None
+        return None
+    try:
+        value = limits[entity_id] = float(limit_entity.state)
+    except (ValueError, TypeError) as ex:
+        raise ConditionErrorMessage(
+            "numeric_state",
+            (
+                f"the '{key}' entity {entity_id} state '{limit_entity.state}'"
+                " cannot be processed as a number"
+            ),
+        ) from ex
+    return value
+
+
+def _async_numeric_state(
+    hass: HomeAssistant,
+    entity: str | State | None,
+    below: float | str | None,
+    above: float | str | None,
+    value_template: Template | None,
+    template_variables: dict[str, Any],
+    attribute: str | None,
+    limits: dict[str, float | None],
+) -> bool:
+    """Test a numeric state condition.
+
+    The template variables are updated with the state of the entity before
+    the value template is rendered.
+    """
     if entity is None:
         raise ConditionErrorMessage("numeric_state", "no entity specified")
 
@@ -407,10 +465,9 @@ def async_numeric_state(
         else:
             value = entity.attributes.get(attribute)
     else:
-        variables = dict(variables or {})
-        variables["state"] = entity
+        template_variables["state"] = entity
         try:
-            value = value_template.async_render(variables)
+            value = value_template.async_render(template_variables)
         except TemplateError as ex:
             raise ConditionErrorMessage(
                 "numeric_state", f"template error: {ex}"
@@ -434,62 +491,30 @@ def async_numeric_state(
 
     if below is not None:
         if isinstance(below, str):
-            if not (below_entity := hass.states.get(below)):
-                raise ConditionErrorMessage(
-                    "numeric_state", f"unknown 'below' entity {below}"
+            if (
+                below_value := _async_numeric_limit(hass, "below", below, limits)
+            ) is None:
+                return False
+            if fvalue >= below_value:
+                condition_trace_set_result(
+                    False, state=fvalue, wanted_state_below=below_value
                 )
-            if below_entity.state in (
-                STATE_UNAVAILABLE,
-                STATE_UNKNOWN,
-            ):
                 return False
-            try:
-                if fvalue >= float(below_entity.state):
-                    condition_trace_set_result(
-                        False,
-                        state=fvalue,
-                        wanted_state_below=float(below_entity.state),
-                    )
-                    return False
-            except (ValueError, TypeError) as ex:
-                raise ConditionErrorMessage(
-                    "numeric_state",
-                    (
-                        f"the 'below' entity {below} state '{below_entity.state}'"
-                        " cannot be processed as a number"
-                    ),
-                ) from ex
         elif fvalue >= below:
             condition_trace_set_result(False, state=fvalue, wanted_state_below=below)
             return False
 
     if above is not None:
         if isinstance(above, str):
-            if not (above_entity := hass.states.get(above)):
-                raise ConditionErrorMessage(
-                    "numeric_state", f"unknown 'above' entity {above}"
+            if (
+                above_value := _async_numeric_limit(hass, "above", above, limits)
+            ) is None:
+                return False
+            if fvalue <= above_value:
+                condition_trace_set_result(
+                    False, state=fvalue, wanted_state_above=above_value
                 )
-            if above_entity.state in (
-                STATE_UNAVAILABLE,
-                STATE_UNKNOWN,
-            ):
                 return False
-            try:
-                if fvalue <= float(above_entity.state):
-                    condition_trace_set_result(
-                        False,
-                        state=fvalue,
-                        wanted_state_above=float(above_entity.state),
-                    )
-                    return False
-            except (ValueError, TypeError) as ex:
-                raise ConditionErrorMessage(
-                    "numeric_state",
-                    (
-                        f"the 'above' entity {above} state '{above_entity.state}'"
-                        " cannot be processed as a number"
-                    ),
-                ) from ex
         elif fvalue <= above:
             condition_trace_set_result(False, state=fvalue, wanted_state_above=above)
             return False
@@ -505,6 +530,7 @@ def async_numeric_state_from_config(config: ConfigType) -> ConditionCheckerType:
     below = config.get(CONF_BELOW)
     above = config.get(CONF_ABOVE)
     value_template = config.get(CONF_VALUE_TEMPLATE)
+    trace_paths = [["entity_id", str(index)] for index in range(len(entity_ids))]
 
     @trace_condition_function
     def if_numeric_state(
@@ -512,17 +538,22 @@ def async_numeric_state_from_config(config: ConfigType) -> ConditionCheckerType:
     ) -> bool:
         """Test numeric state condition."""
         errors = []
+        # Shared by the entities, so the variables and the 'below'
+        # and 'above' entities are only processed once
+        template_variables = {} if value_template is None else dict(variables or {})
+        limits: dict[str, float | None] = {}
         for index, entity_id in enumerate(entity_ids):
             try:
-                with trace_path(["entity_id", str(index)]), trace_condition(variables):
-                    if not async_numeric_state(
+                with trace_path(trace_paths[index]), trace_condition(variables):
+                    if not _async_numeric_state(
                         hass,
                         entity_id,
                         below,
                         above,
                         value_template,
-                        variables,
+                        template_variables,
                         attribute,
+                        limits,
                     ):
                         return False
             except ConditionError as ex:
@@ -541,6 +572,11 @@ def async_numeric_state_from_config(config: ConfigType) -> ConditionCheckerType:
     return if_numeric_state
 
 
+def _is_state_entity_reference(req_state: Any) -> bool:
+    """Return if a wanted state is the entity id of an entity to compare with."""
+    return isinstance(req_state, str) and INPUT_ENTITY_ID.match(req_state) is not None
+
+
 def state(
     hass: HomeAssistant,
     entity: str | State | None,
@@ -553,6 +589,36 @@ def state(
 
     Async friendly.
     """
+    if not isinstance(req_state, list):
+        req_state = [req_state]
+    return _async_state(
+        hass,
+        entity,
+        req_state,
+        [_is_state_entity_reference(req_state_value) for req_state_value in req_state],
+        for_period,
+        attribute,
+        variables,
+        {},
+    )
+
+
+def _async_state(
+    hass: HomeAssistant,
+    entity: str | State | None,
+    req_states: list[Any],
+    req_state_references: list[bool],
+    for_period: timedelta | None,
+    attribute: str | None,
+    variables: TemplateVarsType,
+    resolved: dict[str, Any],
+) -> bool:
+    """Test if state matches requirements.
+
+    The states of referenced entities and the rendered period are stored in
+    resolved, so they are only processed once when a condition checks
+    multiple entities.
+    """
     if entity is None:
         raise ConditionErrorMessage("state", "no entity specified")
 
@@ -578,21 +644,18 @@ def state(
     else:
         value = entity.attributes.get(attribute)
 
-    if not isinstance(req_state, list):
-        req_state = [req_state]
-
     is_state = False
-    for req_state_value in req_state:
+    for req_state_value, is_reference in zip(
+        req_states, req_state_references, strict=True
+    ):
         state_value = req_state_value
-        if (
-            isinstance(req_state_value, str)
-            and INPUT_ENTITY_ID.match(req_state_value) is not None
-        ):
-            if not (state_entity := hass.states.get(req_state_value)):
-                raise ConditionErrorMessage(
-                    "state", f"the 'state' entity {req_state_value} is unavailable"
-                )
-            state_value = state_entity.state
+        if is_reference:
+            if (state_value := resolved.get(req_state_value)) is None:
+                if not (state_entity := hass.states.get(req_state_value)):
+                    raise ConditionErrorMessage(
+                        "state", f"the 'state' entity {req_state_value} is unavailable"
+                    )
+                state_value = resolved[req_state_value] = state_entity.state
         is_state = value == state_value
         if is_state:
             break
@@ -601,14 +664,17 @@ def state(
         condition_trace_set_result(is_state, state=value, wanted_state=state_value)
         return is_state
 
-    try:
-        for_period = cv.positive_time_period(render_complex(for_period, variables))
-    except TemplateError as ex:
-        raise ConditionErrorMessage("state", f"template error: {ex}") from ex
-    except vol.Invalid as ex:
-        raise ConditionErrorMessage("state", f"schema error: {ex}") from ex
+    if (period := resolved.get(CONF_FOR)) is None:
+        try:
+            period = resolved[CONF_FOR] = cv.positive_time_period(
+                render_complex(for_period, variables)
+            )
+        except TemplateError as ex:
+            raise ConditionErrorMessage("state", f"template error: {ex}") from ex
+        except vol.Invalid as ex:
+            raise ConditionErrorMessage("state", f"schema error: {ex}") from ex
 
-    duration = dt_util.utcnow() - cast(timedelta, for_period)
+    duration = dt_util.utcnow() - cast(timedelta, period)
     duration_ok = duration > entity.last_changed
     condition_trace_set_result(duration_ok, state=value, duration=duration)
     return duration_ok
@@ -624,17 +690,31 @@ def state_from_config(config: ConfigType) -> ConditionCheckerType:
 
     if not isinstance(req_states, list):
         req_states = [req_states]
+    req_state_references = [
+        _is_state_entity_reference(req_state) for req_state in req_states
+    ]
+    trace_paths = [["entity_id", str(index)] for index in range(len(entity_ids))]
 
     @trace_condition_function
     def if_state(hass: HomeAssistant, variables: TemplateVarsType = None) -> bool:
         """Test if condition."""
         errors = []
         result: bool = match != ENTITY_MATCH_ANY
+        # Shared by the entities, so referenced entities and
+        # the period are only processed once
+        resolved: dict[str, Any] = {}
         for index, entity_id in enumerate(entity_ids):
             try:
-                with trace_path(["entity_id", str(index)]), trace_condition(variables):
-                    if state(
-                        hass, entity_id, req_states, for_period, attribute, variables
+                with trace_path(trace_paths[index]), trace_condition(variables):
+                    if _async_state(
+                        hass,
+                        entity_id,
+                        req_states,
+                        req_state_references,
+                        for_period,
+                        attribute,
+                        variables,
+                        resolved,
                     ):
                         result = True
                     elif match == ENTITY_MATCH_ALL:
@@ -44,9 +44,11 @@ from homeassistant.core import (
     HassJobType,
     HomeAssistant,
     ReleaseChannel,
+    StateUpdateType,
     callback,
     get_hassjob_callable_job_type,
     get_release_channel,
+    validate_state,
 )
 from homeassistant.core_config import DATA_CUSTOMIZE
 from homeassistant.exceptions import (
@@ -1107,9 +1109,61 @@ class Entity(
     @callback
     def _async_write_ha_state(self) -> None:
         """Write the state to the state machine."""
+        if (update := self._async_calculate_state_update()) is None:
+            return
+
+        hass = self.hass
+        try:
+            hass.states.async_set_internal(*update)
+        except InvalidStateError:
+            _LOGGER.exception(
+                "Failed to set state for %s, fall back to %s",
+                self.entity_id,
+                STATE_UNKNOWN,
+            )
+            hass.states.async_set(
+                self.entity_id, STATE_UNKNOWN, {}, self.force_update, self._context
+            )
+
+    @callback
+    def _async_calculate_batch_state_update(self) -> StateUpdateType | None:
+        """Calculate the arguments to write the state as part of a batch.
+
+        Used by EntityPlatform.async_write_ha_states, returns None if the
+        state should not be written.
+        """
+        if not self.hass or not self._verified_state_writable:
+            self._async_verify_state_writable()
+        if (update := self._async_calculate_state_update()) is None:
+            return None
+        try:
+            validate_state(update[1])
+        except InvalidStateError:
+            _LOGGER.exception(
+                "Failed to set state for %s, fall back to %s",
+                self.entity_id,
+                STATE_UNKNOWN,
+            )
+            return (
+                self.entity_id,
+                STATE_UNKNOWN,
+                {},
+                self.force_update,
+                self._context,
+                None,
+                update[6],
+            )
+        return update
+
+    @callback
+    def _async_calculate_state_update(self) -> StateUpdateType | None:
+        """Calculate the arguments to write the state to the state machine.
+
+        Returns None if the state should not be written.
+        """
         if self._platform_state is EntityPlatformState.REMOVED:
             # Polling returned after the entity has already been removed
-            return
+            return None
 
         hass = self.hass
         entity_id = self.entity_id
@@ -1125,7 +1179,7 @@ class Entity(
                     entity_id,
                     self.platform.platform_name,
                 )
-            return
+            return None
 
         state_calculate_start = timer()
         state, attr, capabilities, original_device_class, supported_features = (
@@ -1207,23 +1261,15 @@ class Entity(
             self._context = None
             self._context_set = None
 
-        try:
-            hass.states.async_set_internal(
-                entity_id,
-                state,
-                attr,
-                self.force_update,
-                self._context,
-                self._state_info,
-                time_now,
-            )
-        except InvalidStateError:
-            _LOGGER.exception(
-                "Failed to set state for %s, fall back to %s", entity_id, STATE_UNKNOWN
-            )
-            hass.states.async_set(
-                entity_id, STATE_UNKNOWN, {}, self.force_update, self._context
-            )
+        return (
+            entity_id,
+            state,
+            attr,
+            self.force_update,
+            self._context,
+            self._state_info,
+            time_now,
+        )
 
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
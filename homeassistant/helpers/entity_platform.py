@@ -949,6 +949,28 @@ class EntityPlatform:
             self._async_polling_timer.cancel()
             self._async_polling_timer = None
 
+    @callback
+    def async_write_ha_states(self, entities: Iterable[Entity] | None = None) -> None:
+        """Write the state of multiple entities to the state machine.
+
+        All states are calculated and stored before any state_changed event
+        is fired. Defaults to all entities of the platform.
+
+        This method must be run in the event loop.
+        """
+        if entities is None:
+            entities = self.entities.values()
+        self.hass.states.async_set_many_internal(
+            [
+                update
+                for entity in entities
+                if (
+                    update := entity._async_calculate_batch_state_update()  # noqa: SLF001
+                )
+                is not None
+            ]
+        )
+
     @callback
     def async_prepare(self) -> None:
         """Register the entity platform in DATA_ENTITY_PLATFORM."""
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 import fnmatch
 from functools import lru_cache, partial
 import operator
@@ -30,6 +30,9 @@ CONF_EXCLUDE_ENTITIES = "exclude_entities"
 
 CONF_ENTITY_GLOBS = "entity_globs"
 
+# Number of distinct filter configs whose compiled filter is kept
+MAX_COMPILED_FILTERS = 64
+
 
 class EntityFilter:
     """A entity filter."""
@@ -38,19 +41,17 @@ class EntityFilter:
         """Init the filter."""
         self.empty_filter: bool = sum(len(val) for val in config.values()) == 0
         self.config = config
-        self._include_e = set(config[CONF_INCLUDE_ENTITIES])
-        self._exclude_e = set(config[CONF_EXCLUDE_ENTITIES])
-        self._include_d = set(config[CONF_INCLUDE_DOMAINS])
-        self._exclude_d = set(config[CONF_EXCLUDE_DOMAINS])
-        self._include_eg = _convert_globs_to_pattern(config[CONF_INCLUDE_ENTITY_GLOBS])
-        self._exclude_eg = _convert_globs_to_pattern(config[CONF_EXCLUDE_ENTITY_GLOBS])
-        self._filter = _generate_filter_from_sets_and_pattern_lists(
+        self._include_e = frozenset(config[CONF_INCLUDE_ENTITIES])
+        self._exclude_e = frozenset(config[CONF_EXCLUDE_ENTITIES])
+        self._include_d = frozenset(config[CONF_INCLUDE_DOMAINS])
+        self._exclude_d = frozenset(config[CONF_EXCLUDE_DOMAINS])
+        self._include_eg, self._exclude_eg, self._filter = _compile_filter(
             self._include_d,
             self._include_e,
             self._exclude_d,
             self._exclude_e,
-            self._include_eg,
-            self._exclude_eg,
+            frozenset(config[CONF_INCLUDE_ENTITY_GLOBS]),
+            frozenset(config[CONF_EXCLUDE_ENTITY_GLOBS]),
         )
 
     def explicitly_included(self, entity_id: str) -> bool:
@@ -69,6 +70,10 @@ class EntityFilter:
         """Return the filter function."""
         return self._filter
 
+    def filter_entity_ids(self, entity_ids: Iterable[str]) -> list[str]:
+        """Return the entity ids that pass the filter."""
+        return list(filter(self._filter, entity_ids))
+
     def __call__(self, entity_id: str) -> bool:
         """Run the filter."""
         return self._filter(entity_id)
@@ -145,6 +150,32 @@ INCLUDE_EXCLUDE_FILTER_SCHEMA = vol.All(
 )
 
 
+@lru_cache(maxsize=MAX_COMPILED_FILTERS)
+def _compile_filter(
+    include_d: frozenset[str],
+    include_e: frozenset[str],
+    exclude_d: frozenset[str],
+    exclude_e: frozenset[str],
+    include_eg: frozenset[str],
+    exclude_eg: frozenset[str],
+) -> tuple[re.Pattern[str] | None, re.Pattern[str] | None, Callable[[str], bool]]:
+    """Compile a filter config to its glob patterns and filter function.
+
+    Filters with an identical config share the filter function, and with
+    it the memoized decisions per entity_id. A changed config compiles
+    to a new filter function, so stale decisions are never used.
+    """
+    include_pattern = _convert_globs_to_pattern(list(include_eg))
+    exclude_pattern = _convert_globs_to_pattern(list(exclude_eg))
+    return (
+        include_pattern,
+        exclude_pattern,
+        _generate_filter_from_sets_and_pattern_lists(
+            include_d, include_e, exclude_d, exclude_e, include_pattern, exclude_pattern
+        ),
+    )
+
+
 def _convert_globs_to_pattern(globs: list[str] | None) -> re.Pattern[str] | None:
     """Convert a list of globs to a re pattern list."""
     if globs is None:
@@ -171,21 +202,21 @@ def generate_filter(
     exclude_entity_globs: list[str] | None = None,
 ) -> Callable[[str], bool]:
     """Return a function that will filter entities based on the args."""
-    return _generate_filter_from_sets_and_pattern_lists(
-        set(include_domains),
-        set(include_entities),
-        set(exclude_domains),
-        set(exclude_entities),
-        _convert_globs_to_pattern(include_entity_globs),
-        _convert_globs_to_pattern(exclude_entity_globs),
-    )
+    return _compile_filter(
+        frozenset(include_domains),
+        frozenset(include_entities),
+        frozenset(exclude_domains),
+        frozenset(exclude_entities),
+        frozenset(include_entity_globs or ()),
+        frozenset(exclude_entity_globs or ()),
+    )[2]
 
 
 def _generate_filter_from_sets_and_pattern_lists(
-    include_d: set[str],
-    include_e: set[str],
-    exclude_d: set[str],
-    exclude_e: set[str],
+    include_d: frozenset[str],
+    include_e: frozenset[str],
+    exclude_d: frozenset[str],
+    exclude_e: frozenset[str],
     include_eg: re.Pattern[str] | None,
     exclude_eg: re.Pattern[str] | None,
 ) -> Callable[[str], bool]:
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Callable, Coroutine, Iterable, Mapping, Sequence
 import copy
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from functools import partial, wraps
+from heapq import heappop, heappush
 import logging
+import math
 from random import randint
 import time
 from typing import TYPE_CHECKING, Any, Concatenate, Generic, TypeVar
@@ -53,6 +55,7 @@ from .entity_registry import (
     EventEntityRegistryUpdatedData,
 )
 from .ratelimit import KeyedRateLimit
+from .storage import Store
 from .sun import get_astral_event_next
 from .template import RenderInfo, Template, result_as_boolean
 from .typing import TemplateVarsType
@@ -76,6 +79,19 @@ _TRACK_DEVICE_REGISTRY_UPDATED_DATA: HassKey[
     _KeyedEventData[EventDeviceRegistryUpdatedData]
 ] = HassKey("track_device_registry_updated_data")
 
+_TIMER_WHEEL: HassKey[_TimerWheel] = HassKey("timer_wheel")
+_SHARED_TEMPLATE_RENDERS: HassKey[_SharedTemplateRenders] = HassKey(
+    "shared_template_renders"
+)
+_TEMPLATE_TRACKERS: HassKey[set[TrackTemplateResultInfo]] = HassKey("template_trackers")
+_TEMPLATE_RENDER_BUDGET: HassKey[float] = HassKey("template_render_budget")
+_TEMPLATE_RENDER_BUDGET_STORE: HassKey[Store[dict[str, Any]]] = HassKey(
+    "template_render_budget_store"
+)
+_TIME_PATTERN_DISPATCHER: HassKey[_TimePatternDispatcher] = HassKey(
+    "time_pattern_dispatcher"
+)
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -89,6 +105,17 @@ _LOGGER = logging.getLogger(__name__)
 RANDOM_MICROSECOND_MIN = 50000
 RANDOM_MICROSECOND_MAX = 500000
 
+# Resolution in seconds of timers added with async_call_later(coarse=True)
+COARSE_TIMER_RESOLUTION = 1.0
+_TIMER_WHEEL_SLOTS = 512
+
+# Number of recent render times kept per template for the p99
+_RENDER_TIME_SAMPLES = 200
+# Seconds over which the render time of a template is held to the budget
+TEMPLATE_RENDER_BUDGET_WINDOW = 60
+TEMPLATE_RENDER_BUDGET_STORAGE_KEY = "core.template_render_budget"
+TEMPLATE_RENDER_BUDGET_STORAGE_VERSION = 1
+
 _TypedDictT = TypeVar("_TypedDictT", bound=Mapping[str, Any])
 _StateEventDataT = TypeVar("_StateEventDataT", bound=EventStateEventData)
 
@@ -123,6 +150,10 @@ class _KeyedEventData(Generic[_TypedDictT]):
 
     listener: CALLBACK_TYPE
     callbacks: defaultdict[str, list[HassJob[[Event[_TypedDictT]], Any]]]
+    # Event filters of the jobs that only want some of the events of a key
+    job_filters: dict[
+        HassJob[[Event[_TypedDictT]], Any], Callable[[_TypedDictT], bool]
+    ] = field(default_factory=dict)
 
 
 @dataclass(slots=True)
@@ -311,6 +342,7 @@ def async_track_state_change_event(
     entity_ids: str | Iterable[str],
     action: Callable[[Event[EventStateChangedData]], Any],
     job_type: HassJobType | None = None,
+    event_filter: Callable[[EventStateChangedData], bool] | None = None,
 ) -> CALLBACK_TYPE:
     """Track specific state change events indexed by entity_id.
 
@@ -322,10 +354,17 @@ def async_track_state_change_event(
     for each one, we keep a dict of entity ids that
     care about the state change events so we can
     do a fast dict lookup to route events.
+
+    If event_filter is passed, the action is only called for the state
+    changes it returns True for. The filter is checked before the event
+    is dispatched, so state changes no listener of the entity wants are
+    not dispatched at all. It must be a callback that does no I/O.
     """
     if not (entity_ids := _async_string_to_lower_list(entity_ids)):
         return _remove_empty_listener
-    return _async_track_state_change_event(hass, entity_ids, action, job_type)
+    return _async_track_state_change_event(
+        hass, entity_ids, action, job_type, event_filter
+    )
 
 
 @callback
@@ -368,11 +407,71 @@ def _async_state_filter(
     return event_data["entity_id"] in callbacks
 
 
+@callback
+def _async_dispatch_state_change_event_soon(
+    hass: HomeAssistant,
+    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
+    event: Event[EventStateChangedData],
+) -> None:
+    """Dispatch state changes soon to ensure one event loop runs before dispatch."""
+    hass.loop.call_soon(_async_dispatch_state_change_event, hass, callbacks, event)
+
+
+@callback
+def _async_dispatch_state_change_event(
+    hass: HomeAssistant,
+    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
+    event: Event[EventStateChangedData],
+) -> None:
+    """Dispatch state changes to the listeners whose event filter passes."""
+    if not (
+        (keyed_data := hass.data.get(_TRACK_STATE_CHANGE_DATA))
+        and (job_filters := keyed_data.job_filters)
+    ):
+        _async_dispatch_entity_id_event(hass, callbacks, event)
+        return
+    entity_id = event.data["entity_id"]
+    if not (callbacks_list := callbacks.get(entity_id)):
+        return
+    event_data = event.data
+    for job in callbacks_list.copy():
+        try:
+            if (job_filter := job_filters.get(job)) is None or job_filter(event_data):
+                hass.async_run_hass_job(job, event)
+        except Exception:
+            _LOGGER.exception(
+                "Error while dispatching event for %s to %s", entity_id, job
+            )
+
+
+@callback
+def _async_state_change_filter(
+    hass: HomeAssistant,
+    callbacks: dict[str, list[HassJob[[Event[EventStateChangedData]], Any]]],
+    event_data: EventStateChangedData,
+) -> bool:
+    """Filter state changes by entity_id and the event filters of the listeners."""
+    if not (callbacks_list := callbacks.get(event_data["entity_id"])):
+        return False
+    if not (job_filters := hass.data[_TRACK_STATE_CHANGE_DATA].job_filters):
+        return True
+    for job in callbacks_list:
+        if (job_filter := job_filters.get(job)) is None:
+            return True
+        try:
+            if job_filter(event_data):
+                return True
+        except Exception:  # noqa: BLE001
+            # Let the dispatcher log the error
+            return True
+    return False
+
+
 _KEYED_TRACK_STATE_CHANGE = _KeyedEventTracker(
     key=_TRACK_STATE_CHANGE_DATA,
     event_type=EVENT_STATE_CHANGED,
-    dispatcher_callable=_async_dispatch_entity_id_event_soon,
-    filter_callable=_async_state_filter,
+    dispatcher_callable=_async_dispatch_state_change_event_soon,
+    filter_callable=_async_state_change_filter,
 )
 
 
@@ -382,10 +481,11 @@ def _async_track_state_change_event(
     entity_ids: str | Iterable[str],
     action: Callable[[Event[EventStateChangedData]], Any],
     job_type: HassJobType | None,
+    event_filter: Callable[[EventStateChangedData], bool] | None = None,
 ) -> CALLBACK_TYPE:
     """async_track_state_change_event without lowercasing."""
     return _async_track_event(
-        _KEYED_TRACK_STATE_CHANGE, hass, entity_ids, action, job_type
+        _KEYED_TRACK_STATE_CHANGE, hass, entity_ids, action, job_type, event_filter
     )
 
 
@@ -423,6 +523,7 @@ def _remove_listener(
     callbacks: dict[str, list[HassJob[[Event[_TypedDictT]], Any]]],
 ) -> None:
     """Remove listener."""
+    hass.data[tracker.key].job_filters.pop(job, None)
     for key in keys:
         callbacks[key].remove(job)
         if not callbacks[key]:
@@ -440,9 +541,13 @@ def _async_track_event(
     keys: str | Iterable[str],
     action: Callable[[Event[_TypedDictT]], None],
     job_type: HassJobType | None,
+    event_filter: Callable[[_TypedDictT], bool] | None = None,
 ) -> CALLBACK_TYPE:
     """Track an event by a specific key.
 
+    The event filter is only honored by trackers whose filter and
+    dispatcher check the job filters.
+
     This function is intended for internal use only.
     """
     if not keys:
@@ -464,6 +569,8 @@ def _async_track_event(
         hass_data[tracker_key] = event_data
 
     job = HassJob(action, f"track {tracker.event_type} event {keys}", job_type=job_type)
+    if event_filter is not None:
+        event_data.job_filters[job] = event_filter
 
     if isinstance(keys, str):
         # Almost all calls to this function use a single key
@@ -962,6 +1069,178 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+@dataclass(slots=True)
+class TemplateRenderStats:
+    """Render statistics of a tracked template."""
+
+    triggers: int = 0
+    renders: int = 0
+    render_time: float = 0.0
+    max_render_time: float = 0.0
+    recent_render_times: deque[float] = field(
+        default_factory=partial(deque, maxlen=_RENDER_TIME_SAMPLES)
+    )
+    window_start: float = 0.0
+    window_render_time: float = 0.0
+    budget_rate_limit: float | None = None
+
+    def add_render(self, duration: float, now: float, budget: float | None) -> None:
+        """Add a render and rate limit the template if it exceeds the budget.
+
+        The budget is the render time the template may use per window. A
+        template that exceeds it is rate limited so the mean of its recent
+        render times fits the budget. The rate limit is lifted once the
+        template uses less than half of the budget in a window.
+        """
+        self.renders += 1
+        self.render_time += duration
+        self.max_render_time = max(duration, self.max_render_time)
+        self.recent_render_times.append(duration)
+        if budget is None:
+            self.budget_rate_limit = None
+            return
+        if now - self.window_start >= TEMPLATE_RENDER_BUDGET_WINDOW:
+            if self.window_render_time <= budget / 2:
+                self.budget_rate_limit = None
+            self.window_start = now
+            self.window_render_time = 0.0
+        self.window_render_time += duration
+        if self.window_render_time > budget:
+            recent = self.recent_render_times
+            self.budget_rate_limit = (
+                sum(recent) / len(recent) * TEMPLATE_RENDER_BUDGET_WINDOW / budget
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dict with durations in ms."""
+        recent = sorted(self.recent_render_times)
+        return {
+            "triggers": self.triggers,
+            "renders": self.renders,
+            "render_time_total_ms": round(self.render_time * 1000, 3),
+            "render_time_mean_ms": round(self.render_time * 1000 / self.renders, 3)
+            if self.renders
+            else 0,
+            "render_time_p99_ms": round(
+                recent[math.ceil(len(recent) * 0.99) - 1] * 1000, 3
+            )
+            if recent
+            else 0,
+            "render_time_max_ms": round(self.max_render_time * 1000, 3),
+            "budget_rate_limit": self.budget_rate_limit,
+        }
+
+
+@callback
+def async_set_template_render_budget(hass: HomeAssistant, budget: float | None) -> None:
+    """Set the render time tracked templates may use per budget window.
+
+    Templates exceeding the budget are rate limited, None disables the budget.
+    The budget is stored so it is kept across restarts.
+    """
+    if budget is None:
+        hass.data.pop(_TEMPLATE_RENDER_BUDGET, None)
+    else:
+        hass.data[_TEMPLATE_RENDER_BUDGET] = budget
+    _async_template_render_budget_store(hass).async_delay_save(
+        lambda: {"render_budget": budget}
+    )
+
+
+async def async_load_template_render_budget(hass: HomeAssistant) -> None:
+    """Load the render budget set in previous runs."""
+    data = await _async_template_render_budget_store(hass).async_load()
+    if data and (budget := data["render_budget"]) is not None:
+        hass.data[_TEMPLATE_RENDER_BUDGET] = budget
+
+
+@callback
+def _async_template_render_budget_store(
+    hass: HomeAssistant,
+) -> Store[dict[str, Any]]:
+    """Return the store of the render budget."""
+    if (store := hass.data.get(_TEMPLATE_RENDER_BUDGET_STORE)) is None:
+        store = hass.data[_TEMPLATE_RENDER_BUDGET_STORE] = Store(
+            hass,
+            TEMPLATE_RENDER_BUDGET_STORAGE_VERSION,
+            TEMPLATE_RENDER_BUDGET_STORAGE_KEY,
+        )
+    return store
+
+
+@callback
+def async_template_render_stats(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return the render statistics of all tracked templates."""
+    return [
+        {"template": template.template, **stats.as_dict()}
+        for tracker in hass.data.get(_TEMPLATE_TRACKERS, ())
+        for template, stats in tracker.render_stats.items()
+    ]
+
+
+class _SharedTemplateRenders:
+    """Share the renders of identical templates triggered by the same event.
+
+    Trackers of a template with the same source and variables render the
+    same result for a state change, so the first render is reused by the
+    others. A render is only reused while the states of the entities it
+    read are unchanged. Renders that iterate domains or all states are
+    never shared.
+    """
+
+    __slots__ = ("_event", "_hass", "_renders")
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the shared renders."""
+        self._hass = hass
+        self._event: Event[EventStateChangedData] | None = None
+        self._renders: dict[
+            Template,
+            list[tuple[TemplateVarsType, RenderInfo, list[tuple[str, State | None]]]],
+        ] = {}
+
+    @callback
+    def async_render_to_info(
+        self,
+        template: Template,
+        variables: TemplateVarsType,
+        event: Event[EventStateChangedData],
+    ) -> tuple[RenderInfo, bool]:
+        """Render a template for an event or reuse an identical render.
+
+        Returns the render info and if the template was rendered.
+        """
+        get_state = self._hass.states.get
+        if event is not self._event:
+            self._event = event
+            self._renders.clear()
+        elif renders := self._renders.get(template):
+            for render_variables, info, states in renders:
+                if render_variables == variables and all(
+                    get_state(entity_id) is state for entity_id, state in states
+                ):
+                    return info, False
+
+        info = template.async_render_to_info(variables)
+        if not (info.all_states or info.domains or info.domains_lifecycle):
+            self._renders.setdefault(template, []).append(
+                (
+                    variables,
+                    info,
+                    [(entity_id, get_state(entity_id)) for entity_id in info.entities],
+                )
+            )
+        return info, True
+
+
+@callback
+def _async_shared_template_renders(hass: HomeAssistant) -> _SharedTemplateRenders:
+    """Return the shared template renders."""
+    if (renders := hass.data.get(_SHARED_TEMPLATE_RENDERS)) is None:
+        renders = hass.data[_SHARED_TEMPLATE_RENDERS] = _SharedTemplateRenders(hass)
+    return renders
+
+
 class TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -1001,6 +1280,10 @@ class TrackTemplateResultInfo:
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        self._aggregate_listeners: dict[str, Callable[[], None]] = {}
+        self.render_stats: defaultdict[Template, TemplateRenderStats] = defaultdict(
+            TemplateRenderStats
+        )
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -1014,14 +1297,17 @@ class TrackTemplateResultInfo:
         """Activation of template tracking."""
         block_render = False
         super_template = self._track_templates[0] if self._has_super_template else None
+        now = time.time()
 
         # Render the super template first
         if super_template is not None:
             template = super_template.template
             variables = super_template.variables
+            start = time.perf_counter()
             self._info[template] = info = template.async_render_to_info(
                 variables, strict=strict, log_fn=log_fn
             )
+            self._async_add_render(template, time.perf_counter() - start, now)
 
             # If the super template did not render to True, don't update other templates
             try:
@@ -1040,9 +1326,11 @@ class TrackTemplateResultInfo:
                 continue
             template = track_template_.template
             variables = track_template_.variables
+            start = time.perf_counter()
             self._info[template] = info = template.async_render_to_info(
                 variables, strict=strict, log_fn=log_fn
             )
+            self._async_add_render(template, time.perf_counter() - start, now)
 
             if info.exception:
                 if not log_fn:
@@ -1058,6 +1346,8 @@ class TrackTemplateResultInfo:
             self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
         )
         self._update_time_listeners()
+        self._update_aggregate_listeners()
+        self.hass.data.setdefault(_TEMPLATE_TRACKERS, set()).add(self)
         _LOGGER.debug(
             (
                 "Template group %s listens for %s, first render blocked by super"
@@ -1068,6 +1358,15 @@ class TrackTemplateResultInfo:
             block_render,
         )
 
+    @callback
+    def _async_add_render(
+        self, template: Template, duration: float, now: float
+    ) -> None:
+        """Add a render to the statistics of a template."""
+        self.render_stats[template].add_render(
+            duration, now, self.hass.data.get(_TEMPLATE_RENDER_BUDGET)
+        )
+
     @property
     def listeners(self) -> dict[str, bool | set[str]]:
         """State changes that will cause a re-render."""
@@ -1107,14 +1406,33 @@ class TrackTemplateResultInfo:
         for template, info in self._info.items():
             self._setup_time_listener(template, info.has_time)
 
+    @callback
+    def _update_aggregate_listeners(self) -> None:
+        """Have the state machine maintain the aggregates the templates read."""
+        domains: set[str] = set()
+        for info in self._info.values():
+            domains.update(info.aggregate_domains)
+        for domain in self._aggregate_listeners.keys() - domains:
+            self._aggregate_listeners.pop(domain)()
+        for domain in domains - self._aggregate_listeners.keys():
+            self._aggregate_listeners[domain] = (
+                self.hass.states.async_track_domain_aggregates(domain)
+            )
+
     @callback
     def async_remove(self) -> None:
         """Cancel the listener."""
         assert self._track_state_changes
         self._track_state_changes.async_remove()
         self._rate_limit.async_remove()
+        self.hass.data.get(_TEMPLATE_TRACKERS, set()).discard(self)
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        for domain in list(self._aggregate_listeners):
+            self._aggregate_listeners.pop(domain)()
+        # The tracked templates of a tracker never change, so its
+        # statistics are only stale once it stops tracking them
+        self.render_stats.clear()
 
     @callback
     def async_refresh(self) -> None:
@@ -1126,6 +1444,7 @@ class TrackTemplateResultInfo:
         track_template_: TrackTemplate,
         now: float,
         event: Event[EventStateChangedData] | None,
+        replayed: bool = False,
     ) -> bool | TrackTemplateResult:
         """Re-render the template if conditions match.
 
@@ -1145,11 +1464,18 @@ class TrackTemplateResultInfo:
             if not _event_triggers_rerender(event, info):
                 return False
 
+            stats = self.render_stats[template]
+            stats.triggers += 1
             had_timer = self._rate_limit.async_has_timer(template)
+            rate_limit = _rate_limit_for_event(event, info, track_template_)
+            if (budget_rate_limit := stats.budget_rate_limit) is not None and (
+                rate_limit is None or budget_rate_limit > rate_limit
+            ):
+                rate_limit = budget_rate_limit
 
             if self._rate_limit.async_schedule_action(
                 template,
-                _rate_limit_for_event(event, info, track_template_),
+                rate_limit,
                 now,
                 self._refresh,
                 event,
@@ -1165,9 +1491,18 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
-        )
+        start = time.perf_counter()
+        rendered = True
+        if event is not None and not replayed:
+            info, rendered = _async_shared_template_renders(
+                self.hass
+            ).async_render_to_info(template, track_template_.variables, event)
+        else:
+            info = template.async_render_to_info(track_template_.variables)
+        # Reused renders cost nothing and would skew the statistics
+        if rendered:
+            self._async_add_render(template, time.perf_counter() - start, now)
+        self._info[template] = info
 
         try:
             result: str | TemplateError = info.result()
@@ -1216,7 +1551,7 @@ class TrackTemplateResultInfo:
         self,
         event: Event[EventStateChangedData] | None,
         track_templates: Iterable[TrackTemplate] | None = None,
-        replayed: bool | None = False,
+        replayed: bool = False,
     ) -> None:
         """Refresh the template.
 
@@ -1241,7 +1576,9 @@ class TrackTemplateResultInfo:
 
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            update = self._render_template_if_ready(
+                super_template, now, event, replayed
+            )
             info_changed |= self._apply_update(updates, update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
@@ -1272,7 +1609,9 @@ class TrackTemplateResultInfo:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update = self._render_template_if_ready(
+                    track_template_, now, event, replayed
+                )
                 info_changed |= self._apply_update(
                     updates, update, track_template_.template
                 )
@@ -1289,6 +1628,7 @@ class TrackTemplateResultInfo:
                     ]
                 )
             )
+            self._update_aggregate_listeners()
             _LOGGER.debug(
                 (
                     "Template group %s listens for %s, re-render blocked by super"
@@ -1581,6 +1921,138 @@ def async_call_at(
     return hass.loop.call_at(loop_time, _run_async_call_action, hass, job).cancel
 
 
+@dataclass(slots=True, eq=False)
+class _WheelTimer:
+    """A timer in the timer wheel."""
+
+    wheel: _TimerWheel
+    tick: int
+    job: HassJob[[datetime], Coroutine[Any, Any, None] | None]
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the timer."""
+        self.wheel.async_cancel(self)
+
+
+class _TimerWheel:
+    """Hashed timing wheel for timers that do not need sub-second precision.
+
+    Timers are bucketed by the tick they are due at, so arming and cancelling
+    a timer are O(1) and the event loop only holds a single timer handle for
+    all timers in the wheel. Timers due more than _TIMER_WHEEL_SLOTS ticks in
+    the future share a slot with earlier timers and are skipped until the
+    wheel comes around to their tick.
+    """
+
+    __slots__ = (
+        "_count",
+        "_handle",
+        "_hass",
+        "_last_tick",
+        "_next_tick",
+        "_slots",
+    )
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer wheel."""
+        self._hass = hass
+        self._slots: list[dict[_WheelTimer, None]] = [
+            {} for _ in range(_TIMER_WHEEL_SLOTS)
+        ]
+        self._count = 0
+        self._last_tick = self._next_tick = self._current_tick()
+        self._handle: asyncio.TimerHandle | None = None
+
+    def _current_tick(self) -> int:
+        """Return the tick of the current loop time."""
+        return int(self._hass.loop.time() // COARSE_TIMER_RESOLUTION)
+
+    @callback
+    def async_add(
+        self, delay: float, job: HassJob[[datetime], Coroutine[Any, Any, None] | None]
+    ) -> _WheelTimer:
+        """Add a timer that fires at or after delay seconds."""
+        loop_time = self._hass.loop.time() + delay
+        # Round up so the timer never fires before its delay
+        tick = max(-int(-loop_time // COARSE_TIMER_RESOLUTION), self._last_tick + 1)
+        timer = _WheelTimer(self, tick, job)
+        self._slots[tick % _TIMER_WHEEL_SLOTS][timer] = None
+        self._count += 1
+        if self._handle is None or tick < self._next_tick:
+            self._schedule(tick)
+        return timer
+
+    @callback
+    def async_cancel(self, timer: _WheelTimer) -> None:
+        """Cancel a timer."""
+        slot = self._slots[timer.tick % _TIMER_WHEEL_SLOTS]
+        if timer not in slot:
+            return
+        del slot[timer]
+        self._count -= 1
+        if not self._count and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self, tick: int) -> None:
+        """Schedule the wheel to run at a tick."""
+        if self._handle is not None:
+            self._handle.cancel()
+        self._next_tick = tick
+        self._handle = self._hass.loop.call_at(
+            tick * COARSE_TIMER_RESOLUTION, self._async_tick
+        )
+
+    @callback
+    def _async_tick(self) -> None:
+        """Run the timers that are due."""
+        # The loop may run the handle a little bit before its time
+        # because of the resolution of the clock
+        now_tick = max(self._current_tick(), self._next_tick)
+        self._handle = None
+        first_tick = self._last_tick + 1
+        self._last_tick = now_tick
+        due: list[_WheelTimer] = []
+        for tick in range(
+            first_tick, min(now_tick, first_tick + _TIMER_WHEEL_SLOTS - 1) + 1
+        ):
+            slot = self._slots[tick % _TIMER_WHEEL_SLOTS]
+            if not slot:
+                continue
+            for timer in [timer for timer in slot if timer.tick <= now_tick]:
+                del slot[timer]
+                due.append(timer)
+        self._count -= len(due)
+        if self._count:
+            self._schedule(self._find_next_tick(now_tick))
+        if not due:
+            return
+        utc_now = time_tracker_utcnow()
+        hass = self._hass
+        for timer in due:
+            # A failing timer must not stop the other timers due in this tick
+            try:
+                hass.async_run_hass_job(timer.job, utc_now)
+            except Exception:
+                _LOGGER.exception("Error running timer wheel job %s", timer.job)
+
+    def _find_next_tick(self, now_tick: int) -> int:
+        """Return the next tick that has a timer in its slot."""
+        for tick in range(now_tick + 1, now_tick + _TIMER_WHEEL_SLOTS + 1):
+            if self._slots[tick % _TIMER_WHEEL_SLOTS]:
+                return tick
+        raise RuntimeError("Timer wheel has no pending timers")  # pragma: no cover
+
+
+@callback
+def _async_get_timer_wheel(hass: HomeAssistant) -> _TimerWheel:
+    """Return the timer wheel for coarse timers."""
+    if (wheel := hass.data.get(_TIMER_WHEEL)) is None:
+        wheel = hass.data[_TIMER_WHEEL] = _TimerWheel(hass)
+    return wheel
+
+
 @callback
 @bind_hass
 def async_call_later(
@@ -1588,10 +2060,18 @@ def async_call_later(
     delay: float | timedelta,
     action: HassJob[[datetime], Coroutine[Any, Any, None] | None]
     | Callable[[datetime], Coroutine[Any, Any, None] | None],
+    *,
+    coarse: bool = False,
 ) -> CALLBACK_TYPE:
     """Add a listener that fires at or after <delay>.
 
     The listener is passed the time it fires in UTC time.
+
+    If coarse is True, the listener is added to a timer wheel with a
+    resolution of COARSE_TIMER_RESOLUTION seconds instead of being
+    scheduled on the event loop. This is much cheaper for timers that
+    are frequently cancelled and rearmed and do not need sub-second
+    precision, like debounce and availability timers.
     """
     if isinstance(delay, timedelta):
         delay = delay.total_seconds()
@@ -1600,6 +2080,8 @@ def async_call_later(
         if isinstance(action, HassJob)
         else HassJob(action, f"call_later {delay}")
     )
+    if coarse:
+        return _async_get_timer_wheel(hass).async_add(delay, job).async_cancel
     loop = hass.loop
     return loop.call_at(loop.time() + delay, _run_async_call_action, hass, job).cancel
 
@@ -1783,60 +2265,164 @@ time_tracker_utcnow = dt_util.utcnow
 time_tracker_timestamp = time.time
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class _TrackUTCTimeChange:
     hass: HomeAssistant
     time_match_expression: tuple[list[int], list[int], list[int]]
-    microsecond: int
     local: bool
     job: HassJob[[datetime], Coroutine[Any, Any, None] | None]
-    listener_job_name: str
-    _pattern_time_change_listener_job: HassJob[[datetime], None] | None = None
-    _cancel_callback: CALLBACK_TYPE | None = None
+    due_second: int = 0
+    cancelled: bool = False
 
     def async_attach(self) -> None:
         """Initialize track job."""
-        self._pattern_time_change_listener_job = HassJob(
-            self._pattern_time_change_listener,
-            self.listener_job_name,
-            job_type=HassJobType.Callback,
+        _async_get_time_pattern_dispatcher(self.hass).async_add(
+            self, self._calculate_next(dt_util.utcnow())
         )
-        self._cancel_callback = async_track_point_in_utc_time(
-            self.hass,
-            self._pattern_time_change_listener_job,
-            self._calculate_next(dt_util.utcnow()),
+
+    def _calculate_next(self, utc_now: datetime) -> int:
+        """Calculate the timestamp of the next second the pattern matches."""
+        localized_now = dt_util.as_local(utc_now) if self.local else utc_now
+        return int(
+            dt_util.find_next_time_expression_time(
+                localized_now, *self.time_match_expression
+            ).timestamp()
         )
 
-    def _calculate_next(self, utc_now: datetime) -> datetime:
-        """Calculate and set the next time the trigger should fire."""
+    @callback
+    def async_fire(self, utc_now: datetime) -> None:
+        """Reschedule for the next matching second and run the job."""
+        if self.cancelled:
+            # Cancelled by a listener that was fired before it in the same tick
+            return
+        _async_get_time_pattern_dispatcher(self.hass).async_add(
+            self, self._calculate_next(utc_now + timedelta(seconds=1))
+        )
         localized_now = dt_util.as_local(utc_now) if self.local else utc_now
-        return dt_util.find_next_time_expression_time(
-            localized_now, *self.time_match_expression
-        ).replace(microsecond=self.microsecond)
+        self.hass.async_run_hass_job(self.job, localized_now, background=True)
 
     @callback
-    def _pattern_time_change_listener(self, _: datetime) -> None:
-        """Listen for matching time_changed events."""
-        hass = self.hass
+    def async_cancel(self) -> None:
+        """Cancel the time change listener."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        _async_get_time_pattern_dispatcher(self.hass).async_remove(self)
+
+
+class _TimePatternDispatcher:
+    """Dispatch all time pattern listeners from a single timer.
+
+    Listeners are indexed by the timestamp of the second they match next,
+    so each tick only evaluates the listeners that are due instead of every
+    registered listener.
+    """
+
+    __slots__ = (
+        "_cancel_timer",
+        "_due",
+        "_hass",
+        "_in_tick",
+        "_microsecond",
+        "_seconds",
+        "_timer_job",
+        "_timer_second",
+    )
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self._hass = hass
+        self._due: dict[int, list[_TrackUTCTimeChange]] = {}
+        # Heap of the seconds in _due, may contain seconds
+        # that no longer have listeners
+        self._seconds: list[int] = []
+        # Avoid aligning the timer to the same fraction of a second as
+        # other timers since it can create a thundering herd problem
+        # https://github.com/home-assistant/core/issues/82231
+        self._microsecond = randint(RANDOM_MICROSECOND_MIN, RANDOM_MICROSECOND_MAX)
+        self._cancel_timer: CALLBACK_TYPE | None = None
+        self._timer_second = 0
+        self._in_tick = False
+        self._timer_job = HassJob(
+            self._async_tick, "time pattern dispatcher", job_type=HassJobType.Callback
+        )
+
+    @callback
+    def async_add(self, track: _TrackUTCTimeChange, due_second: int) -> None:
+        """Add a listener that is due at a second."""
+        track.due_second = due_second
+        if (listeners := self._due.get(due_second)) is None:
+            self._due[due_second] = [track]
+            heappush(self._seconds, due_second)
+        else:
+            listeners.append(track)
+        if not self._in_tick and (
+            self._cancel_timer is None or due_second < self._timer_second
+        ):
+            self._schedule(due_second)
+
+    @callback
+    def async_remove(self, track: _TrackUTCTimeChange) -> None:
+        """Remove a listener."""
+        due_second = track.due_second
+        if (listeners := self._due.get(due_second)) is None:
+            # The listener is being fired
+            return
+        listeners.remove(track)
+        if not listeners:
+            del self._due[due_second]
+            if not self._due and self._cancel_timer is not None:
+                self._cancel_timer()
+                self._cancel_timer = None
+
+    def _schedule(self, due_second: int) -> None:
+        """Schedule the timer for a second."""
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+        self._timer_second = due_second
+        self._cancel_timer = async_track_point_in_utc_time(
+            self._hass,
+            self._timer_job,
+            dt_util.utc_from_timestamp(due_second + self._microsecond / 1000000),
+        )
+
+    @callback
+    def _async_tick(self, _: datetime) -> None:
+        """Fire the listeners that are due."""
+        self._cancel_timer = None
         # Fetch time again because we want the actual time, not the
         # time when the timer was scheduled
         utc_now = time_tracker_utcnow()
-        localized_now = dt_util.as_local(utc_now) if self.local else utc_now
-        if TYPE_CHECKING:
-            assert self._pattern_time_change_listener_job is not None
-        self._cancel_callback = async_track_point_in_utc_time(
-            hass,
-            self._pattern_time_change_listener_job,
-            self._calculate_next(utc_now + timedelta(seconds=1)),
-        )
-        hass.async_run_hass_job(self.job, localized_now, background=True)
+        now_second = int(utc_now.timestamp())
+        seconds = self._seconds
+        due: list[_TrackUTCTimeChange] = []
+        while seconds and seconds[0] <= now_second:
+            if listeners := self._due.pop(heappop(seconds), None):
+                due.extend(listeners)
+        # Listeners reschedule themselves when fired so
+        # they must all be collected before firing them
+        self._in_tick = True
+        try:
+            for track in due:
+                # A failing listener must not stop the other listeners
+                try:
+                    track.async_fire(utc_now)
+                except Exception:
+                    _LOGGER.exception("Error running time pattern job %s", track.job)
+        finally:
+            self._in_tick = False
+            while seconds and seconds[0] not in self._due:
+                heappop(seconds)
+            if seconds:
+                self._schedule(seconds[0])
 
-    @callback
-    def async_cancel(self) -> None:
-        """Cancel the call_at."""
-        if TYPE_CHECKING:
-            assert self._cancel_callback is not None
-        self._cancel_callback()
+
+@callback
+def _async_get_time_pattern_dispatcher(hass: HomeAssistant) -> _TimePatternDispatcher:
+    """Return the dispatcher for time pattern listeners."""
+    if (dispatcher := hass.data.get(_TIME_PATTERN_DISPATCHER)) is None:
+        dispatcher = hass.data[_TIME_PATTERN_DISPATCHER] = _TimePatternDispatcher(hass)
+    return dispatcher
 
 
 @callback
@@ -1867,18 +2453,8 @@ def async_track_utc_time_change(
     matching_seconds = dt_util.parse_time_expression(second, 0, 59)
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
-    # Avoid aligning all time trackers to the same fraction of a second
-    # since it can create a thundering herd problem
-    # https://github.com/home-assistant/core/issues/82231
-    microsecond = randint(RANDOM_MICROSECOND_MIN, RANDOM_MICROSECOND_MAX)
-    listener_job_name = f"time change listener {hour}:{minute}:{second} {action}"
     track = _TrackUTCTimeChange(
-        hass,
-        (matching_seconds, matching_minutes, matching_hours),
-        microsecond,
-        local,
-        job,
-        listener_job_name,
+        hass, (matching_seconds, matching_minutes, matching_hours), local, job
     )
     track.async_attach()
     return track.async_cancel
@@ -1964,11 +2540,18 @@ def _event_triggers_rerender(
 ) -> bool:
     """Determine if a template should be re-rendered from an event."""
     entity_id = event.data["entity_id"]
+    old_state = event.data["old_state"]
+    new_state = event.data["new_state"]
 
     if info.filter(entity_id):
-        return True
+        # Only re-render if a field of the state the template read changed
+        return (
+            old_state is None
+            or new_state is None
+            or info.state_change_triggers_render(entity_id, old_state, new_state)
+        )
 
-    if event.data["new_state"] is not None and event.data["old_state"] is not None:
+    if new_state is not None and old_state is not None:
         return False
 
     return bool(info.filter_lifecycle(entity_id))
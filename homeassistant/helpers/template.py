@@ -5,6 +5,7 @@ from __future__ import annotations
 from ast import literal_eval
 import asyncio
 import base64
+from collections import defaultdict
 import collections.abc
 from collections.abc import Callable, Generator, Iterable
 from contextlib import AbstractContextManager
@@ -22,6 +23,7 @@ import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import threading
 from types import CodeType, TracebackType
 from typing import Any, Concatenate, Literal, NoReturn, Self, cast, overload
 from urllib.parse import urlencode as urllib_urlencode
@@ -40,6 +42,7 @@ import voluptuous as vol
 
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    ATTR_FRIENDLY_NAME,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_PERSONS,
@@ -53,6 +56,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     Context,
     HomeAssistant,
+    NumericStates,
     ServiceResponse,
     State,
     callback,
@@ -102,10 +106,20 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_BYTECODE_CACHE: HassKey[TemplateBytecodeCache] = HassKey("template.bytecode_cache")
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
 
+# Templates that only call one of these functions with string literals
+# are evaluated without rendering them with Jinja
+_FAST_RENDER_TEMPLATE = re.compile(
+    r"\{\{\s*(?P<func>states|is_state|state_attr)\(\s*"
+    r"(?P<q1>['\"])(?P<entity_id>[^'\"\\]*)(?P=q1)"
+    r"(?:\s*,\s*(?P<q2>['\"])(?P<arg>[^'\"\\]*)(?P=q2))?"
+    r"\s*\)\s*\}\}"
+)
+
 _RESERVED_NAMES = {
     "contextfunction",
     "evalcontextfunction",
@@ -113,15 +127,25 @@ _RESERVED_NAMES = {
     "jinja_pass_arg",
 }
 
-_COLLECTABLE_STATE_ATTRIBUTES = {
-    "state",
-    "attributes",
-    "last_changed",
-    "last_updated",
-    "context",
-    "domain",
-    "object_id",
-    "name",
+# Fields of a state a template can depend on, attributes are
+# tracked as _STATE_FIELD_ATTRIBUTE_PREFIX + the attribute name
+_STATE_FIELD_ALL = "*"
+_STATE_FIELD_STATE = "state"
+_STATE_FIELD_LAST_CHANGED = "last_changed"
+_STATE_FIELD_ATTRIBUTES = "attributes"
+_STATE_FIELD_ATTRIBUTE_PREFIX = "attributes."
+
+# Maps the state properties exposed to templates to the field
+# they depend on, None when they only depend on the entity existing
+_COLLECTABLE_STATE_ATTRIBUTES: dict[str, str | None] = {
+    "state": _STATE_FIELD_STATE,
+    "attributes": _STATE_FIELD_ATTRIBUTES,
+    "last_changed": _STATE_FIELD_LAST_CHANGED,
+    "last_updated": _STATE_FIELD_ALL,
+    "context": _STATE_FIELD_ALL,
+    "domain": None,
+    "object_id": None,
+    "name": f"{_STATE_FIELD_ATTRIBUTE_PREFIX}{ATTR_FRIENDLY_NAME}",
 }
 
 ALL_STATES_RATE_LIMIT = 60  # seconds
@@ -153,6 +177,9 @@ CACHED_TEMPLATE_STATES = 512
 EVAL_CACHE_SIZE = 512
 
 MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
+
+# Compiled templates kept, the least recently used are dropped first
+BYTECODE_CACHE_SIZE = 4096
 MAX_TEMPLATE_OUTPUT = 256 * 1024  # 256KiB
 
 CACHED_TEMPLATE_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
@@ -384,7 +411,9 @@ class RenderInfo:
         "all_states_lifecycle",
         "domains",
         "domains_lifecycle",
+        "aggregate_domains",
         "entities",
+        "entity_fields",
         "rate_limit",
         "has_time",
     )
@@ -402,7 +431,11 @@ class RenderInfo:
         self.all_states_lifecycle = False
         self.domains: collections.abc.Set[str] = set()
         self.domains_lifecycle: collections.abc.Set[str] = set()
+        # The domains whose state counts or numeric states the template read
+        self.aggregate_domains: collections.abc.Set[str] = set()
         self.entities: collections.abc.Set[str] = set()
+        # The fields of the state of each entity the template read
+        self.entity_fields: defaultdict[str, set[str]] = defaultdict(set)
         self.rate_limit: float | None = None
         self.has_time = False
 
@@ -438,6 +471,49 @@ class RenderInfo:
         """
         return entity_id in self.entities
 
+    def _collect_entity(self, entity_id: str, field: str | None) -> None:
+        """Collect an entity and the field of its state the template read."""
+        self.entities.add(entity_id)  # type: ignore[attr-defined]
+        fields = self.entity_fields[entity_id]
+        if field is not None:
+            fields.add(field)
+
+    def state_change_triggers_render(
+        self, entity_id: str, old_state: State, new_state: State
+    ) -> bool:
+        """Return if a change of a state changed any field the template read.
+
+        Entities that are not tracked field by field, such as entities of
+        tracked domains, always trigger a render.
+        """
+        if (
+            self.all_states
+            or (fields := self.entity_fields.get(entity_id)) is None
+            or _STATE_FIELD_ALL in fields
+            or split_entity_id(entity_id)[0] in self.domains
+        ):
+            return True
+        old_attributes = old_state.attributes
+        new_attributes = new_state.attributes
+        for field in fields:
+            if field == _STATE_FIELD_STATE:
+                if old_state.state != new_state.state:
+                    return True
+            elif field == _STATE_FIELD_LAST_CHANGED:
+                # Forced updates bump last_changed without changing the state
+                if old_state.last_changed != new_state.last_changed:
+                    return True
+            elif field == _STATE_FIELD_ATTRIBUTES:
+                if old_attributes is not new_attributes and (
+                    old_attributes != new_attributes
+                ):
+                    return True
+            else:
+                name = field.removeprefix(_STATE_FIELD_ATTRIBUTE_PREFIX)
+                if old_attributes.get(name) != new_attributes.get(name):
+                    return True
+        return False
+
     def _filter_lifecycle_domains(self, entity_id: str) -> bool:
         """Template should re-render if the entity is added or removed.
 
@@ -460,6 +536,7 @@ class RenderInfo:
         self.entities = frozenset(self.entities)
         self.domains = frozenset(self.domains)
         self.domains_lifecycle = frozenset(self.domains_lifecycle)
+        self.aggregate_domains = frozenset(self.aggregate_domains)
 
     def _freeze(self) -> None:
         self._freeze_sets()
@@ -500,6 +577,7 @@ class Template:
         "is_static",
         "_compiled_code",
         "_compiled",
+        "_fast_render",
         "_exc_info",
         "_limited",
         "_strict",
@@ -532,6 +610,7 @@ class Template:
         self.template: str = template.strip()
         self._compiled_code: CodeType | None = None
         self._compiled: jinja2.Template | None = None
+        self._fast_render: tuple[str, Callable[[], Any]] | None = None
         self.hass = hass
         self.is_static = not is_template_string(template)
         self._exc_info: sys._OptExcInfo | None = None
@@ -630,7 +709,12 @@ class Template:
             kwargs.update(variables)
 
         try:
-            render_result = _render_with_context(self.template, compiled, **kwargs)
+            if (fast_render := self._fast_render) is not None and (
+                fast_render[0] not in kwargs
+            ):
+                render_result = str(fast_render[1]())
+            else:
+                render_result = _render_with_context(self.template, compiled, **kwargs)
         except Exception as err:
             raise TemplateError(err) from err
 
@@ -851,6 +935,8 @@ class Template:
         self._compiled = jinja2.Template.from_code(
             env, self._compiled_code, env.globals, None
         )
+        if not limited:
+            self._fast_render = _fast_render(env, self.template)
 
         return self._compiled
 
@@ -1041,9 +1127,14 @@ class TemplateStateBase(State):
         self._entity_id = entity_id
         self._cache: dict[str, Any] = {}
 
-    def _collect_state(self) -> None:
+    def _collect_state(self, field: str | None = _STATE_FIELD_ALL) -> None:
         if self._collect and (render_info := _render_info.get()):
-            render_info.entities.add(self._entity_id)  # type: ignore[attr-defined]
+            render_info._collect_entity(self._entity_id, field)  # noqa: SLF001
+
+    def _attribute(self, name: str) -> Any:
+        """Return a single attribute, only collecting that attribute."""
+        self._collect_state(f"{_STATE_FIELD_ATTRIBUTE_PREFIX}{name}")
+        return self._state.attributes.get(name)
 
     # Jinja will try __getitem__ first and it avoids the need
     # to call is_safe_attribute
@@ -1052,7 +1143,9 @@ class TemplateStateBase(State):
         if item in _COLLECTABLE_STATE_ATTRIBUTES:
             # _collect_state inlined here for performance
             if self._collect and (render_info := _render_info.get()):
-                render_info.entities.add(self._entity_id)  # type: ignore[attr-defined]
+                render_info._collect_entity(  # noqa: SLF001
+                    self._entity_id, _COLLECTABLE_STATE_ATTRIBUTES[item]
+                )
             return getattr(self._state, item)
         if item == "entity_id":
             return self._entity_id
@@ -1071,19 +1164,19 @@ class TemplateStateBase(State):
     @property
     def state(self) -> str:  # type: ignore[override]
         """Wrap State.state."""
-        self._collect_state()
+        self._collect_state(_STATE_FIELD_STATE)
         return self._state.state
 
     @property
     def attributes(self) -> ReadOnlyDict[str, Any]:  # type: ignore[override]
         """Wrap State.attributes."""
-        self._collect_state()
+        self._collect_state(_STATE_FIELD_ATTRIBUTES)
         return self._state.attributes
 
     @property
     def last_changed(self) -> datetime:  # type: ignore[override]
         """Wrap State.last_changed."""
-        self._collect_state()
+        self._collect_state(_STATE_FIELD_LAST_CHANGED)
         return self._state.last_changed
 
     @property
@@ -1107,19 +1200,19 @@ class TemplateStateBase(State):
     @property
     def domain(self) -> str:  # type: ignore[override]
         """Wrap State.domain."""
-        self._collect_state()
+        self._collect_state(None)
         return self._state.domain
 
     @property
     def object_id(self) -> str:  # type: ignore[override]
         """Wrap State.object_id."""
-        self._collect_state()
+        self._collect_state(None)
         return self._state.object_id
 
     @property
     def name(self) -> str:  # type: ignore[override]
         """Wrap State.name."""
-        self._collect_state()
+        self._collect_state(f"{_STATE_FIELD_ATTRIBUTE_PREFIX}{ATTR_FRIENDLY_NAME}")
         return self._state.name
 
     @property
@@ -1136,7 +1229,12 @@ class TemplateStateBase(State):
             async_rounded_state,
         )
 
-        self._collect_state()
+        # Rounding depends on the entity registry, not on the attributes
+        self._collect_state(_STATE_FIELD_STATE)
+        if with_unit:
+            self._collect_state(
+                f"{_STATE_FIELD_ATTRIBUTE_PREFIX}{ATTR_UNIT_OF_MEASUREMENT}"
+            )
         if rounded and self._state.domain == SENSOR_DOMAIN:
             state = async_rounded_state(self._hass, self._entity_id, self._state)
         else:
@@ -1193,9 +1291,11 @@ class TemplateStateFromEntityId(TemplateStateBase):
 _create_template_state_no_collect = partial(TemplateState, collect=False)
 
 
-def _collect_state(hass: HomeAssistant, entity_id: str) -> None:
+def _collect_state(
+    hass: HomeAssistant, entity_id: str, field: str | None = _STATE_FIELD_ALL
+) -> None:
     if (entity_collect := _render_info.get()) is not None:
-        entity_collect.entities.add(entity_id)  # type: ignore[attr-defined]
+        entity_collect._collect_entity(entity_id, field)  # noqa: SLF001
 
 
 def _state_generator(
@@ -1237,7 +1337,7 @@ def _get_template_state_from_state(
     if state is None:
         # Only need to collect if none, if not none collect first actual
         # access to the state properties in the state wrapper.
-        _collect_state(hass, entity_id)
+        _collect_state(hass, entity_id, None)
         return None
     return _template_state(hass, state)
 
@@ -1876,7 +1976,7 @@ def is_state_attr(hass: HomeAssistant, entity_id: str, name: str, value: Any) ->
 def state_attr(hass: HomeAssistant, entity_id: str, name: str) -> Any:
     """Get a specific attribute from a state."""
     if (state_obj := _get_state(hass, entity_id)) is not None:
-        return state_obj.attributes.get(name)
+        return state_obj._attribute(name)  # noqa: SLF001
     return None
 
 
@@ -1889,6 +1989,64 @@ def has_value(hass: HomeAssistant, entity_id: str) -> bool:
     )
 
 
+def _collect_domain(domain: str) -> None:
+    if (render_info := _render_info.get()) is not None:
+        render_info.domains.add(domain)  # type: ignore[attr-defined]
+
+
+def _collect_aggregate_domain(domain: str) -> None:
+    _collect_domain(domain)
+    if (render_info := _render_info.get()) is not None:
+        render_info.aggregate_domains.add(domain)  # type: ignore[attr-defined]
+
+
+def state_count(hass: HomeAssistant, domain: str, state: str | list[str]) -> int:
+    """Count the entities of a domain that have a state.
+
+    Tracked templates use the counts maintained by the state machine
+    instead of iterating the states of the domain.
+    """
+    if not valid_domain(domain):
+        raise TemplateError(f"Invalid domain name '{domain}'")
+    _collect_aggregate_domain(domain)
+    counts = hass.states.async_domain_state_counts(domain)
+    if isinstance(state, list):
+        return sum(counts.get(value, 0) for value in state)
+    return counts.get(state, 0)
+
+
+_NUMERIC_STATE_STATS: dict[str, Callable[[NumericStates], float | int]] = {
+    "count": len,
+    "sum": NumericStates.sum,
+    "min": NumericStates.min,
+    "max": NumericStates.max,
+    "mean": lambda values: values.sum() / len(values),
+}
+
+
+def numeric_state_stat(
+    hass: HomeAssistant, domain: str, stat: str, default: Any = _SENTINEL
+) -> Any:
+    """Return a statistic of the numeric states of a domain.
+
+    Non numeric states, like unknown and unavailable, are ignored.
+    """
+    if not valid_domain(domain):
+        raise TemplateError(f"Invalid domain name '{domain}'")
+    if (stat_fn := _NUMERIC_STATE_STATS.get(stat)) is None:
+        raise TemplateError(
+            f"Invalid statistic '{stat}', expected one of "
+            f"{', '.join(_NUMERIC_STATE_STATS)}"
+        )
+    _collect_aggregate_domain(domain)
+    values = hass.states.async_domain_numeric_states(domain)
+    if not values and stat not in ("count", "sum"):
+        if default is _SENTINEL:
+            raise_no_default("numeric_state_stat", domain)
+        return default
+    return stat_fn(values)
+
+
 def now(hass: HomeAssistant) -> datetime:
     """Record fetching now."""
     if (render_info := _render_info.get()) is not None:
@@ -2726,6 +2884,28 @@ class TemplateContextManager(AbstractContextManager):
 _template_context_manager = TemplateContextManager()
 
 
+def _fast_render(
+    env: TemplateEnvironment, template_str: str
+) -> tuple[str, Callable[[], Any]] | None:
+    """Return the function name and a direct call for a trivial template.
+
+    Only templates that output the result of a single states, is_state or
+    state_attr call with string literal arguments are supported. Jinja
+    would output str() of the result, so the caller does the same.
+    """
+    if (match := _FAST_RENDER_TEMPLATE.fullmatch(template_str)) is None:
+        return None
+    func, entity_id, arg = match.group("func", "entity_id", "arg")
+    if func == "states":
+        if arg is not None:
+            return None
+        return func, partial(env.globals[func], entity_id)
+    if arg is None:
+        return None
+    # The wrapped functions take the Jinja context as first argument
+    return func, partial(env.globals[func], None, entity_id, arg)
+
+
 def _render_with_context(
     template_str: str, template: jinja2.Template, **kwargs: Any
 ) -> str:
@@ -2813,6 +2993,38 @@ def _get_hass_loader(hass: HomeAssistant) -> HassLoader:
     return HassLoader({})
 
 
+@singleton(_BYTECODE_CACHE)
+def _get_bytecode_cache(hass: HomeAssistant) -> TemplateBytecodeCache:
+    return TemplateBytecodeCache()
+
+
+class TemplateBytecodeCache:
+    """In memory cache of the code compiled for templates.
+
+    The template cache of an environment only holds the templates that
+    are still referenced, so the code of templates that are created
+    again, like when automations are reloaded, is kept here keyed by the
+    environment flavor and the template source.
+
+    Templates compile in any thread, so the entries are guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bytecode cache."""
+        self._lock = threading.Lock()
+        self._entries: LRU[tuple[str, str], CodeType] = LRU(BYTECODE_CACHE_SIZE)
+
+    def get(self, flavor: str, source: str) -> CodeType | None:
+        """Return the cached code of a template source."""
+        with self._lock:
+            return self._entries.get((flavor, source))
+
+    def set(self, flavor: str, source: str, code: CodeType) -> None:
+        """Cache the code compiled for a template source."""
+        with self._lock:
+            self._entries[(flavor, source)] = code
+
+
 class HassLoader(jinja2.BaseLoader):
     """An in-memory jinja loader that keeps track of templates that need to be reloaded."""
 
@@ -2854,6 +3066,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__(undefined=make_logging_undefined(strict, log_fn))
         self.hass = hass
+        self._flavor = "limited" if limited else "strict" if strict else "default"
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | None
         ] = weakref.WeakValueDictionary()
@@ -3070,6 +3283,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 "states",
                 "state_translated",
                 "has_value",
+                "state_count",
+                "numeric_state_stat",
                 "utcnow",
                 "now",
                 "device_attr",
@@ -3134,6 +3349,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         self.globals["has_value"] = hassfunction(has_value)
         self.filters["has_value"] = self.globals["has_value"]
         self.tests["has_value"] = hassfunction(has_value, pass_eval_context)
+        self.globals["state_count"] = hassfunction(state_count)
+        self.globals["numeric_state_stat"] = hassfunction(numeric_state_stat)
         self.globals["utcnow"] = hassfunction(utcnow)
         self.globals["now"] = hassfunction(now)
         self.globals["relative_time"] = hassfunction(relative_time)
@@ -3209,7 +3426,15 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
+        if self.hass is None or not isinstance(source, str):
+            compiled = super().compile(source)
+        elif (
+            compiled := (bytecode_cache := _get_bytecode_cache(self.hass)).get(
+                self._flavor, source
+            )
+        ) is None:
+            compiled = super().compile(source)
+            bytecode_cache.set(self._flavor, source, compiled)
         self.template_cache[source] = compiled
         return compiled
 
@@ -18,20 +18,9 @@ import packaging.tags
 from . import bootstrap
 from .core import callback
 from .helpers.frame import warn_use
-from .util.executor import InterruptibleThreadPoolExecutor
+from .util.executor import MAX_EXECUTOR_WORKERS, InterruptibleThreadPoolExecutor
 from .util.thread import deadlock_safe_shutdown
 
-#
-# Some Python versions may have different number of workers by default
-# than others.  In order to be consistent between
-# supported versions, we need to set max_workers.
-#
-# In most cases the workers are not I/O bound, as they
-# are sleeping/blocking waiting for data from integrations
-# updating so this number should be higher than the default
-# use case.
-#
-MAX_EXECUTOR_WORKERS = 64
 TASK_CANCELATION_TIMEOUT = 5
 
 _LOGGER = logging.getLogger(__name__)
@@ -11,6 +11,7 @@ from timeit import default_timer as timer
 
 from homeassistant import core
 from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers import condition
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
     async_track_state_change,
@@ -22,6 +23,9 @@ from homeassistant.helpers.json import JSON_DUMP
 # mypy: no-warn-return-any
 
 BENCHMARKS: dict[str, Callable] = {}
+# Benchmarks that are passed the parsed command line arguments,
+# with the function adding their arguments to the parser
+BENCHMARKS_WITH_ARGS: dict[Callable, Callable[[argparse.ArgumentParser], None]] = {}
 
 
 def run(args):
@@ -29,24 +33,34 @@ def run(args):
     # Disable logging
     logging.getLogger("homeassistant.core").setLevel(logging.CRITICAL)
 
-    parser = argparse.ArgumentParser(description="Run a Home Assistant benchmark.")
+    parser = argparse.ArgumentParser(
+        description="Run a Home Assistant benchmark.", add_help=False
+    )
     parser.add_argument("name", choices=BENCHMARKS)
     parser.add_argument("--script", choices=["benchmark"])
 
+    # Only the arguments of the selected benchmark are added
+    bench = BENCHMARKS[parser.parse_known_args()[0].name]
+    if (add_arguments := BENCHMARKS_WITH_ARGS.get(bench)) is not None:
+        add_arguments(parser)
+    parser.add_argument("-h", "--help", action="help")
+
     args = parser.parse_args()
 
-    bench = BENCHMARKS[args.name]
     print("Using event loop:", asyncio.get_event_loop_policy().loop_name)
 
     with suppress(KeyboardInterrupt):
         while True:
-            asyncio.run(run_benchmark(bench))
+            asyncio.run(run_benchmark(bench, args))
 
 
-async def run_benchmark(bench):
+async def run_benchmark(bench, args):
     """Run a benchmark."""
     hass = core.HomeAssistant("")
-    runtime = await bench(hass)
+    if bench in BENCHMARKS_WITH_ARGS:
+        runtime = await bench(hass, args)
+    else:
+        runtime = await bench(hass)
     print(f"Benchmark {bench.__name__} done in {runtime}s")
     await hass.async_stop()
 
@@ -57,6 +71,18 @@ def benchmark[_CallableT: Callable](func: _CallableT) -> _CallableT:
     return func
 
 
+def benchmark_with_args[_CallableT: Callable](
+    add_arguments: Callable[[argparse.ArgumentParser], None],
+) -> Callable[[_CallableT], _CallableT]:
+    """Decorate to mark a benchmark that is passed the command line arguments."""
+
+    def _decorator(func: _CallableT) -> _CallableT:
+        BENCHMARKS_WITH_ARGS[func] = add_arguments
+        return benchmark(func)
+
+    return _decorator
+
+
 @benchmark
 async def fire_events(hass):
     """Fire a million events."""
@@ -308,3 +334,63 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def numeric_state_condition(hass):
+    """Check a numeric state condition of 50 entities 10,000 times."""
+    entity_ids = [f"sensor.temperature_{idx}" for idx in range(50)]
+    for idx, entity_id in enumerate(entity_ids):
+        hass.states.async_set(entity_id, str(15 + idx / 10))
+    hass.states.async_set("input_number.max_temperature", "30")
+    check = condition.async_numeric_state_from_config(
+        {
+            "condition": "numeric_state",
+            "entity_id": entity_ids,
+            "above": 10,
+            "below": "input_number.max_temperature",
+        }
+    )
+
+    start = timer()
+    for _ in range(10**4):
+        assert check(hass)
+    return timer() - start
+
+
+@benchmark
+async def state_condition(hass):
+    """Check a state condition of 50 entities 10,000 times."""
+    entity_ids = [f"light.kitchen_{idx}" for idx in range(50)]
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "on")
+    hass.states.async_set("input_select.light_state", "on")
+    check = condition.state_from_config(
+        {
+            "condition": "state",
+            "entity_id": entity_ids,
+            "state": ["unavailable", "input_select.light_state"],
+        }
+    )
+
+    start = timer()
+    for _ in range(10**4):
+        assert check(hass)
+    return timer() - start
+
+
+def _add_recorder_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the recorder_write benchmark."""
+    # The recorder benchmark is imported when it runs since it imports
+    # SQLAlchemy and the recorder which the other benchmarks do not need
+    from . import recorder  # pylint: disable=import-outside-toplevel
+
+    recorder.add_arguments(parser)
+
+
+@benchmark_with_args(_add_recorder_arguments)
+async def recorder_write(hass, args):
+    """Replay events into the recorder and measure the write throughput."""
+    from . import recorder  # pylint: disable=import-outside-toplevel
+
+    return await recorder.recorder_write(hass, args)
@@ -0,0 +1,329 @@
+"""Recorder write throughput benchmark."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import random
+import statistics
+import tempfile
+from timeit import default_timer as timer
+from typing import Any
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from homeassistant import core, loader
+from homeassistant.components.recorder import CONF_COMMIT_INTERVAL, CONF_DB_URL
+from homeassistant.components.recorder.const import SupportedDialect
+from homeassistant.components.recorder.core import Recorder
+from homeassistant.components.recorder.db_schema import (
+    EventData,
+    Events,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.tasks import CommitTask
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, EVENT_STATE_CHANGED
+from homeassistant.helpers.recorder import (
+    async_initialize_recorder,
+    get_instance,
+    session_scope,
+)
+from homeassistant.setup import async_setup_component
+
+# mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
+
+BACKLOG_SAMPLE_INTERVAL = 0.1
+# Number of events fired before yielding to the event loop when
+# events are replayed as fast as possible
+FIRE_BATCH_SIZE = 1000
+
+COUNTED_TABLES = (States, StateAttributes, Events, EventData)
+
+type ReplayItem = tuple[str, dict[str, Any]]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the recorder_write benchmark."""
+    group = parser.add_argument_group("recorder_write")
+    group.add_argument(
+        "--db-url",
+        help="Database to write to, defaults to a new SQLite database",
+    )
+    group.add_argument(
+        "--events", type=int, default=100_000, help="Number of events to replay"
+    )
+    group.add_argument(
+        "--entities", type=int, default=1000, help="Number of entities to update"
+    )
+    group.add_argument(
+        "--attributes", type=int, default=10, help="Number of attributes per state"
+    )
+    group.add_argument(
+        "--attribute-size",
+        type=int,
+        default=20,
+        help="Length of the attribute values",
+    )
+    group.add_argument(
+        "--attribute-churn",
+        type=float,
+        default=0.1,
+        help="Fraction of state changes that also change the attributes",
+    )
+    group.add_argument(
+        "--custom-events",
+        type=float,
+        default=0.1,
+        help="Fraction of the events that are custom events",
+    )
+    group.add_argument(
+        "--rate",
+        type=float,
+        default=0,
+        help="Events per second to replay, 0 replays as fast as possible",
+    )
+    group.add_argument(
+        "--commit-interval",
+        type=int,
+        default=5,
+        help="Commit interval of the recorder in seconds",
+    )
+    group.add_argument(
+        "--replay",
+        type=Path,
+        help=(
+            "JSON lines file of captured events to replay instead of a synthetic"
+            " stream, as sent by the subscribe_events websocket command"
+        ),
+    )
+    group.add_argument(
+        "--seed", type=int, default=0, help="Seed of the synthetic event stream"
+    )
+
+
+def synthetic_events(args: argparse.Namespace) -> Iterator[ReplayItem]:
+    """Generate a synthetic stream of state changes and custom events."""
+    rnd = random.Random(args.seed)
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(args.entities)]
+    attributes = [_random_attributes(rnd, args) for _ in entity_ids]
+    for _ in range(args.events):
+        if rnd.random() < args.custom_events:
+            yield (
+                "benchmark_event",
+                {"value": rnd.randrange(1000), "source": rnd.choice(entity_ids)},
+            )
+            continue
+        idx = rnd.randrange(args.entities)
+        if rnd.random() < args.attribute_churn:
+            attributes[idx] = _random_attributes(rnd, args)
+        yield (
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": entity_ids[idx],
+                "new_state": {
+                    "state": str(rnd.randrange(100)),
+                    "attributes": attributes[idx],
+                },
+            },
+        )
+
+
+def _random_attributes(rnd: random.Random, args: argparse.Namespace) -> dict[str, str]:
+    """Return random attributes."""
+    return {
+        f"attribute_{idx}": rnd.randbytes(args.attribute_size // 2 + 1).hex()[
+            : args.attribute_size
+        ]
+        for idx in range(args.attributes)
+    }
+
+
+def replay_events(path: Path, limit: int) -> Iterator[ReplayItem]:
+    """Read up to limit captured events from a JSON lines file.
+
+    Lines can be the event itself or an event message of the
+    subscribe_events websocket command.
+    """
+    with path.open(encoding="utf-8") as file:
+        for count, line in enumerate(file):
+            if count == limit:
+                return
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            event = event.get("event", event)
+            yield event["event_type"], event.get("data") or {}
+
+
+@dataclass(slots=True)
+class RecorderWriteStats:
+    """Measurements of a recorder_write run."""
+
+    commit_latencies: list[float] = field(default_factory=list)
+    backlog_samples: list[int] = field(default_factory=list)
+
+    def report(
+        self,
+        events: int,
+        runtime: float,
+        size_before: dict[str, int],
+        size_after: dict[str, int],
+    ) -> None:
+        """Print the report of the run."""
+        print(f"Events: {events}")
+        print(f"Events per second: {events / runtime:.0f}")
+        if latencies := sorted(self.commit_latencies):
+            print(
+                f"Commits: {len(latencies)}, latency mean"
+                f" {statistics.fmean(latencies) * 1000:.1f}ms,"
+                f" p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f}ms,"
+                f" max {latencies[-1] * 1000:.1f}ms"
+            )
+        if backlog := self.backlog_samples:
+            print(
+                f"Queue backlog: mean {statistics.fmean(backlog):.0f}, max {max(backlog)}"
+            )
+        for key, after in size_after.items():
+            print(f"Growth of {key}: {after - size_before.get(key, 0)}")
+
+
+def _database_size(instance: Recorder, session: Session) -> dict[str, int]:
+    """Return the row counts of the written tables and the database size."""
+    size = {
+        table.__tablename__: session.execute(
+            select(func.count()).select_from(table)
+        ).scalar_one()
+        for table in COUNTED_TABLES
+    }
+    if instance.dialect_name == SupportedDialect.SQLITE:
+        database = session.connection().engine.url.database
+        size["bytes"] = sum(
+            os.path.getsize(path)
+            for path in (database, f"{database}-wal")
+            if database and os.path.exists(path)
+        )
+    elif instance.dialect_name == SupportedDialect.POSTGRESQL:
+        size["bytes"] = session.execute(
+            text("SELECT pg_database_size(current_database())")
+        ).scalar_one()
+    elif instance.dialect_name == SupportedDialect.MYSQL:
+        size["bytes"] = int(
+            session.execute(
+                text(
+                    "SELECT SUM(data_length + index_length) FROM"
+                    " information_schema.tables WHERE table_schema = DATABASE()"
+                )
+            ).scalar_one()
+            or 0
+        )
+    return size
+
+
+async def _async_database_size(instance: Recorder) -> dict[str, int]:
+    """Return the database size from the recorder thread."""
+
+    def _size() -> dict[str, int]:
+        with session_scope(session=instance.get_session(), read_only=True) as session:
+            return _database_size(instance, session)
+
+    return await instance.async_add_executor_job(_size)
+
+
+async def _async_wait_committed(instance: Recorder) -> None:
+    """Wait until the recorder committed everything in the queue."""
+    await instance.async_block_till_done()
+    instance.queue_task(CommitTask())
+    await instance.async_block_till_done()
+
+
+async def recorder_write(hass: core.HomeAssistant, args: argparse.Namespace) -> float:
+    """Replay events into the recorder and measure the write throughput."""
+    # The directory is removed once run_benchmark stopped Home Assistant
+    # and the recorder closed the database
+    tmp_dir = tempfile.TemporaryDirectory()
+
+    async def _async_remove_tmp_dir(_: core.Event) -> None:
+        await hass.async_add_executor_job(tmp_dir.cleanup)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_remove_tmp_dir)
+    db_url = args.db_url or f"sqlite:///{tmp_dir.name}/home-assistant_v2.db"
+    hass.config.config_dir = tmp_dir.name
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    async_initialize_recorder(hass)
+    await async_setup_component(
+        hass,
+        "recorder",
+        {
+            "recorder": {
+                CONF_DB_URL: db_url,
+                CONF_COMMIT_INTERVAL: args.commit_interval,
+            }
+        },
+    )
+    await hass.async_start()
+    instance = get_instance(hass)
+    await _async_wait_committed(instance)
+
+    if args.replay:
+        stream = list(replay_events(args.replay, args.events))
+    else:
+        stream = list(synthetic_events(args))
+
+    stats = RecorderWriteStats()
+    original_commit = instance._commit_event_session_or_retry  # noqa: SLF001
+
+    def _timed_commit() -> None:
+        start = timer()
+        try:
+            original_commit()
+        finally:
+            stats.commit_latencies.append(timer() - start)
+
+    instance._commit_event_session_or_retry = _timed_commit  # type: ignore[method-assign] # noqa: SLF001
+
+    async def _sample_backlog() -> None:
+        while True:
+            stats.backlog_samples.append(instance.backlog)
+            await asyncio.sleep(BACKLOG_SAMPLE_INTERVAL)
+
+    size_before = await _async_database_size(instance)
+    sampler = hass.async_create_background_task(
+        _sample_backlog(), "benchmark backlog sampler"
+    )
+    start = timer()
+    for count, (event_type, data) in enumerate(stream):
+        if args.rate:
+            if (delay := start + count / args.rate - timer()) > 0:
+                await asyncio.sleep(delay)
+        elif not count % FIRE_BATCH_SIZE:
+            await asyncio.sleep(0)
+        if event_type != EVENT_STATE_CHANGED:
+            hass.bus.async_fire(event_type, data)
+        elif (new_state := data.get("new_state")) is None:
+            hass.states.async_remove(data["entity_id"])
+        else:
+            hass.states.async_set(
+                data["entity_id"],
+                new_state["state"],
+                new_state.get("attributes"),
+                force_update=True,
+            )
+    await hass.async_block_till_done()
+    await _async_wait_committed(instance)
+    runtime = timer() - start
+    sampler.cancel()
+
+    stats.report(
+        len(stream), runtime, size_before, await _async_database_size(instance)
+    )
+    return runtime
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 import contextlib
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import functools
 import logging
 import sys
 from threading import Thread
@@ -21,6 +27,26 @@ _JOIN_ATTEMPTS = 10
 
 EXECUTOR_SHUTDOWN_TIMEOUT = 10
 
+#
+# Some Python versions may have different number of workers by default
+# than others.  In order to be consistent between
+# supported versions, we need to set max_workers.
+#
+# In most cases the workers are not I/O bound, as they
+# are sleeping/blocking waiting for data from integrations
+# updating so this number should be higher than the default
+# use case.
+#
+MAX_EXECUTOR_WORKERS = 64
+
+# A single integration can use at most this many workers at the
+# same time unless a different limit is set for its lane
+DEFAULT_LANE_LIMIT = MAX_EXECUTOR_WORKERS // 2
+
+# Set in the worker while it runs a job of the executor lanes. Callbacks
+# and tasks the job schedules on the event loop inherit it.
+_IN_EXECUTOR_JOB: ContextVar[bool] = ContextVar("in_executor_job", default=False)
+
 
 def _log_thread_running_at_shutdown(name: str, ident: int) -> None:
     """Log the stack of a thread that was still running at shutdown."""
@@ -100,3 +126,260 @@ class InterruptibleThreadPoolExecutor(ThreadPoolExecutor):
             )
             if timeout_remaining <= 0:
                 return
+
+
+@dataclass(slots=True)
+class _ExecutorLane:
+    """Jobs of a single integration."""
+
+    limit: int
+    running: int = 0
+    jobs: int = 0
+    max_queued: int = 0
+    queue: deque[tuple[asyncio.Future[Any], Callable[..., Any], tuple[Any, ...]]] = (
+        field(default_factory=deque)
+    )
+
+
+@dataclass(slots=True, eq=False)
+class _RunningJob:
+    """A job running in the executor."""
+
+    lane: _ExecutorLane | None = None
+    # The task adding the job and its target while it is not attributed
+    added_by: tuple[asyncio.Task[Any] | None, Callable[..., Any]] | None = None
+
+
+def _no_lane(task: asyncio.Task[Any] | None, target: Callable[..., Any]) -> None:
+    """Return no lane for a job."""
+    return
+
+
+def _run_executor_job[_T](target: Callable[..., _T], args: tuple[Any, ...]) -> _T:
+    """Run a job of the executor lanes in a worker."""
+    token = _IN_EXECUTOR_JOB.set(True)
+    try:
+        return target(*args)
+    finally:
+        _IN_EXECUTOR_JOB.reset(token)
+
+
+def _async_copy_future_result(
+    destination: asyncio.Future[Any], source: asyncio.Future[Any]
+) -> None:
+    """Copy the result of a done future to another future."""
+    if destination.done():
+        return
+    if source.cancelled():
+        destination.cancel()
+    elif (exc := source.exception()) is not None:
+        destination.set_exception(exc)
+    else:
+        destination.set_result(source.result())
+
+
+def _async_cancel_if_cancelled(
+    destination: asyncio.Future[Any], source: asyncio.Future[Any]
+) -> None:
+    """Cancel a future if another future was cancelled."""
+    if source.cancelled():
+        destination.cancel()
+
+
+class ExecutorLanes:
+    """Fairly share the workers of the default executor between integrations.
+
+    Every integration gets its own lane with a limit on the number of
+    jobs it can run in the executor at the same time. Jobs over the
+    limit, or over the worker budget of the executor, wait in their lane
+    and the lanes are served round robin when a worker frees up, so a
+    slow integration cannot block the jobs of all other integrations.
+
+    Jobs that are not run for an integration bypass the lanes, they
+    start right away but do count towards the worker budget. So do jobs
+    added by a running job, which may block its worker waiting for them
+    and would never start if its lane was full.
+
+    Only jobs run through the lanes count towards the worker budget,
+    jobs submitted with loop.run_in_executor or to the executor directly
+    are not seen, so the budget is not a hard limit on the executor.
+
+    This class must only be used from the event loop.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        max_workers: int = MAX_EXECUTOR_WORKERS,
+        default_limit: int = DEFAULT_LANE_LIMIT,
+        job_lane: Callable[
+            [asyncio.Task[Any] | None, Callable[..., Any]], str | None
+        ] = _no_lane,
+    ) -> None:
+        """Initialize the executor lanes."""
+        self._loop = loop
+        self._max_workers = max_workers
+        self._default_limit = default_limit
+        self._job_lane = job_lane
+        # No lane can be full while fewer jobs run
+        self._min_limit = min(default_limit, max_workers)
+        self._running = 0
+        self._lanes: dict[str, _ExecutorLane] = {}
+        # Lanes with queued jobs in round robin order
+        self._waiting: deque[_ExecutorLane] = deque()
+        # Running jobs started before they were attributed to a lane
+        self._unattributed: set[_RunningJob] = set()
+
+    def _get_lane(self, domain: str) -> _ExecutorLane:
+        """Return the lane of a domain."""
+        if (lane := self._lanes.get(domain)) is None:
+            lane = self._lanes[domain] = _ExecutorLane(self._default_limit)
+        return lane
+
+    def async_set_limit(self, domain: str, limit: int) -> None:
+        """Set the number of jobs a domain can run at the same time."""
+        if limit < 1:
+            raise ValueError(f"Lane limit must be at least 1, got {limit}")
+        self._get_lane(domain).limit = limit
+        self._min_limit = min(
+            [self._default_limit, self._max_workers]
+            + [lane.limit for lane in self._lanes.values()]
+        )
+        self._async_schedule()
+
+    def async_run_for_task[*_Ts, _T](
+        self,
+        task: asyncio.Task[Any] | None,
+        target: Callable[[*_Ts], _T],
+        *args: *_Ts,
+    ) -> asyncio.Future[_T]:
+        """Run a job added by a task in the default executor in its lane.
+
+        Finding the lane of a job is not free, so while too few jobs run
+        for any lane to be full the job is started right away. The jobs
+        that are running are attributed to their lanes once enough jobs
+        run for the limits to matter.
+        """
+        if self._waiting or self._running >= self._min_limit:
+            return self.async_run(self._job_lane(task, target), target, *args)
+        if _IN_EXECUTOR_JOB.get():
+            return self._async_start(_RunningJob(), target, args)
+        job = _RunningJob(added_by=(task, target))
+        self._unattributed.add(job)
+        return self._async_start(job, target, args)
+
+    def async_run[*_Ts, _T](
+        self, domain: str | None, target: Callable[[*_Ts], _T], *args: *_Ts
+    ) -> asyncio.Future[_T]:
+        """Run a job in the default executor in the lane of a domain.
+
+        Jobs without a domain, or added by a running job, are started
+        right away.
+        """
+        if domain is None or _IN_EXECUTOR_JOB.get():
+            return self._async_start(_RunningJob(), target, args)
+        if self._unattributed and self._running >= self._min_limit:
+            self._async_attribute_running()
+        lane = self._get_lane(domain)
+        lane.jobs += 1
+        if (
+            not lane.queue
+            and lane.running < lane.limit
+            and self._running < self._max_workers
+        ):
+            return self._async_start(_RunningJob(lane), target, args)
+        future: asyncio.Future[_T] = self._loop.create_future()
+        lane.queue.append((future, target, args))
+        lane.max_queued = max(len(lane.queue), lane.max_queued)
+        if len(lane.queue) == 1:
+            self._waiting.append(lane)
+        return future
+
+    def _async_start[_T](
+        self,
+        job: _RunningJob,
+        target: Callable[..., _T],
+        args: tuple[Any, ...],
+    ) -> asyncio.Future[_T]:
+        """Start a job in the executor."""
+        future = self._loop.run_in_executor(None, _run_executor_job, target, args)
+        if job.lane is not None:
+            job.lane.running += 1
+        self._running += 1
+        future.add_done_callback(functools.partial(self._async_job_done, job))
+        return future
+
+    def _async_job_done(self, job: _RunningJob, _: asyncio.Future[Any]) -> None:
+        """Free the worker of a job that is done and start waiting jobs."""
+        if job.added_by is not None:
+            self._unattributed.discard(job)
+        elif job.lane is not None:
+            job.lane.running -= 1
+        self._running -= 1
+        if self._waiting:
+            self._async_schedule()
+
+    def _async_attribute_running(self) -> None:
+        """Attribute the running jobs that were started right away to lanes."""
+        for job in self._unattributed:
+            assert job.added_by is not None
+            domain = self._job_lane(*job.added_by)
+            job.added_by = None
+            if domain is not None:
+                job.lane = self._get_lane(domain)
+                job.lane.running += 1
+                job.lane.jobs += 1
+        self._unattributed.clear()
+
+    def _async_schedule(self) -> None:
+        """Start waiting jobs round robin over the lanes."""
+        waiting = self._waiting
+        skipped = 0
+        while waiting and skipped < len(waiting) and self._running < self._max_workers:
+            lane = waiting[0]
+            if lane.running >= lane.limit:
+                waiting.rotate(-1)
+                skipped += 1
+                continue
+            future, target, args = lane.queue.popleft()
+            if lane.queue:
+                waiting.rotate(-1)
+            else:
+                waiting.popleft()
+            skipped = 0
+            if future.done():
+                # Cancelled while waiting
+                continue
+            try:
+                started = self._async_start(_RunningJob(lane), target, args)
+            except RuntimeError as err:
+                # The executor has been shut down
+                future.set_exception(err)
+                continue
+            started.add_done_callback(
+                functools.partial(_async_copy_future_result, future)
+            )
+            future.add_done_callback(
+                functools.partial(_async_cancel_if_cancelled, started)
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the running and queued jobs of every lane.
+
+        Jobs are only counted in a lane once they are attributed to it.
+        """
+        return {
+            "max_workers": self._max_workers,
+            "running": self._running,
+            "queued": sum(len(lane.queue) for lane in self._waiting),
+            "lanes": {
+                domain: {
+                    "limit": lane.limit,
+                    "running": lane.running,
+                    "queued": len(lane.queue),
+                    "max_queued": lane.max_queued,
+                    "jobs": lane.jobs,
+                }
+                for domain, lane in sorted(self._lanes.items())
+            },
+        }
@@ -0,0 +1,237 @@
+"""Per integration accounting of tasks and executor jobs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+import functools
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .executor import ExecutorLanes
+
+UNKNOWN_DOMAIN = "unknown"
+
+
+@functools.lru_cache(maxsize=1024)
+def _filename_attribution(filename: str) -> tuple[str, bool]:
+    """Return the domain a source file belongs to and if it is an integration."""
+    parts = filename.replace("\\", "/").split("/")
+    for idx in range(len(parts) - 2, 0, -1):
+        part = parts[idx]
+        if part == "custom_components" or (
+            part == "components" and parts[idx - 1] == "homeassistant"
+        ):
+            return parts[idx + 1].removesuffix(".py"), True
+        if part in ("site-packages", "dist-packages"):
+            return parts[idx + 1].removesuffix(".py"), False
+        if part == "homeassistant":
+            return "homeassistant", False
+    return UNKNOWN_DOMAIN, False
+
+
+def filename_domain(filename: str) -> str:
+    """Return the integration domain the source file belongs to.
+
+    Files outside of an integration are attributed to homeassistant
+    if they are part of core, or to the package they belong to.
+    """
+    return _filename_attribution(filename)[0]
+
+
+def coroutine_domain(coro: Coroutine[Any, Any, Any]) -> str:
+    """Return the integration domain of a coroutine."""
+    if (code := getattr(coro, "cr_code", None)) is None:
+        return UNKNOWN_DOMAIN
+    return filename_domain(code.co_filename)
+
+
+def _callable_attribution(target: Callable[..., Any]) -> tuple[str, bool]:
+    """Return the domain a callable belongs to and if it is an integration."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    target = getattr(target, "__func__", target)
+    if (code := getattr(target, "__code__", None)) is None:
+        # Builtins and callable objects, fall back to the module
+        module: str = getattr(target, "__module__", None) or UNKNOWN_DOMAIN
+        if module.startswith("homeassistant.components."):
+            return module.split(".", 3)[2], True
+        return module.partition(".")[0], False
+    return _filename_attribution(code.co_filename)
+
+
+def callable_domain(target: Callable[..., Any]) -> str:
+    """Return the integration domain of a callable."""
+    return _callable_attribution(target)[0]
+
+
+def executor_job_domain(
+    task: asyncio.Task[Any] | None, target: Callable[..., Any]
+) -> tuple[str, bool]:
+    """Return the domain an executor job is run for and if it is an integration.
+
+    Jobs are attributed to the integration of the task adding them, so
+    library calls like requests.get count towards the integration making
+    them. Jobs added by tasks outside of integrations, like the polling
+    of entities by core helpers, are attributed to their target instead.
+    """
+    if (
+        task is not None
+        and (code := getattr(task.get_coro(), "cr_code", None)) is not None
+    ):
+        attribution = _filename_attribution(code.co_filename)
+        if attribution[1]:
+            return attribution
+    return _callable_attribution(target)
+
+
+def executor_job_lane(
+    task: asyncio.Task[Any] | None, target: Callable[..., Any]
+) -> str | None:
+    """Return the executor lane of a job, only integrations have one."""
+    domain, integration = executor_job_domain(task, target)
+    return domain if integration else None
+
+
+@dataclass(slots=True)
+class DomainTaskStats:
+    """Task and executor job counters of an integration."""
+
+    tasks_created: int = 0
+    tasks_in_flight: int = 0
+    executor_jobs: int = 0
+    executor_in_flight: int = 0
+    executor_wait: float = 0.0
+    executor_wait_max: float = 0.0
+    executor_run: float = 0.0
+    executor_run_max: float = 0.0
+
+    def reset(self) -> None:
+        """Reset the counters, jobs still in flight are kept."""
+        self.tasks_created = 0
+        self.executor_jobs = self.executor_in_flight
+        self.executor_wait = self.executor_wait_max = 0.0
+        self.executor_run = self.executor_run_max = 0.0
+
+    def as_dict(self, duration: float) -> dict[str, Any]:
+        """Return the counters as a dict with durations in ms."""
+        finished = self.executor_jobs - self.executor_in_flight
+        return {
+            "tasks_created": self.tasks_created,
+            "tasks_in_flight": self.tasks_in_flight,
+            "tasks_per_second": round(self.tasks_created / duration, 3)
+            if duration
+            else 0,
+            "executor_jobs": self.executor_jobs,
+            "executor_in_flight": self.executor_in_flight,
+            "executor_wait_total_ms": round(self.executor_wait * 1000, 3),
+            "executor_wait_mean_ms": round(self.executor_wait * 1000 / finished, 3)
+            if finished
+            else 0,
+            "executor_wait_max_ms": round(self.executor_wait_max * 1000, 3),
+            "executor_run_total_ms": round(self.executor_run * 1000, 3),
+            "executor_run_mean_ms": round(self.executor_run * 1000 / finished, 3)
+            if finished
+            else 0,
+            "executor_run_max_ms": round(self.executor_run_max * 1000, 3),
+        }
+
+
+class TaskStats:
+    """Account tasks and executor jobs to the integration that created them.
+
+    All counters are only updated from the event loop, the time an
+    executor job starts and finishes is recorded by the worker thread
+    and accounted when the job is done.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the task stats."""
+        self.started = perf_counter()
+        self.domains: defaultdict[str, DomainTaskStats] = defaultdict(DomainTaskStats)
+
+    def async_reset(self) -> None:
+        """Reset the counters, in flight counts are kept."""
+        self.started = perf_counter()
+        for stats in self.domains.values():
+            stats.reset()
+
+    def async_add_task(
+        self, task: asyncio.Future[Any], coro: Coroutine[Any, Any, Any]
+    ) -> None:
+        """Account a task created for a coroutine."""
+        stats = self.domains[coroutine_domain(coro)]
+        stats.tasks_created += 1
+        if task.done():
+            return
+        stats.tasks_in_flight += 1
+        task.add_done_callback(functools.partial(self._async_task_done, stats))
+
+    @staticmethod
+    def _async_task_done(stats: DomainTaskStats, _: asyncio.Future[Any]) -> None:
+        """Account a task that is done."""
+        stats.tasks_in_flight -= 1
+
+    def async_run_in_executor[*_Ts, _T](
+        self,
+        lanes: ExecutorLanes,
+        domain: str,
+        lane: str | None,
+        target: Callable[[*_Ts], _T],
+        *args: *_Ts,
+    ) -> asyncio.Future[_T]:
+        """Run a job in an executor lane and account its wait and run time."""
+        stats = self.domains[domain]
+        stats.executor_jobs += 1
+        stats.executor_in_flight += 1
+        # queued, started and finished time of the job
+        times = [perf_counter()]
+
+        def _timed_job() -> _T:
+            times.append(perf_counter())
+            try:
+                return target(*args)
+            finally:
+                times.append(perf_counter())
+
+        future = lanes.async_run(lane, _timed_job)
+        future.add_done_callback(
+            functools.partial(self._async_executor_job_done, stats, times)
+        )
+        return future
+
+    @staticmethod
+    def _async_executor_job_done(
+        stats: DomainTaskStats, times: list[float], _: asyncio.Future[Any]
+    ) -> None:
+        """Account an executor job that is done."""
+        stats.executor_in_flight -= 1
+        if len(times) != 3:
+            # Cancelled before it started, or still running in the
+            # worker thread after the future was cancelled
+            return
+        queued, started, finished = times
+        wait = started - queued
+        run = finished - started
+        stats.executor_wait += wait
+        stats.executor_wait_max = max(wait, stats.executor_wait_max)
+        stats.executor_run += run
+        stats.executor_run_max = max(run, stats.executor_run_max)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters of all integrations."""
+        duration = perf_counter() - self.started
+        return {
+            "duration": round(duration, 3),
+            "domains": {
+                domain: stats.as_dict(duration)
+                for domain, stats in sorted(
+                    self.domains.items(),
+                    key=lambda item: item[1].executor_run,
+                    reverse=True,
+                )
+            },
+        }
@@ -6,6 +6,7 @@ from ulid_transform import (
     bytes_to_ulid,
     bytes_to_ulid_or_none,
     ulid_at_time,
+    ulid_at_time_bytes,
     ulid_hex,
     ulid_now,
     ulid_to_bytes,
@@ -16,6 +17,7 @@ __all__ = [
     "ulid",
     "ulid_hex",
     "ulid_at_time",
+    "ulid_at_time_bytes",
     "ulid_to_bytes",
     "bytes_to_ulid",
     "ulid_now",
@@ -291,7 +291,7 @@ async def test_stats_addon_sensor(
 
     # Enable the entity and wait for the reload to complete.
     entity_registry.async_update_entity(entity_id, disabled_by=None)
-    freezer.tick(config_entries.RELOAD_AFTER_UPDATE_DELAY)
+    freezer.tick(config_entries.RELOAD_AFTER_UPDATE_DELAY + 1)
     async_fire_time_changed(hass)
     await hass.async_block_till_done(wait_background_tasks=True)
     assert config_entry.state is ConfigEntryState.LOADED
@@ -1,10 +1,12 @@
 """Test the Profiler config flow."""
 
+import asyncio
 from datetime import timedelta
 from functools import lru_cache
 import logging
 import os
 from pathlib import Path
+import time
 from unittest.mock import patch
 
 from freezegun.api import FrozenDateTimeFactory
@@ -16,7 +18,9 @@ from homeassistant.components.profiler import (
     _LRU_CACHE_WRAPPER_OBJECT,
     _SQLALCHEMY_LRU_OBJECT,
     CONF_ENABLED,
+    CONF_SAMPLE_RATE,
     CONF_SECONDS,
+    CONF_TOP,
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_CURRENT_TASKS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
@@ -27,8 +31,12 @@ from homeassistant.components.profiler import (
     SERVICE_START,
     SERVICE_START_LOG_OBJECT_SOURCES,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_START_LOOP_STATS,
+    SERVICE_START_TASK_STATS,
     SERVICE_STOP_LOG_OBJECT_SOURCES,
     SERVICE_STOP_LOG_OBJECTS,
+    SERVICE_STOP_LOOP_STATS,
+    SERVICE_STOP_TASK_STATS,
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
@@ -37,6 +45,9 @@ from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.typing import WebSocketGenerator
+
+_ORIGINAL_HANDLE_RUN = asyncio.Handle._run
 
 
 async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
@@ -446,3 +457,175 @@ async def test_set_asyncio_debug(
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_loop_stats(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test sampling event loop stats."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/loop_stats"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+    with pytest.raises(HomeAssistantError, match="Event loop stats not running"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_STOP_LOOP_STATS, {}, blocking=True
+        )
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_LOOP_STATS,
+        {CONF_SAMPLE_RATE: 1, CONF_TOP: 2},
+        blocking=True,
+    )
+    with pytest.raises(HomeAssistantError, match="Event loop stats already started"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_LOOP_STATS, {}, blocking=True
+        )
+
+    def _slow_callback() -> None:
+        """Mock a slow callback of an integration."""
+        time.sleep(0.01)
+
+    _slow_callback.__code__ = _slow_callback.__code__.replace(
+        co_filename="/srv/homeassistant/components/slow/sensor.py"
+    )
+
+    hass.loop.call_soon(_slow_callback)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    await client.send_json_auto_id({"type": "profiler/loop_stats", "reset": True})
+    response = await client.receive_json()
+    assert response["success"]
+    stats = response["result"]
+    assert stats["sample_rate"] == 1
+    assert stats["domains"]["slow"]["count"] == 1
+    assert stats["domains"]["slow"]["max_ms"] >= 10
+    assert stats["domains"]["slow"]["histogram"]["50"] == 1
+    assert len(stats["slowest"]) == 2
+    assert stats["slowest"][0] == {
+        "domain": "slow",
+        "callback": "test_loop_stats.<locals>._slow_callback",
+        "duration_ms": stats["domains"]["slow"]["max_ms"],
+    }
+    assert "loop_lag" in stats
+
+    await client.send_json_auto_id({"type": "profiler/loop_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert "slow" not in response["result"]["domains"]
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_LOOP_STATS, {}, blocking=True)
+    assert "Event loop stats:" in caplog.text
+    assert asyncio.Handle._run is _ORIGINAL_HANDLE_RUN
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_task_stats(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test accounting tasks and executor jobs per integration."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/task_stats"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+    with pytest.raises(HomeAssistantError, match="Task stats not running"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_STOP_TASK_STATS, {}, blocking=True
+        )
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_TASK_STATS, {}, blocking=True)
+    with pytest.raises(HomeAssistantError, match="Task stats already started"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_TASK_STATS, {}, blocking=True
+        )
+
+    await hass.async_add_executor_job(time.sleep, 0)
+
+    await client.send_json_auto_id({"type": "profiler/task_stats", "reset": True})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["domains"]["time"]["executor_jobs"] == 1
+
+    await client.send_json_auto_id({"type": "profiler/task_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["domains"]["time"]["executor_jobs"] == 0
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_TASK_STATS, {}, blocking=True)
+    assert "Task stats:" in caplog.text
+    assert hass.task_stats is None
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_TASK_STATS, {}, blocking=True)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.task_stats is None
+
+
+async def test_executor_lanes(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test getting the executor lanes."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.executor_lanes.async_run("slow", time.sleep, 0)
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": "profiler/executor_lanes"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["running"] == 0
+    assert response["result"]["queued"] == 0
+    assert response["result"]["lanes"]["slow"] == {
+        "limit": 32,
+        "running": 0,
+        "queued": 0,
+        "max_queued": 0,
+        "jobs": 1,
+    }
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_loop_stats_stopped_on_unload(hass: HomeAssistant) -> None:
+    """Test event loop stats are stopped when the config entry is unloaded."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_LOOP_STATS, {}, blocking=True)
+    assert asyncio.Handle._run is not _ORIGINAL_HANDLE_RUN
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert asyncio.Handle._run is _ORIGINAL_HANDLE_RUN
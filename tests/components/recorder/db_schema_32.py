@@ -246,6 +246,11 @@ class Events(Base):  # type: ignore[misc,valid-type]
             f", data_id={self.data_id})>"
         )
 
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create a row from an event."""
+        return _row_from_object(Events.from_event(event))
+
     @staticmethod
     def from_event(event: Event) -> Events:
         """Create an event database object from a native event."""
@@ -411,6 +416,11 @@ class States(Base):  # type: ignore[misc,valid-type]
             f" old_state_id={self.old_state_id}, attributes_id={self.attributes_id})>"
         )
 
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create a row from an event."""
+        return _row_from_object(States.from_event(event))
+
     @staticmethod
     def from_event(event: Event) -> States:
         """Create object from a state_changed event."""
@@ -761,3 +771,16 @@ def process_timestamp(ts: datetime | None) -> datetime | None:
         return ts.replace(tzinfo=dt_util.UTC)
 
     return dt_util.as_utc(ts)
+
+
+def _row_from_object(obj: Base) -> dict[str, Any]:
+    """Return the columns set on an object as a row to insert.
+
+    Unset columns with a default are left out so the default is used.
+    """
+    return {
+        column.key: getattr(obj, column.key)
+        for column in obj.__table__.columns
+        if not column.primary_key
+        and (column.default is None or column.key in obj.__dict__)
+    }
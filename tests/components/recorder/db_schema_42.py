@@ -299,6 +299,11 @@ class Events(Base):
             return None
         return date_time.isoformat(sep=" ", timespec="seconds")
 
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create a row from an event."""
+        return _row_from_object(Events.from_event(event))
+
     @staticmethod
     def from_event(event: Event) -> Events:
         """Create an event database object from a native event."""
@@ -485,6 +490,11 @@ class States(Base):
             return None
         return date_time.isoformat(sep=" ", timespec="seconds")
 
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create a row from an event."""
+        return _row_from_object(States.from_event(event))
+
     @staticmethod
     def from_event(event: Event) -> States:
         """Create object from a state_changed event."""
@@ -858,3 +868,16 @@ SHARED_ATTR_OR_LEGACY_ATTRIBUTES = case(
 SHARED_DATA_OR_LEGACY_EVENT_DATA = case(
     (EventData.shared_data.is_(None), Events.event_data), else_=EventData.shared_data
 ).label("event_data")
+
+
+def _row_from_object(obj: Base) -> dict[str, Any]:
+    """Return the columns set on an object as a row to insert.
+
+    Unset columns with a default are left out so the default is used.
+    """
+    return {
+        column.key: getattr(obj, column.key)
+        for column in obj.__table__.columns
+        if not column.primary_key
+        and (column.default is None or column.key in obj.__dict__)
+    }
@@ -0,0 +1,136 @@
+"""The tests for the state attributes manager."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder.bloom_filter import MIN_CAPACITY, HashBloomFilter
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.components.recorder.queries import get_shared_attributes
+from homeassistant.components.recorder.table_managers.state_attributes import (
+    StateAttributesManager,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+
+from ..common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+async def _async_wait_hash_filter_loaded(
+    hass: HomeAssistant, manager: StateAttributesManager
+) -> None:
+    """Wait until the batches of the bloom filter are loaded."""
+    for _ in range(10):
+        await async_wait_recording_done(hass)
+        if manager._hash_filter_loaded:
+            return
+    pytest.fail("The bloom filter was not loaded")
+
+
+async def test_get_many_skips_hashes_not_in_the_table(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test only hashes in the bloom filter are looked up in the database."""
+    instance = await async_setup_recorder_instance(hass)
+    hass.states.async_set("sensor.test", "on", {"attr": 1})
+    await async_wait_recording_done(hass)
+
+    manager = instance.state_attributes_manager
+    await _async_wait_hash_filter_loaded(hass, manager)
+    # Forget the cached attributes_ids so they are looked up again
+    manager.reset()
+    known_attrs = '{"attr":1}'
+    unknown_attrs = '{"attr":2}'
+    known_hash = StateAttributes.hash_shared_attrs_bytes(known_attrs.encode())
+    unknown_hash = StateAttributes.hash_shared_attrs_bytes(unknown_attrs.encode())
+    shared_attrs_data_hashes = (
+        (known_attrs, known_hash),
+        (unknown_attrs, unknown_hash),
+    )
+
+    with (
+        session_scope(session=instance.get_session()) as session,
+        patch(
+            "homeassistant.components.recorder.table_managers.state_attributes.get_shared_attributes",
+            wraps=get_shared_attributes,
+        ) as get_shared_attributes_mock,
+    ):
+        attributes_id = (
+            session.query(StateAttributes.attributes_id)
+            .filter(StateAttributes.shared_attrs == known_attrs)
+            .scalar()
+        )
+        assert attributes_id is not None
+        expected = {known_attrs: attributes_id, unknown_attrs: None}
+        # Every hash is looked up until the bloom filter is loaded
+        assert manager.get_many(shared_attrs_data_hashes, session) == expected
+
+    assert len(get_shared_attributes_mock.mock_calls) == 1
+    assert set(get_shared_attributes_mock.mock_calls[0].args[0]) == {
+        known_hash,
+        unknown_hash,
+    }
+
+    await _async_wait_hash_filter_loaded(hass, manager)
+    manager._id_map.clear()
+    with (
+        session_scope(session=instance.get_session()) as session,
+        patch(
+            "homeassistant.components.recorder.table_managers.state_attributes.get_shared_attributes",
+            wraps=get_shared_attributes,
+        ) as get_shared_attributes_mock,
+    ):
+        assert manager.get_many(shared_attrs_data_hashes, session) == expected
+
+    assert len(get_shared_attributes_mock.mock_calls) == 1
+    assert set(get_shared_attributes_mock.mock_calls[0].args[0]) == {known_hash}
+
+
+async def test_bloom_filter_loaded_in_batches_once(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the bloom filter is loaded in batches and grows instead of reloading."""
+    instance = await async_setup_recorder_instance(hass)
+    for idx in range(5):
+        hass.states.async_set("sensor.test", "on", {"attr": idx})
+        await async_wait_recording_done(hass)
+
+    manager = instance.state_attributes_manager
+    await _async_wait_hash_filter_loaded(hass, manager)
+    manager.reset()
+    with (
+        patch("homeassistant.components.recorder.table_managers.HASHES_PER_BATCH", 2),
+        patch(
+            "homeassistant.components.recorder.table_managers.HashBloomFilter",
+            wraps=HashBloomFilter,
+        ) as hash_filter_mock,
+        patch.object(
+            manager, "_find_hashes", wraps=manager._find_hashes
+        ) as find_hashes_mock,
+    ):
+        assert manager._may_exist(0)
+        await _async_wait_hash_filter_loaded(hass, manager)
+        # Batches of two rows until a batch is short
+        assert [call.args for call in find_hashes_mock.mock_calls] == [
+            (0, 2),
+            (2, 2),
+            (4, 2),
+        ]
+        for idx in range(5):
+            assert manager._may_exist(
+                StateAttributes.hash_shared_attrs_bytes(f'{{"attr":{idx}}}'.encode())
+            )
+
+        # New rows are added to the filter instead of loading it again
+        for idx in range(5, MIN_CAPACITY * 2):
+            manager._add_pending_hash(idx)
+        assert manager._hash_filter.layers == 2
+        assert manager._may_exist(MIN_CAPACITY)
+        await async_wait_recording_done(hass)
+
+    assert len(hash_filter_mock.mock_calls) == 1
+    assert len(find_hashes_mock.mock_calls) == 3
@@ -0,0 +1,69 @@
+"""Test the adaptive commit interval of the recorder."""
+
+from homeassistant.components.recorder.adaptive_commit import AdaptiveCommitInterval
+from homeassistant.components.recorder.const import ADAPTIVE_COMMIT_MAX_PENDING_ROWS
+
+
+def test_commit_after_interval() -> None:
+    """Test a commit is due once the first pending write waited the interval."""
+    adaptive_commit = AdaptiveCommitInterval(1, 10)
+    assert adaptive_commit.interval == 1
+    assert not adaptive_commit.commit_due(100)
+
+    assert not adaptive_commit.add_pending(1, 100)
+    assert not adaptive_commit.add_pending(2, 100.5)
+    assert not adaptive_commit.commit_due(100.5)
+    assert adaptive_commit.commit_due(101)
+    assert adaptive_commit.add_pending(3, 101)
+
+    adaptive_commit.committed(0.01, 0)
+    assert not adaptive_commit.commit_due(200)
+    assert not adaptive_commit.add_pending(1, 200)
+
+    adaptive_commit.reset()
+    assert not adaptive_commit.commit_due(300)
+
+
+def test_commit_when_batch_is_full() -> None:
+    """Test a commit is due once the pending rows fill a batch."""
+    adaptive_commit = AdaptiveCommitInterval(1, 10)
+    assert not adaptive_commit.add_pending(ADAPTIVE_COMMIT_MAX_PENDING_ROWS - 1, 100)
+    assert adaptive_commit.add_pending(ADAPTIVE_COMMIT_MAX_PENDING_ROWS, 100)
+
+
+def test_interval_follows_commit_latency() -> None:
+    """Test the interval follows the commit latency within its bounds."""
+    adaptive_commit = AdaptiveCommitInterval(1, 10)
+
+    adaptive_commit.committed(0.01, 0)
+    assert adaptive_commit.interval == 1
+
+    adaptive_commit.committed(0.5, 0)
+    assert 1 < adaptive_commit.interval < 5
+
+    for _ in range(50):
+        adaptive_commit.committed(0.5, 0)
+    assert round(adaptive_commit.interval, 3) == 5
+
+    adaptive_commit.committed(5, 0)
+    assert adaptive_commit.interval == 10
+
+    for _ in range(50):
+        adaptive_commit.committed(0.001, 0)
+    assert adaptive_commit.interval == 1
+
+
+def test_interval_grows_with_backlog() -> None:
+    """Test the interval doubles while the backlog exceeds a batch."""
+    adaptive_commit = AdaptiveCommitInterval(1, 10)
+
+    adaptive_commit.committed(0.01, ADAPTIVE_COMMIT_MAX_PENDING_ROWS)
+    assert adaptive_commit.interval == 2
+    adaptive_commit.committed(0.01, ADAPTIVE_COMMIT_MAX_PENDING_ROWS)
+    assert adaptive_commit.interval == 4
+    adaptive_commit.committed(0.01, ADAPTIVE_COMMIT_MAX_PENDING_ROWS)
+    adaptive_commit.committed(0.01, ADAPTIVE_COMMIT_MAX_PENDING_ROWS)
+    assert adaptive_commit.interval == 10
+
+    adaptive_commit.committed(0.01, 0)
+    assert adaptive_commit.interval == 1
@@ -0,0 +1,48 @@
+"""Test the bloom filter of the recorder."""
+
+from homeassistant.components.recorder.bloom_filter import MIN_CAPACITY, HashBloomFilter
+from homeassistant.components.recorder.db_schema import StateAttributes
+
+
+def _hashes(start: int, count: int) -> list[int]:
+    """Return the hashes of count shared attributes."""
+    return [
+        StateAttributes.hash_shared_attrs_bytes(f'{{"idx":{idx}}}'.encode())
+        for idx in range(start, start + count)
+    ]
+
+
+def test_no_false_negatives() -> None:
+    """Test hashes added to the filter are always found."""
+    hashes = _hashes(0, 1000)
+    hash_filter = HashBloomFilter(500)
+    hash_filter.update(hashes[:500])
+    for hash_ in hashes[500:]:
+        hash_filter.add(hash_)
+    assert all(hash_ in hash_filter for hash_ in hashes)
+    assert hash_filter.count == 1000
+
+
+def test_false_positive_rate() -> None:
+    """Test few hashes that were not added are found."""
+    hash_filter = HashBloomFilter(MIN_CAPACITY)
+    hash_filter.update(_hashes(0, MIN_CAPACITY))
+    false_positives = sum(
+        hash_ in hash_filter for hash_ in _hashes(MIN_CAPACITY, 10000)
+    )
+    assert false_positives < 300
+
+
+def test_grow() -> None:
+    """Test the filter adds a layer once it holds its capacity."""
+    hash_filter = HashBloomFilter(MIN_CAPACITY)
+    assert hash_filter.capacity == MIN_CAPACITY * 2
+    hashes = _hashes(0, MIN_CAPACITY * 2 + 1)
+    hash_filter.update(hashes[:-1])
+    assert hash_filter.layers == 1
+
+    hash_filter.add(hashes[-1])
+    assert hash_filter.layers == 2
+    assert hash_filter.capacity == MIN_CAPACITY * 6
+    assert hash_filter.count == MIN_CAPACITY * 2 + 1
+    assert all(hash_ in hash_filter for hash_ in hashes)
@@ -15,6 +15,7 @@ from freezegun.api import FrozenDateTimeFactory
 import pytest
 from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from sqlalchemy.pool import QueuePool
+import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.lock import LockState
@@ -22,6 +23,7 @@ from homeassistant.components.recorder import (
     CONF_AUTO_PURGE,
     CONF_AUTO_REPACK,
     CONF_COMMIT_INTERVAL,
+    CONF_CONTINUOUS_PURGE,
     CONF_DB_MAX_RETRIES,
     CONF_DB_RETRY_WAIT,
     CONF_DB_URL,
@@ -394,19 +396,14 @@ async def test_saving_state_with_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
-
     with (
         patch("time.sleep"),
         patch.object(
-            get_instance(hass).event_session,
-            "flush",
-            side_effect=_throw_if_state_in_session,
+            get_instance(hass).states_manager,
+            "write_pending",
+            side_effect=OperationalError(
+                "insert the state", "fake params", "forced to fail"
+            ),
         ),
     ):
         hass.states.async_set(entity_id, "fail", attributes)
@@ -437,19 +434,14 @@ async def test_saving_state_with_sqlalchemy_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
-
     with (
         patch("time.sleep"),
         patch.object(
-            get_instance(hass).event_session,
-            "flush",
-            side_effect=_throw_if_state_in_session,
+            get_instance(hass).states_manager,
+            "write_pending",
+            side_effect=SQLAlchemyError(
+                "insert the state", "fake params", "forced to fail"
+            ),
         ),
     ):
         hass.states.async_set(entity_id, "fail", attributes)
@@ -580,6 +572,68 @@ async def test_saving_state_with_commit_interval_zero(
         assert db_states[0].event_id is None
 
 
+async def test_saving_state_with_adaptive_commit_interval(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test states are committed when the batch of the adaptive interval is full."""
+    await async_setup_recorder_instance(
+        hass, {"commit_interval": 60, "commit_min_interval": 30}
+    )
+    instance = get_instance(hass)
+    assert instance.effective_commit_interval == 30
+
+    class ProcessedTask(recorder.tasks.RecorderTask):
+        """Task to wait until the events before it are processed."""
+
+        commit_before = False
+
+        def __init__(self) -> None:
+            self.processed = asyncio.Event()
+
+        def run(self, instance: Recorder) -> None:
+            hass.loop.call_soon_threadsafe(self.processed.set)
+
+    async def _async_wait_processed() -> None:
+        await hass.async_block_till_done()
+        task = ProcessedTask()
+        instance.queue_task(task)
+        await task.processed.wait()
+
+    await async_wait_recording_done(hass)
+    with patch(
+        "homeassistant.components.recorder.adaptive_commit.ADAPTIVE_COMMIT_MAX_PENDING_ROWS",
+        3,
+    ):
+        hass.states.async_set("test.one", "on")
+        hass.states.async_set("test.two", "on")
+        await _async_wait_processed()
+        assert instance._event_session_has_pending_writes
+
+        hass.bus.async_fire("test_event")
+        await _async_wait_processed()
+        assert not instance._event_session_has_pending_writes
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.query(States).count() == 2
+    assert 30 <= instance.effective_commit_interval <= 60
+
+
+async def test_commit_min_interval_greater_than_commit_interval(
+    hass: HomeAssistant,
+) -> None:
+    """Test the adaptive commit interval bounds are validated."""
+    with pytest.raises(vol.Invalid):
+        recorder.CONFIG_SCHEMA(
+            {
+                recorder.DOMAIN: {
+                    recorder.CONF_COMMIT_INTERVAL: 5,
+                    recorder.CONF_COMMIT_MIN_INTERVAL: 10,
+                }
+            }
+        )
+
+
 async def _add_entities(hass: HomeAssistant, entity_ids: list[str]) -> list[State]:
     """Add entities."""
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
@@ -1257,6 +1311,65 @@ async def test_auto_purge_disabled(
         periodic_db_cleanups.reset_mock()
 
 
+async def test_continuous_purge(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test the incremental purge is scheduled every five minutes."""
+    instance = await async_setup_recorder_instance(hass, {CONF_CONTINUOUS_PURGE: True})
+    now = dt_util.utcnow()
+    test_time = datetime(now.year + 2, 1, 1, 4, 0, 10, tzinfo=dt_util.UTC)
+    await run_tasks_at_time(hass, test_time)
+
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data_incrementally",
+        side_effect=[False, True, True],
+    ) as purge_old_data_incrementally:
+        # The purge is queued again until it finished
+        test_time = test_time + timedelta(minutes=5)
+        await run_tasks_at_time(hass, test_time)
+        await async_recorder_block_till_done(hass)
+        assert len(purge_old_data_incrementally.mock_calls) == 2
+        assert not instance.incremental_purge_pending
+
+        test_time = test_time + timedelta(minutes=5)
+        await run_tasks_at_time(hass, test_time)
+        assert len(purge_old_data_incrementally.mock_calls) == 3
+
+        # Nothing is queued while a purge is pending
+        instance.incremental_purge_pending = True
+        test_time = test_time + timedelta(minutes=5)
+        await run_tasks_at_time(hass, test_time)
+        assert len(purge_old_data_incrementally.mock_calls) == 3
+
+
+async def test_continuous_purge_after_error(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test the incremental purge is scheduled again after it raised."""
+    instance = await async_setup_recorder_instance(hass, {CONF_CONTINUOUS_PURGE: True})
+    now = dt_util.utcnow()
+    test_time = datetime(now.year + 2, 1, 1, 4, 0, 10, tzinfo=dt_util.UTC)
+    await run_tasks_at_time(hass, test_time)
+
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data_incrementally",
+        side_effect=[SQLAlchemyError("boom"), True],
+    ) as purge_old_data_incrementally:
+        test_time = test_time + timedelta(minutes=5)
+        await run_tasks_at_time(hass, test_time)
+        await async_recorder_block_till_done(hass)
+        assert len(purge_old_data_incrementally.mock_calls) == 1
+        assert not instance.incremental_purge_pending
+
+        test_time = test_time + timedelta(minutes=5)
+        await run_tasks_at_time(hass, test_time)
+        await async_recorder_block_till_done(hass)
+        assert len(purge_old_data_incrementally.mock_calls) == 2
+        assert not instance.incremental_purge_pending
+
+
 @pytest.mark.parametrize("enable_statistics", [True])
 async def test_auto_statistics(
     hass: HomeAssistant,
@@ -1468,6 +1581,87 @@ async def test_saving_sets_old_state(hass: HomeAssistant, setup_recorder: None)
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+@pytest.mark.parametrize("executemany_returning", [True, False])
+async def test_saving_chained_states_in_one_commit(
+    hass: HomeAssistant, setup_recorder: None, executemany_returning: bool
+) -> None:
+    """Test states written in bulk link to the old states written with them."""
+    instance = get_instance(hass)
+    await async_wait_recording_done(hass)
+    hass.states.async_set("test.one", "s1", {"attr": 1})
+    await async_wait_recording_done(hass)
+
+    with patch.dict(
+        instance.__dict__, {"_executemany_returning_sorted": executemany_returning}
+    ):
+        hass.states.async_set("test.one", "s2", {"attr": 2})
+        hass.states.async_set("test.two", "s3", {"attr": 2})
+        hass.states.async_set("test.one", "s4", {"attr": 2})
+        hass.states.async_set("test.one", "s4", {"attr": 2}, force_update=True)
+        hass.states.async_set("test.one", "s5", {"attr": 3})
+        hass.bus.async_fire("test_event", {"data": 1})
+        hass.bus.async_fire("test_event")
+        await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                States.last_reported_ts,
+                States.last_updated_ts,
+                StateAttributes.shared_attrs,
+            )
+            .outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .outerjoin(
+                StateAttributes, States.attributes_id == StateAttributes.attributes_id
+            )
+            .order_by(States.state_id)
+        )
+        assert [(state.entity_id, state.state) for state in states] == [
+            ("test.one", "s1"),
+            ("test.one", "s2"),
+            ("test.two", "s3"),
+            ("test.one", "s4"),
+            ("test.one", "s4"),
+            ("test.one", "s5"),
+        ]
+        assert [state.shared_attrs for state in states] == [
+            '{"attr":1}',
+            '{"attr":2}',
+            '{"attr":2}',
+            '{"attr":2}',
+            '{"attr":2}',
+            '{"attr":3}',
+        ]
+        state_ids = [state.state_id for state in states]
+        assert [state.old_state_id for state in states] == [
+            None,
+            state_ids[0],
+            None,
+            state_ids[1],
+            state_ids[3],
+            state_ids[4],
+        ]
+
+        events = list(
+            session.query(Events.event_id, EventTypes.event_type, EventData.shared_data)
+            .outerjoin(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .outerjoin(EventData, Events.data_id == EventData.data_id)
+            .filter(EventTypes.event_type == "test_event")
+            .order_by(Events.event_id)
+        )
+        assert [(event.event_type, event.shared_data) for event in events] == [
+            ("test_event", '{"data":1}'),
+            ("test_event", None),
+        ]
+
+    assert instance.states_manager.pop_committed("test.one") == state_ids[5]
+    assert instance.states_manager.pop_committed("test.two") == state_ids[2]
+
+
 async def test_saving_state_with_serializable_data(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture, setup_recorder: None
 ) -> None:
@@ -91,6 +91,34 @@ def test_from_event_to_db_state_attributes() -> None:
     assert db_attrs.to_native() == attrs
 
 
+def test_from_event_to_db_state_attributes_reuses_state_json() -> None:
+    """Test the attributes JSON of the state is reused if nothing is excluded."""
+    state = ha.State("sensor.temperature", "18", {"this_attr": True})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    for dialect in (SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL):
+        assert (
+            StateAttributes.shared_attrs_bytes_from_event(event, dialect)
+            is state.attributes_json
+        )
+
+    state = ha.State(
+        "sensor.temperature", "18", {"this_attr": True, "attribution": "excluded"}
+    )
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+        context=state.context,
+    )
+    shared_attrs = StateAttributes.shared_attrs_bytes_from_event(
+        event, SupportedDialect.MYSQL
+    )
+    assert json_loads(shared_attrs) == {"this_attr": True}
+
+
 def test_from_event_to_db_state_attributes_with_null() -> None:
     """Test converting a state to StateAttributes with a null with PostgreSQL."""
     attrs = {"this_attr": "withnull\0terminator"}
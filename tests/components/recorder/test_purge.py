@@ -12,11 +12,18 @@ from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
 
-from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
+from homeassistant.components.recorder import (
+    DOMAIN as RECORDER_DOMAIN,
+    Recorder,
+    migration,
+)
 from homeassistant.components.recorder.const import SupportedDialect
 from homeassistant.components.recorder.db_schema import (
+    SCHEMA_VERSION,
+    EventData,
     Events,
     EventTypes,
+    MigrationChanges,
     RecorderRuns,
     StateAttributes,
     States,
@@ -25,7 +32,10 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    purge_old_data,
+    purge_old_data_incrementally,
+)
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -110,6 +120,38 @@ async def test_purge_big_database(hass: HomeAssistant, recorder_mock: Recorder)
             assert state_attributes.count() == 1
 
 
+async def test_purge_old_data_incrementally(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test purging old states in time budgeted batches."""
+    for _ in range(12):
+        await _add_test_states(hass, wait_recording_done=False)
+    await async_wait_recording_done(hass)
+
+    with (
+        patch.object(recorder_mock, "max_bind_vars", 12),
+        patch.object(recorder_mock.database_engine, "max_bind_vars", 12),
+    ):
+        with session_scope(hass=hass) as session:
+            states_count = session.query(States).count()
+            state_attributes_count = session.query(StateAttributes).count()
+
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+
+        # A single batch is purged when the time budget is spent
+        assert not purge_old_data_incrementally(
+            recorder_mock, purge_before, time_budget=0
+        )
+        with session_scope(hass=hass) as session:
+            assert session.query(States).count() == states_count - 12
+            assert session.query(StateAttributes).count() == state_attributes_count
+
+        assert purge_old_data_incrementally(recorder_mock, purge_before)
+        with session_scope(hass=hass) as session:
+            assert session.query(States).count() == states_count - 48
+            assert session.query(StateAttributes).count() == state_attributes_count - 2
+
+
 async def test_purge_old_states(hass: HomeAssistant, recorder_mock: Recorder) -> None:
     """Test deleting old states."""
     await _add_test_states(hass)
@@ -342,6 +384,127 @@ async def test_purge_old_events(hass: HomeAssistant, recorder_mock: Recorder) ->
         assert events.count() == 2
 
 
+async def test_purge_old_states_with_reference_counts(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test unused attributes are found by their reference count."""
+    await _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        ref_counts = dict(
+            session.query(StateAttributes.attributes_id, StateAttributes.ref_count)
+        )
+        states_per_attributes_id: dict[int, int] = {}
+        for (attributes_id,) in session.query(States.attributes_id):
+            states_per_attributes_id[attributes_id] = (
+                states_per_attributes_id.get(attributes_id, 0) + 1
+            )
+        assert ref_counts == states_per_attributes_id
+        assert sorted(ref_counts.values()) == [2, 2, 2]
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with (
+        patch(
+            "homeassistant.components.recorder.purge.attributes_ids_exist_in_states_with_fast_in_distinct"
+        ) as fast_in_distinct,
+        patch(
+            "homeassistant.components.recorder.purge.attributes_ids_exist_in_states"
+        ) as exist_in_states,
+    ):
+        assert purge_old_data(
+            recorder_mock,
+            purge_before,
+            repack=False,
+            states_batch_size=20,
+            events_batch_size=20,
+        )
+    assert not fast_in_distinct.called
+    assert not exist_in_states.called
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+        assert [
+            ref_count for (ref_count,) in session.query(StateAttributes.ref_count)
+        ] == [2]
+
+
+async def test_purge_old_states_after_counting_references(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the references of rows written before they were counted are backfilled."""
+    await _add_test_states(hass)
+
+    with session_scope(hass=hass) as session:
+        session.query(StateAttributes).update({StateAttributes.ref_count: None})
+
+    migrator = migration.StateAttributesRefCountMigration(SCHEMA_VERSION, {})
+    recorder_mock.queue_task(migration.CommitBeforeMigrationTask(migrator))
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert sorted(
+            ref_count for (ref_count,) in session.query(StateAttributes.ref_count)
+        ) == [2, 2, 2]
+        assert session.get(MigrationChanges, migrator.migration_id)
+
+    with patch(
+        "homeassistant.components.recorder.purge.attributes_ids_exist_in_states"
+    ) as exist_in_states:
+        assert purge_old_data(
+            recorder_mock,
+            dt_util.utcnow() - timedelta(days=4),
+            repack=False,
+            states_batch_size=20,
+            events_batch_size=20,
+        )
+    assert not exist_in_states.called
+
+    with session_scope(hass=hass) as session:
+        assert [
+            ref_count for (ref_count,) in session.query(StateAttributes.ref_count)
+        ] == [2]
+
+
+async def test_purge_old_events_with_reference_counts(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test unused event data is found by its reference count."""
+    await _add_test_events(hass)
+
+    def _ref_counts() -> list[int]:
+        with session_scope(hass=hass) as session:
+            return [
+                ref_count
+                for (ref_count,) in session.query(EventData.ref_count).filter(
+                    EventData.shared_data == '{"test_attr":5,"test_attr_10":"nice"}'
+                )
+            ]
+
+    assert _ref_counts() == [6]
+
+    with patch(
+        "homeassistant.components.recorder.purge.data_ids_exist_in_events_with_fast_in_distinct"
+    ) as fast_in_distinct:
+        purge_old_data(
+            recorder_mock,
+            dt_util.utcnow() - timedelta(days=4),
+            repack=False,
+            states_batch_size=20,
+            events_batch_size=20,
+        )
+        assert _ref_counts() == [2]
+
+        purge_old_data(
+            recorder_mock,
+            dt_util.utcnow() + timedelta(days=1),
+            repack=False,
+            states_batch_size=20,
+            events_batch_size=20,
+        )
+        assert _ref_counts() == []
+    assert not fast_in_distinct.called
+
+
 async def test_purge_old_recorder_runs(
     hass: HomeAssistant, recorder_mock: Recorder
 ) -> None:
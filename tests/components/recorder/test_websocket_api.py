@@ -2534,6 +2534,7 @@ async def test_recorder_info(
     assert response["success"]
     assert response["result"] == {
         "backlog": 0,
+        "commit_interval": 0,
         "max_backlog": 65000,
         "migration_in_progress": False,
         "migration_is_live": False,
@@ -146,6 +146,110 @@ async def test_icon_template(hass: HomeAssistant) -> None:
     assert hass.states.get(TEST_NAME).attributes["icon"] == "mdi:check"
 
 
+@pytest.mark.parametrize(("count", "domain"), [(1, sensor.DOMAIN)])
+@pytest.mark.parametrize(
+    "config",
+    [
+        {
+            "sensor": {
+                "platform": "template",
+                "sensors": {
+                    "test_template_sensor": {
+                        "value_template": "{{ 'It works' }}",
+                        "icon_template": "{{ states('sensor.test_icon') }}",
+                    }
+                },
+            },
+        },
+    ],
+)
+@pytest.mark.usefixtures("start_ha")
+async def test_unchanged_template_values_do_not_write_state(
+    hass: HomeAssistant,
+) -> None:
+    """Test template updates that change no template value do not write state."""
+    entity = hass.data[sensor.DATA_COMPONENT].get_entity(TEST_NAME)
+    hass.states.async_set("sensor.test_icon", "mdi:check")
+    await hass.async_block_till_done()
+    state = hass.states.get(TEST_NAME)
+    assert state.attributes["icon"] == "mdi:check"
+    assert entity.suppressed_write_count == 0
+
+    # Invalid icons are stored as None
+    hass.states.async_set("sensor.test_icon", "invalid")
+    await hass.async_block_till_done()
+    state = hass.states.get(TEST_NAME)
+    assert "icon" not in state.attributes
+    assert entity.suppressed_write_count == 0
+
+    with patch.object(entity, "_async_calculate_state") as calculate_state:
+        hass.states.async_set("sensor.test_icon", "also_invalid")
+        await hass.async_block_till_done()
+    assert not calculate_state.called
+    assert hass.states.get(TEST_NAME) is state
+    assert entity.suppressed_write_count == 1
+
+    # Updates are written if something else wrote the state
+    entity._attr_icon = "mdi:other"
+    entity.async_write_ha_state()
+    assert hass.states.get(TEST_NAME).attributes["icon"] == "mdi:other"
+    hass.states.async_set("sensor.test_icon", "still_invalid")
+    await hass.async_block_till_done()
+    assert "icon" not in hass.states.get(TEST_NAME).attributes
+    assert entity.suppressed_write_count == 1
+
+
+@pytest.mark.parametrize(("count", "domain"), [(1, sensor.DOMAIN)])
+@pytest.mark.parametrize(
+    "config",
+    [
+        {
+            "sensor": {
+                "platform": "template",
+                "sensors": {
+                    "test_template_sensor": {
+                        "value_template": "{{ 'It works' }}",
+                        "availability_template": "{{ is_state('sensor.available', 'on') }}",
+                        "attribute_templates": {
+                            "test_attribute": "{{ states('sensor.attribute') }}"
+                        },
+                    }
+                },
+            },
+        },
+    ],
+)
+@pytest.mark.usefixtures("start_ha")
+async def test_changed_availability_or_attribute_writes_state(
+    hass: HomeAssistant,
+) -> None:
+    """Test changes of other templates are written while the state is unchanged."""
+    entity = hass.data[sensor.DATA_COMPONENT].get_entity(TEST_NAME)
+    hass.states.async_set("sensor.available", "on")
+    hass.states.async_set("sensor.attribute", "first")
+    await hass.async_block_till_done()
+    state = hass.states.get(TEST_NAME)
+    assert state.state == "It works"
+    assert state.attributes["test_attribute"] == "first"
+
+    hass.states.async_set("sensor.attribute", "second")
+    await hass.async_block_till_done()
+    state = hass.states.get(TEST_NAME)
+    assert state.state == "It works"
+    assert state.attributes["test_attribute"] == "second"
+
+    hass.states.async_set("sensor.available", "off")
+    await hass.async_block_till_done()
+    assert hass.states.get(TEST_NAME).state == STATE_UNAVAILABLE
+
+    hass.states.async_set("sensor.available", "on")
+    await hass.async_block_till_done()
+    state = hass.states.get(TEST_NAME)
+    assert state.state == "It works"
+    assert state.attributes["test_attribute"] == "second"
+    assert entity.suppressed_write_count == 0
+
+
 @pytest.mark.parametrize(("count", "domain"), [(1, sensor.DOMAIN)])
 @pytest.mark.parametrize(
     "config",
@@ -134,7 +134,7 @@ async def _setup(
             _enable_entity(hass, CC_SENSOR_ENTITY_ID.format(entity_name))
         await hass.async_block_till_done()
         # the enabled entity state will be fired in RELOAD_AFTER_UPDATE_DELAY
-        frozen_time.tick(delta=RELOAD_AFTER_UPDATE_DELAY)
+        frozen_time.tick(delta=RELOAD_AFTER_UPDATE_DELAY + 1)
         async_fire_time_changed(hass)
         await hass.async_block_till_done()
         assert len(hass.states.async_entity_ids(SENSOR_DOMAIN)) == len(sensors)
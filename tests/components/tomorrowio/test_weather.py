@@ -106,7 +106,7 @@ async def _setup_legacy(hass: HomeAssistant, config: dict[str, Any]) -> State:
             _enable_entity(hass, f"weather.tomorrow_io_{entity_name}")
         await hass.async_block_till_done()
         # the enabled entity state will be fired in RELOAD_AFTER_UPDATE_DELAY
-        frozen_time.tick(delta=RELOAD_AFTER_UPDATE_DELAY)
+        frozen_time.tick(delta=RELOAD_AFTER_UPDATE_DELAY + 1)
         async_fire_time_changed(hass)
         await hass.async_block_till_done()
         assert len(hass.states.async_entity_ids(WEATHER_DOMAIN)) == 3
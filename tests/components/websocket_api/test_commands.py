@@ -1359,6 +1359,55 @@ async def test_render_template_renders_template(
     }
 
 
+async def test_template_stats(hass: HomeAssistant, websocket_client) -> None:
+    """Test the render statistics of tracked templates."""
+    hass.states.async_set("light.test", "on")
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "render_template",
+            "template": "State is: {{ states('light.test') }}",
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "event"
+
+    hass.states.async_set("light.test", "off")
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "event"
+
+    await websocket_client.send_json({"id": 6, "type": "template/stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert len(msg["result"]) == 1
+    stats = msg["result"][0]
+    assert stats["template"] == "State is: {{ states('light.test') }}"
+    assert stats["renders"] == 3
+    assert stats["triggers"] == 1
+    assert stats["budget_rate_limit"] is None
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "template/set_render_budget", "render_budget": 0.5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "template/set_render_budget", "render_budget": -1}
+    )
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
+    await websocket_client.send_json(
+        {"id": 9, "type": "template/set_render_budget", "render_budget": None}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+
 async def test_render_template_with_timeout_and_variables(
     hass: HomeAssistant, websocket_client
 ) -> None:
@@ -6,10 +6,12 @@ from homeassistant.components.websocket_api.messages import (
     _partial_cached_event_message as lru_event_cache,
     _state_diff_event,
     cached_event_message,
+    cached_state_diff_message,
     message_to_json_bytes,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import Context, Event, HomeAssistant, State, callback
+from homeassistant.helpers.json import json_bytes, json_loads
 
 from tests.common import async_capture_events
 
@@ -83,6 +85,23 @@ async def test_cached_event_message_with_different_idens(hass: HomeAssistant) ->
     assert cache_info.currsize == 1
 
 
+async def test_cached_state_diff_message_added_state(hass: HomeAssistant) -> None:
+    """Test the message for an added state uses the compressed state JSON."""
+    state_change_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    hass.states.async_set("light.window", "on", {"brightness": 128})
+    await hass.async_block_till_done()
+
+    event = state_change_events[-1]
+    new_state: State = event.data["new_state"]
+    message = json_loads(cached_state_diff_message(b"5", event))
+    assert message == {
+        "id": 5,
+        "type": "event",
+        "event": json_loads(json_bytes(_state_diff_event(event))),
+    }
+    assert "attributes_json" in new_state._cache
+
+
 async def test_state_diff_event(hass: HomeAssistant) -> None:
     """Test building state_diff_message."""
     state_change_events = async_capture_events(hass, EVENT_STATE_CHANGED)
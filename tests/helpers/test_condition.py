@@ -18,7 +18,7 @@ from homeassistant.const import (
     SUN_EVENT_SUNRISE,
     SUN_EVENT_SUNSET,
 )
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, StateMachine
 from homeassistant.exceptions import ConditionError, HomeAssistantError
 from homeassistant.helpers import (
     condition,
@@ -1393,6 +1393,46 @@ async def test_state_entity_registry_id(
     assert not test(hass)
 
 
+async def test_state_multiple_entities_shared_references(
+    hass: HomeAssistant,
+) -> None:
+    """Test entities of a state condition share the referenced entities."""
+    hass.states.async_set("input_select.wanted", "on")
+    config = {
+        "condition": "state",
+        "entity_id": ["light.kitchen", "light.living_room"],
+        "state": ["input_select.wanted", "dim"],
+    }
+    config = cv.CONDITION_SCHEMA(config)
+    config = await condition.async_validate_condition_config(hass, config)
+    test = await condition.async_from_config(hass, config)
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.living_room", "dim")
+    with patch.object(
+        StateMachine, "get", autospec=True, side_effect=StateMachine.get
+    ) as mock_get:
+        assert test(hass)
+    assert [call.args[1] for call in mock_get.call_args_list] == [
+        "light.kitchen",
+        "input_select.wanted",
+        "light.living_room",
+    ]
+    trace.trace_clear()
+
+    hass.states.async_set("input_select.wanted", "dim")
+    hass.states.async_set("light.kitchen", "off")
+    assert not test(hass)
+    assert_condition_trace(
+        {
+            "": [{"result": {"result": False}}],
+            "entity_id/0": [
+                {"result": {"result": False, "state": "off", "wanted_state": "dim"}}
+            ],
+        }
+    )
+
+
 async def test_state_using_input_entities(hass: HomeAssistant) -> None:
     """Test state conditions using input_* entities."""
     await async_setup_component(
@@ -1806,6 +1846,71 @@ async def test_numeric_state_using_input_number(hass: HomeAssistant) -> None:
         )
 
 
+async def test_numeric_state_multiple_entities_shared_limits(
+    hass: HomeAssistant,
+) -> None:
+    """Test entities of a numeric_state condition share the limit entities."""
+    hass.states.async_set("number.low", 10)
+    hass.states.async_set("number.high", 100)
+    config = {
+        "condition": "numeric_state",
+        "entity_id": ["sensor.temperature_1", "sensor.temperature_2"],
+        "value_template": "{{ state.state | float + offset }}",
+        "below": "number.high",
+        "above": "number.low",
+    }
+    config = cv.CONDITION_SCHEMA(config)
+    config = await condition.async_validate_condition_config(hass, config)
+    test = await condition.async_from_config(hass, config)
+
+    hass.states.async_set("sensor.temperature_1", 42)
+    hass.states.async_set("sensor.temperature_2", 50)
+    variables = {"offset": 5}
+    with patch.object(
+        StateMachine, "get", autospec=True, side_effect=StateMachine.get
+    ) as mock_get:
+        assert test(hass, variables)
+    assert [call.args[1] for call in mock_get.call_args_list] == [
+        "sensor.temperature_1",
+        "number.high",
+        "number.low",
+        "sensor.temperature_2",
+    ]
+    assert variables == {"offset": 5}
+    assert_condition_trace(
+        {
+            "": [{"result": {"result": True}}],
+            "entity_id/0": [{"result": {"result": True, "state": 47.0}}],
+            "entity_id/1": [{"result": {"result": True, "state": 55.0}}],
+        }
+    )
+
+    hass.states.async_set("sensor.temperature_2", 96)
+    assert not test(hass, variables)
+    assert_condition_trace(
+        {
+            "": [{"result": {"result": False}}],
+            "entity_id/0": [{"result": {"result": True, "state": 47.0}}],
+            "entity_id/1": [
+                {
+                    "result": {
+                        "result": False,
+                        "state": 101.0,
+                        "wanted_state_below": 100.0,
+                    }
+                }
+            ],
+        }
+    )
+
+    hass.states.async_set("number.high", "unavailable")
+    assert not test(hass, variables)
+
+    hass.states.async_set("number.high", "hot")
+    with pytest.raises(ConditionError, match="cannot be processed as a number"):
+        test(hass, variables)
+
+
 async def test_zone_raises(hass: HomeAssistant) -> None:
     """Test that zone raises ConditionError on errors."""
     config = {
@@ -12,9 +12,17 @@ from syrupy.assertion import SnapshotAssertion
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, PERCENTAGE, EntityCategory
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_STATE_CHANGED,
+    PERCENTAGE,
+    STATE_UNKNOWN,
+    EntityCategory,
+)
 from homeassistant.core import (
     CoreState,
+    Event,
+    EventStateChangedData,
     HomeAssistant,
     ServiceCall,
     ServiceResponse,
@@ -599,6 +607,53 @@ async def test_async_remove_with_platform(hass: HomeAssistant) -> None:
     assert len(hass.states.async_entity_ids()) == 0
 
 
+async def test_async_write_ha_states(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test writing the state of multiple entities of a platform at once."""
+    entity_platform = MockEntityPlatform(hass)
+    entity1 = MockEntity(name="test_1")
+    entity2 = MockEntity(name="test_2")
+    entity3 = MockEntity(name="test_3")
+    await entity_platform.async_add_entities([entity1, entity2, entity3])
+
+    seen_states = []
+
+    @callback
+    def _listener(event: Event[EventStateChangedData]) -> None:
+        """Record the state machine contents when an event fires."""
+        seen_states.append(
+            tuple(
+                hass.states.get(entity.entity_id).state
+                for entity in (entity1, entity2, entity3)
+            )
+        )
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _listener)
+
+    entity1._attr_state = "off"
+    entity2._attr_state = "x" * 256
+    entity3._attr_state = "off"
+    entity_platform.async_write_ha_states()
+    await hass.async_block_till_done()
+
+    assert seen_states == [
+        ("off", STATE_UNKNOWN, "off"),
+        ("off", STATE_UNKNOWN, "off"),
+        ("off", STATE_UNKNOWN, "off"),
+    ]
+    assert (
+        f"Failed to set state for {entity2.entity_id}, fall back to {STATE_UNKNOWN}"
+        in caplog.text
+    )
+
+    seen_states.clear()
+    entity3._attr_state = "on"
+    entity_platform.async_write_ha_states([entity3])
+    await hass.async_block_till_done()
+    assert seen_states == [("off", STATE_UNKNOWN, "on")]
+
+
 async def test_async_remove_with_platform_update_finishes(hass: HomeAssistant) -> None:
     """Remove an entity when an update finishes after its been removed."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
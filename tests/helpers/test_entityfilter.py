@@ -479,3 +479,46 @@ def test_complex_include_exclude_filter() -> None:
     }
     filt: EntityFilter = INCLUDE_EXCLUDE_FILTER_SCHEMA(conf)
     assert filt("switch.espresso_keuken") is True
+
+
+def test_identical_filters_share_compiled_filter() -> None:
+    """Test filters with an identical config share their filter function."""
+    conf = {
+        "include": {"domains": ["light"], "entity_globs": ["sensor.*_temperature"]},
+        "exclude": {"entities": ["light.excluded"]},
+    }
+    filt: EntityFilter = INCLUDE_EXCLUDE_FILTER_SCHEMA(conf)
+    same_filt: EntityFilter = INCLUDE_EXCLUDE_FILTER_SCHEMA(conf)
+    other_filt: EntityFilter = INCLUDE_EXCLUDE_FILTER_SCHEMA(
+        {**conf, "exclude": {"entities": ["light.other"]}}
+    )
+    assert filt.get_filter() is same_filt.get_filter()
+    assert other_filt.get_filter() is not filt.get_filter()
+    assert (
+        generate_filter(["light"], [], [], ["light.excluded"], ["sensor.*_temperature"])
+        is filt.get_filter()
+    )
+
+    assert filt("light.excluded") is False
+    assert other_filt("light.excluded") is True
+
+
+def test_filter_entity_ids() -> None:
+    """Test filtering a batch of entity ids."""
+    filt: EntityFilter = FILTER_SCHEMA(
+        {
+            "include_domains": ["light"],
+            "include_entity_globs": ["sensor.*_temperature"],
+            "exclude_entities": ["light.excluded"],
+        }
+    )
+    assert filt.filter_entity_ids(
+        [
+            "light.kitchen",
+            "light.excluded",
+            "sensor.outside_temperature",
+            "sensor.outside_humidity",
+            "switch.kitchen",
+        ]
+    ) == ["light.kitchen", "sensor.outside_temperature"]
+    assert filt.filter_entity_ids([]) == []
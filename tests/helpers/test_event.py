@@ -4,6 +4,8 @@ import asyncio
 from collections.abc import Callable
 import contextlib
 from datetime import date, datetime, timedelta
+import time
+from typing import Any
 from unittest.mock import patch
 
 from astral import LocationInfo
@@ -16,6 +18,7 @@ import pytest
 from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import (
+    CALLBACK_TYPE,
     Event,
     EventStateChangedData,
     EventStateReportedData,
@@ -26,10 +29,20 @@ from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    _TEMPLATE_RENDER_BUDGET,
+    _TIMER_WHEEL,
+    _TIMER_WHEEL_SLOTS,
+    _TRACK_STATE_CHANGE_DATA,
+    COARSE_TIMER_RESOLUTION,
+    TEMPLATE_RENDER_BUDGET_STORAGE_KEY,
+    TEMPLATE_RENDER_BUDGET_WINDOW,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_load_template_render_budget,
+    async_set_template_render_budget,
+    async_template_render_stats,
     async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
@@ -537,6 +550,56 @@ async def test_async_track_state_change_event(hass: HomeAssistant) -> None:
     unsub_throws()
 
 
+async def test_async_track_state_change_event_with_event_filter(
+    hass: HomeAssistant,
+) -> None:
+    """Test async_track_state_change_event only dispatches filtered changes."""
+    filtered_calls: list[str] = []
+    unfiltered_calls: list[str] = []
+
+    @ha.callback
+    def filtered_callback(event: Event[EventStateChangedData]) -> None:
+        filtered_calls.append(event.data["new_state"].state)
+
+    @ha.callback
+    def unfiltered_callback(event: Event[EventStateChangedData]) -> None:
+        unfiltered_calls.append(event.data["new_state"].state)
+
+    @ha.callback
+    def to_on(event_data: EventStateChangedData) -> bool:
+        return event_data["new_state"].state == "on"
+
+    unsub_filtered = async_track_state_change_event(
+        hass, "light.kitchen", filtered_callback, event_filter=to_on
+    )
+    hass.states.async_set("light.kitchen", "off")
+    with patch.object(hass.loop, "call_soon", wraps=hass.loop.call_soon) as call_soon:
+        hass.states.async_set("light.kitchen", "dim")
+    # The state change is not dispatched at all
+    assert not call_soon.call_count
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    assert filtered_calls == ["on"]
+
+    unsub_unfiltered = async_track_state_change_event(
+        hass, "light.kitchen", unfiltered_callback
+    )
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    assert filtered_calls == ["on", "on"]
+    assert unfiltered_calls == ["off", "on"]
+
+    unsub_filtered()
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    assert filtered_calls == ["on", "on"]
+    assert unfiltered_calls == ["off", "on", "off", "on"]
+    unsub_unfiltered()
+    assert _TRACK_STATE_CHANGE_DATA not in hass.data
+
+
 async def test_async_track_state_change_event_with_empty_list(
     hass: HomeAssistant,
 ) -> None:
@@ -1959,6 +2022,220 @@ async def test_track_template_result_with_wildcard(hass: HomeAssistant) -> None:
     assert "cover.office_skylight=open" in specific_runs[0]
 
 
+async def test_track_template_result_only_rerenders_on_read_fields(
+    hass: HomeAssistant,
+) -> None:
+    """Test tracking template only re-renders when a field it read changes."""
+    hass.states.async_set("sensor.state", "1", {"rssi": -50})
+    hass.states.async_set("sensor.attr", "1", {"position": 1, "rssi": -50})
+    template_state = Template("{{ states('sensor.state') }}", hass)
+    template_attr = Template("{{ state_attr('sensor.attr', 'position') }}", hass)
+    runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.extend(update.result for update in updates)
+
+    with patch.object(
+        Template,
+        "async_render_to_info",
+        autospec=True,
+        side_effect=Template.async_render_to_info,
+    ) as mock_render:
+        async_track_template_result(
+            hass,
+            [
+                TrackTemplate(template_state, None),
+                TrackTemplate(template_attr, None),
+            ],
+            refresh_listener,
+        )
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 2
+
+        hass.states.async_set("sensor.state", "1", {"rssi": -60})
+        hass.states.async_set("sensor.attr", "2", {"position": 1, "rssi": -60})
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 2
+
+        hass.states.async_set("sensor.state", "2", {"rssi": -60})
+        hass.states.async_set("sensor.attr", "2", {"position": 2, "rssi": -60})
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 4
+        assert runs == [2, 2]
+
+        hass.states.async_remove("sensor.attr")
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 5
+        assert runs == [2, 2, None]
+
+
+async def test_track_template_result_rerenders_on_forced_last_changed(
+    hass: HomeAssistant,
+) -> None:
+    """Test templates reading last_changed re-render on forced updates."""
+    hass.states.async_set("sensor.forced", "1", {"rssi": -50})
+    template_changed = Template("{{ states.sensor.forced.last_changed }}", hass)
+    runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.extend(update.result for update in updates)
+
+    async_track_template_result(
+        hass, [TrackTemplate(template_changed, None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.forced", "1", {"rssi": -60})
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set("sensor.forced", "1", {"rssi": -60}, force_update=True)
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+
+
+async def test_track_template_result_shares_identical_renders(
+    hass: HomeAssistant,
+) -> None:
+    """Test identical templates tracked separately are rendered once per event."""
+    hass.states.async_set("sensor.one", "1")
+    template_str = "{{ states('sensor.one') | int + 1 }}"
+    runs: list[tuple[int, int]] = []
+
+    def _listener(idx: int) -> Callable[..., None]:
+        @ha.callback
+        def refresh_listener(
+            event: Event[EventStateChangedData] | None,
+            updates: list[TrackTemplateResult],
+        ) -> None:
+            runs.extend((idx, update.result) for update in updates)
+
+        return refresh_listener
+
+    with patch.object(
+        Template,
+        "async_render_to_info",
+        autospec=True,
+        side_effect=Template.async_render_to_info,
+    ) as mock_render:
+        infos = [
+            async_track_template_result(
+                hass,
+                [TrackTemplate(Template(template_str, hass), None)],
+                _listener(idx),
+            )
+            for idx in range(3)
+        ]
+        # Variables that differ are not shared
+        async_track_template_result(
+            hass,
+            [TrackTemplate(Template(template_str, hass), {"other": True})],
+            _listener(3),
+        )
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 4
+
+        hass.states.async_set("sensor.one", "2")
+        await hass.async_block_till_done()
+        assert mock_render.call_count == 6
+        assert runs == [(0, 3), (1, 3), (2, 3), (3, 3)]
+
+    # Only the tracker that rendered records the render
+    assert [
+        stats.renders for info in infos for stats in info.render_stats.values()
+    ] == [2, 1, 1]
+
+
+async def test_track_template_result_render_budget(hass: HomeAssistant) -> None:
+    """Test templates exceeding the render budget are rate limited."""
+    hass.states.async_set("sensor.one", "1")
+    template = Template("{{ states('sensor.one') }}", hass)
+    runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.extend(update.result for update in updates)
+
+    async_set_template_render_budget(hass, 0.05)
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+    stats = info.render_stats[template]
+    assert stats.renders == 1
+    assert stats.budget_rate_limit is None
+
+    # Pretend the template is slow so it exceeds the budget
+    stats.add_render(0.1, time.time(), 0.05)
+    assert stats.budget_rate_limit == pytest.approx(
+        stats.render_time / 2 * TEMPLATE_RENDER_BUDGET_WINDOW / 0.05
+    )
+
+    hass.states.async_set("sensor.one", "2")
+    await hass.async_block_till_done()
+    assert runs == [2]
+
+    # Referenced entities are rate limited while over budget
+    hass.states.async_set("sensor.one", "3")
+    await hass.async_block_till_done()
+    assert runs == [2]
+    assert stats.triggers == 2
+    assert stats.renders == 3
+
+    template_stats = async_template_render_stats(hass)
+    assert template_stats == [
+        {
+            "template": "{{ states('sensor.one') }}",
+            "triggers": 2,
+            "renders": 3,
+            "render_time_total_ms": round(stats.render_time * 1000, 3),
+            "render_time_mean_ms": round(stats.render_time * 1000 / 3, 3),
+            "render_time_p99_ms": 100.0,
+            "render_time_max_ms": 100.0,
+            "budget_rate_limit": stats.budget_rate_limit,
+        }
+    ]
+
+    info.async_remove()
+    assert async_template_render_stats(hass) == []
+    # The statistics are not kept by a removed tracker
+    assert not info.render_stats
+
+
+async def test_template_render_budget_is_stored(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the render budget is kept across restarts."""
+    async_set_template_render_budget(hass, 0.5)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass_storage[TEMPLATE_RENDER_BUDGET_STORAGE_KEY]["data"] == {
+        "render_budget": 0.5
+    }
+
+    # A new run loads the budget
+    hass.data.pop(_TEMPLATE_RENDER_BUDGET)
+    await async_load_template_render_budget(hass)
+    assert hass.data[_TEMPLATE_RENDER_BUDGET] == 0.5
+
+    async_set_template_render_budget(hass, None)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    await async_load_template_render_budget(hass)
+    assert _TEMPLATE_RENDER_BUDGET not in hass.data
+
+
 async def test_track_template_result_with_group(hass: HomeAssistant) -> None:
     """Test tracking template with a group."""
     hass.states.async_set("sensor.power_1", 0)
@@ -3887,6 +4164,110 @@ async def test_async_track_time_change(
     assert len(none_runs) == 3
 
 
+async def test_time_change_listeners_share_one_timer(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test time pattern listeners are dispatched from a single timer."""
+    runs: list[str] = []
+    unsubs: dict[str, CALLBACK_TYPE] = {}
+    now = dt_util.utcnow()
+
+    freezer.move_to(datetime(now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC))
+
+    def _listener(name: str) -> Callable[[datetime], None]:
+        @callback
+        def listener(now: datetime) -> None:
+            runs.append(name)
+            if name == "cancels_other":
+                unsubs.pop("cancelled")()
+
+        return listener
+
+    def _dispatcher_timers() -> int:
+        return sum(
+            not handle.cancelled() and "time pattern dispatcher" in repr(handle)
+            for handle in hass.loop._scheduled
+        )
+
+    unsubs["cancels_other"] = async_track_utc_time_change(
+        hass, _listener("cancels_other"), minute=0, second=0
+    )
+    unsubs["cancelled"] = async_track_utc_time_change(
+        hass, _listener("cancelled"), minute=0, second=0
+    )
+    unsubs["every_five"] = async_track_utc_time_change(
+        hass, _listener("every_five"), minute="/5", second=0
+    )
+    unsubs["hourly_later"] = async_track_utc_time_change(
+        hass, _listener("hourly_later"), minute=30, second=0
+    )
+    assert _dispatcher_timers() == 1
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert sorted(runs) == ["cancels_other", "every_five"]
+
+    runs.clear()
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 5, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert runs == ["every_five"]
+
+    runs.clear()
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 30, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert sorted(runs) == ["every_five", "hourly_later"]
+
+    for unsub in unsubs.values():
+        unsub()
+    # Cancelling twice does nothing
+    unsubs["every_five"]()
+    assert _dispatcher_timers() == 0
+
+
+async def test_time_change_listener_raising(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a raising time pattern listener does not stop the other listeners."""
+    runs: list[datetime] = []
+    now = dt_util.utcnow()
+
+    freezer.move_to(datetime(now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC))
+
+    @callback
+    def raising_listener(now: datetime) -> None:
+        raise ValueError("boom")
+
+    @callback
+    def listener(now: datetime) -> None:
+        runs.append(now)
+
+    unsub_raising = async_track_utc_time_change(
+        hass, raising_listener, minute="/5", second=0
+    )
+    unsub = async_track_utc_time_change(hass, listener, minute="/5", second=0)
+
+    for minute in (0, 5):
+        async_fire_time_changed(
+            hass,
+            datetime(now.year + 1, 5, 24, 12, minute, 0, 999999, tzinfo=dt_util.UTC),
+        )
+        await hass.async_block_till_done()
+    assert len(runs) == 2
+    assert caplog.text.count("Error running time pattern job") == 2
+
+    unsub_raising()
+    unsub()
+
+
 async def test_periodic_task_minute(
     hass: HomeAssistant,
     freezer: FrozenDateTimeFactory,
@@ -4468,6 +4849,100 @@ async def test_async_call_later_cancel(hass: HomeAssistant) -> None:
             assert await future, "callback not canceled"
 
 
+async def test_async_call_later_coarse(hass: HomeAssistant) -> None:
+    """Test calling an action later with the coarse timer wheel."""
+    calls: list[str] = []
+    loop_time = 1000.4
+
+    def _run_handle(handle: asyncio.TimerHandle) -> None:
+        handle._run()
+        handle.cancel()
+
+    def _action(name: str) -> Callable[[datetime], None]:
+        @callback
+        def action(now: datetime) -> None:
+            calls.append(name)
+
+        return action
+
+    with patch.object(hass.loop, "time", lambda: loop_time):
+        remove_1 = async_call_later(hass, 2, _action("1"), coarse=True)
+        remove_2 = async_call_later(hass, 2.5, _action("2"), coarse=True)
+        remove_3 = async_call_later(
+            hass, timedelta(minutes=10), _action("3"), coarse=True
+        )
+        wheel = hass.data[_TIMER_WHEEL]
+        # Both timers are due at the next full second
+        assert wheel._handle.when() == 1003
+        remove_2()
+
+        loop_time = 1003.0
+        _run_handle(wheel._handle)
+        assert calls == ["1"]
+
+        # The third timer shares a slot with an earlier tick of the wheel
+        assert wheel._handle.when() == 1601 - _TIMER_WHEEL_SLOTS
+        loop_time = 1601 - _TIMER_WHEEL_SLOTS
+        _run_handle(wheel._handle)
+        assert calls == ["1"]
+        assert wheel._handle.when() == 1601
+
+        loop_time = 1601.2
+        _run_handle(wheel._handle)
+        assert calls == ["1", "3"]
+        assert wheel._handle is None
+
+        # Removing timers that already fired does nothing
+        remove_1()
+        remove_3()
+
+        # Removing the last timer cancels the wheel timer handle
+        remove = async_call_later(hass, 1, _action("4"), coarse=True)
+        handle = wheel._handle
+        assert handle.when() == 1603
+        remove()
+        assert handle.cancelled()
+        assert wheel._handle is None
+
+
+async def test_async_call_later_coarse_raising(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a raising coarse timer does not stop the other timers of a tick."""
+    calls: list[datetime] = []
+
+    @callback
+    def raising_action(now: datetime) -> None:
+        raise ValueError("boom")
+
+    @callback
+    def action(now: datetime) -> None:
+        calls.append(now)
+
+    with patch.object(hass.loop, "time", lambda: 1000.4):
+        async_call_later(hass, 1, raising_action, coarse=True)
+        async_call_later(hass, 1, action, coarse=True)
+        wheel = hass.data[_TIMER_WHEEL]
+        handle = wheel._handle
+        handle._run()
+        handle.cancel()
+    assert len(calls) == 1
+    assert "Error running timer wheel job" in caplog.text
+
+
+async def test_async_call_later_coarse_fire_time_changed(hass: HomeAssistant) -> None:
+    """Test coarse timers fire with the event loop."""
+    future = hass.loop.create_future()
+
+    @callback
+    def action(now: datetime) -> None:
+        future.set_result(now)
+
+    async_call_later(hass, 0.01, action, coarse=True)
+    async with asyncio.timeout(2 * COARSE_TIMER_RESOLUTION):
+        assert isinstance(await future, datetime)
+
+
 async def test_track_state_change_event_chain_multple_entity(
     hass: HomeAssistant,
 ) -> None:
@@ -4978,3 +5453,48 @@ async def test_async_track_template_result_no_hass_deprecated(
     )
     assert message not in caplog.text
     caplog.clear()
+
+
+async def test_track_template_result_domain_aggregates(hass: HomeAssistant) -> None:
+    """Test trackers have the aggregates of the domains they read maintained."""
+    hass.states.async_set("light.one", "on")
+    hass.states.async_set("switch.one", "on")
+    hass.states.async_set("input_boolean.use_switches", "off")
+    states = hass.states._states
+    template = Template(
+        "{% if is_state('input_boolean.use_switches', 'on') %}"
+        "{{ state_count('switch', 'on') }}"
+        "{% else %}{{ state_count('light', 'on') }}{% endif %}",
+        hass,
+    )
+    runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.extend(update.result for update in updates)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None)], refresh_listener
+    )
+    other_info = async_track_template_result(
+        hass,
+        [TrackTemplate(Template("{{ state_count('light', 'off') }}", hass), None)],
+        refresh_listener,
+    )
+    await hass.async_block_till_done()
+    assert states._domain_aggregate_consumers == {"light": 2}
+
+    hass.states.async_set("switch.two", "on")
+    hass.states.async_set("input_boolean.use_switches", "on")
+    await hass.async_block_till_done()
+    assert runs == [2]
+    assert states._domain_aggregate_consumers == {"light": 1, "switch": 1}
+
+    other_info.async_remove()
+    assert states._domain_aggregate_consumers == {"switch": 1}
+    info.async_remove()
+    assert states._domain_aggregate_consumers == {}
+    assert states._domain_state_counts == {}
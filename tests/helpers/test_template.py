@@ -2212,6 +2212,44 @@ def test_has_value(hass: HomeAssistant) -> None:
     assert tpl.async_render() == "yes"
 
 
+def test_state_count(hass: HomeAssistant) -> None:
+    """Test counting the states of a domain."""
+    hass.states.async_set("light.one", "on")
+    hass.states.async_set("light.two", "on")
+    hass.states.async_set("light.three", "off")
+
+    info = render_to_info(hass, "{{ state_count('light', 'on') }}")
+    assert_result_info(info, 2, domains=["light"])
+    assert info.aggregate_domains == {"light"}
+    assert render(hass, "{{ state_count('light', ['on', 'off']) }}") == 3
+    assert render(hass, "{{ state_count('switch', 'on') }}") == 0
+
+    with pytest.raises(TemplateError):
+        render(hass, "{{ state_count('not a domain', 'on') }}")
+
+
+def test_numeric_state_stat(hass: HomeAssistant) -> None:
+    """Test statistics of the numeric states of a domain."""
+    hass.states.async_set("sensor.one", "1")
+    hass.states.async_set("sensor.two", "4.5")
+    hass.states.async_set("sensor.three", STATE_UNAVAILABLE)
+
+    info = render_to_info(hass, "{{ numeric_state_stat('sensor', 'sum') }}")
+    assert_result_info(info, 5.5, domains=["sensor"])
+    assert info.aggregate_domains == {"sensor"}
+    assert render(hass, "{{ numeric_state_stat('sensor', 'count') }}") == 2
+    assert render(hass, "{{ numeric_state_stat('sensor', 'min') }}") == 1
+    assert render(hass, "{{ numeric_state_stat('sensor', 'max') }}") == 4.5
+    assert render(hass, "{{ numeric_state_stat('sensor', 'mean') }}") == 2.75
+    assert render(hass, "{{ numeric_state_stat('number', 'sum') }}") == 0
+    assert render(hass, "{{ numeric_state_stat('number', 'max', 0) }}") == 0
+
+    with pytest.raises(TemplateError):
+        render(hass, "{{ numeric_state_stat('number', 'max') }}")
+    with pytest.raises(TemplateError):
+        render(hass, "{{ numeric_state_stat('sensor', 'median') }}")
+
+
 @patch(
     "homeassistant.helpers.template.TemplateEnvironment.is_safe_callable",
     return_value=True,
@@ -5170,6 +5208,148 @@ async def test_cache_garbage_collection() -> None:
     assert not template._NO_HASS_ENV.template_cache.get(template_string)
 
 
+async def test_render_info_entity_fields(hass: HomeAssistant) -> None:
+    """Test the fields of a state read by a template are collected."""
+    hass.states.async_set("sensor.a", "1", {"position": 1})
+    hass.states.async_set("sensor.b", "1", {"position": 1})
+
+    info = render_to_info(
+        hass,
+        "{{ states('sensor.a') }} {{ state_attr('sensor.b', 'position') }}"
+        " {{ states.sensor.missing }}",
+    )
+    assert info.entities == {"sensor.a", "sensor.b", "sensor.missing"}
+    assert info.entity_fields == {
+        "sensor.a": {"state"},
+        "sensor.b": {"attributes.position"},
+        "sensor.missing": set(),
+    }
+
+    old_state = hass.states.get("sensor.b")
+    hass.states.async_set("sensor.b", "2", {"position": 1})
+    assert not info.state_change_triggers_render(
+        "sensor.b", old_state, hass.states.get("sensor.b")
+    )
+    old_state = hass.states.get("sensor.b")
+    hass.states.async_set("sensor.b", "2", {"position": 2})
+    assert info.state_change_triggers_render(
+        "sensor.b", old_state, hass.states.get("sensor.b")
+    )
+
+    info = render_to_info(hass, "{{ states.sensor.b.last_changed }}")
+    assert info.entity_fields == {"sensor.b": {"last_changed"}}
+    old_state = hass.states.get("sensor.b")
+    hass.states.async_set("sensor.b", "2", {"position": 2}, force_update=True)
+    assert info.state_change_triggers_render(
+        "sensor.b", old_state, hass.states.get("sensor.b")
+    )
+
+    info = render_to_info(
+        hass,
+        "{{ states.sensor.a.attributes }} {{ states.sensor.b.last_updated }}",
+    )
+    assert info.entity_fields == {
+        "sensor.a": {"attributes"},
+        "sensor.b": {"*"},
+    }
+
+
+@pytest.mark.parametrize(
+    ("template_str", "jinja_template_str", "entity_fields"),
+    [
+        (
+            "{{ states('sensor.one') }}",
+            "{{ states('sensor.one') | string }}",
+            {"sensor.one": {"state"}},
+        ),
+        (
+            '{{states("sensor.missing")}}',
+            '{{ states("sensor.missing") | string }}',
+            {"sensor.missing": set()},
+        ),
+        (
+            "{{ is_state('sensor.one', '2.5') }}",
+            "{{ is_state('sensor.one', '2.5') | string }}",
+            {"sensor.one": {"state"}},
+        ),
+        (
+            "{{ state_attr('sensor.one', 'values') }}",
+            "{{ state_attr('sensor.one', 'values') | string }}",
+            {"sensor.one": {"attributes.values"}},
+        ),
+        (
+            "{{ state_attr('sensor.one', 'missing') }}",
+            "{{ state_attr('sensor.one', 'missing') | string }}",
+            {"sensor.one": {"attributes.missing"}},
+        ),
+    ],
+)
+def test_fast_render(
+    hass: HomeAssistant,
+    template_str: str,
+    jinja_template_str: str,
+    entity_fields: dict[str, set[str]],
+) -> None:
+    """Test trivial templates are rendered without Jinja with the same result."""
+    hass.states.async_set("sensor.one", "2.5", {"values": [1, 2]})
+    tpl = template.Template(template_str, hass)
+    with patch.object(template, "_render_with_context") as mock_render:
+        info = tpl.async_render_to_info()
+    assert not mock_render.called
+    jinja_info = render_to_info(hass, jinja_template_str)
+    assert info.result() == jinja_info.result()
+    assert info.entity_fields == jinja_info.entity_fields == entity_fields
+
+
+def test_fast_render_not_used(hass: HomeAssistant) -> None:
+    """Test templates are rendered with Jinja when the fast path does not apply."""
+    hass.states.async_set("sensor.one", "on")
+    with patch.object(
+        template, "_render_with_context", wraps=template._render_with_context
+    ) as mock_render:
+        # Variables shadowing the function
+        assert (
+            render(hass, "{{ states('sensor.one') }}", {"states": lambda x: x})
+            == "sensor.one"
+        )
+        assert render(hass, "{{ states('sensor.one', True) }}") == "on"
+        with pytest.raises(TemplateError):
+            render(hass, "{{ is_state('sensor.one') }}")
+    assert mock_render.call_count == 3
+
+    tpl = template.Template("{{ states('sensor.one') }}", hass)
+    with pytest.raises(TemplateError):
+        tpl.async_render(limited=True)
+
+
+async def test_bytecode_cache(hass: HomeAssistant) -> None:
+    """Test compiled templates are reused once they are no longer referenced."""
+    template_string = "{{ 'cached' | upper }}"
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render() == "CACHED"
+    # Templates that are no longer referenced leave the template cache
+    hass.data[template._ENVIRONMENT].template_cache.clear()
+
+    with patch("jinja2.Environment.compile") as mock_compile:
+        tpl = template.Template(template_string, hass)
+        assert tpl.async_render() == "CACHED"
+    assert not mock_compile.called
+
+
+def test_bytecode_cache_size() -> None:
+    """Test the least recently used compiled templates are dropped."""
+    with patch.object(template, "BYTECODE_CACHE_SIZE", 2):
+        bytecode_cache = template.TemplateBytecodeCache()
+    code = compile("1", "<template>", "eval")
+    bytecode_cache.set("default", "one", code)
+    bytecode_cache.set("default", "two", code)
+    assert bytecode_cache.get("default", "one") == code
+    bytecode_cache.set("default", "three", code)
+    assert bytecode_cache.get("default", "one") == code
+    assert bytecode_cache.get("default", "two") is None
+    assert bytecode_cache.get("default", "three") == code
+
+
 def test_is_template_string() -> None:
     """Test is template string."""
     assert template.is_template_string("{{ x }}") is True
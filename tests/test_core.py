@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import functools
 import gc
 import logging
+import math
 import os
 from pathlib import Path
 import re
@@ -20,6 +21,7 @@ from unittest.mock import MagicMock, Mock, PropertyMock, patch
 from freezegun import freeze_time
 import pytest
 from pytest_unordered import unordered
+from ulid_transform import ulid_to_timestamp
 import voluptuous as vol
 
 from homeassistant.const import (
@@ -65,6 +67,7 @@ from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 from homeassistant.util.read_only_dict import ReadOnlyDict
+from homeassistant.util.ulid import ulid_to_bytes
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
 from .common import (
@@ -1011,6 +1014,23 @@ def test_state_as_dict_json() -> None:
     assert state.as_dict_json is as_dict_json_1
 
 
+async def test_state_attributes_json_shared(hass: HomeAssistant) -> None:
+    """Test the serialized attributes are shared when the attributes do not change."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    state = hass.states.get("light.bowl")
+    assert state.attributes_json == b'{"brightness":100}'
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    new_state = hass.states.get("light.bowl")
+    assert new_state.attributes is state.attributes
+    assert new_state.attributes_json is state.attributes_json
+    assert new_state.as_dict_json != state.as_dict_json
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 50})
+    changed_state = hass.states.get("light.bowl")
+    assert changed_state.attributes_json == b'{"brightness":50}'
+
+
 def test_state_json_fragment() -> None:
     """Test state JSON fragments."""
     last_time = datetime(1984, 12, 8, 12, 0, 0)
@@ -1169,6 +1189,121 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_indexed_listener(hass: HomeAssistant) -> None:
+    """Test we can match events on indexed event data."""
+    calls = []
+    old_count = hass.bus.async_listeners().get("test", 0)
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen(
+        "test", listener, match={"entity_id": {"light.kitchen", "light.hall"}}
+    )
+    assert hass.bus.async_listeners()["test"] == old_count + 1
+
+    hass.bus.async_fire("test", {"entity_id": "light.bedroom"})
+    hass.bus.async_fire("test", {"other": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": ["light.kitchen"]})
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.hall"})
+    await hass.async_block_till_done()
+    assert [call.data["entity_id"] for call in calls] == [
+        "light.kitchen",
+        "light.hall",
+    ]
+
+    unsub()
+    assert hass.bus.async_listeners().get("test", 0) == old_count
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
+async def test_eventbus_indexed_listener_with_filter(hass: HomeAssistant) -> None:
+    """Test the event filter is only called for matching indexed events."""
+    calls = []
+    filtered = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def mock_filter(event_data):
+        """Mock filter."""
+        filtered.append(event_data)
+        return event_data["new_state"] == "on"
+
+    unsub = hass.bus.async_listen(
+        "test",
+        listener,
+        event_filter=mock_filter,
+        match={"entity_id": "light.kitchen"},
+    )
+
+    hass.bus.async_fire("test", {"entity_id": "light.hall", "new_state": "on"})
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "new_state": "off"})
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "new_state": "on"})
+    await hass.async_block_till_done()
+
+    assert len(filtered) == 2
+    assert len(calls) == 1
+    assert calls[0].data == {"entity_id": "light.kitchen", "new_state": "on"}
+
+    unsub()
+
+
+async def test_eventbus_indexed_listener_invalid(hass: HomeAssistant) -> None:
+    """Test invalid indexed listeners are rejected."""
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+
+    with pytest.raises(HomeAssistantError, match="exactly one event data key"):
+        hass.bus.async_listen(
+            "test", listener, match={"entity_id": {"a.b"}, "domain": {"a"}}
+        )
+    with pytest.raises(HomeAssistantError, match="Match is not supported"):
+        hass.bus.async_listen(MATCH_ALL, listener, match={"entity_id": {"a.b"}})
+
+
+async def test_eventbus_indexed_listener_removed_during_dispatch(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test indexed listeners can remove themselves while being dispatched."""
+    calls = []
+    unsubs = []
+
+    def make_listener(idx: int):
+        @ha.callback
+        def listener(event):
+            """Mock listener removing itself."""
+            calls.append(event)
+            unsubs[idx]()
+
+        return listener
+
+    unsubs.extend(
+        hass.bus.async_listen("test", make_listener(idx), match={"entity_id": {"a.b"}})
+        for idx in range(2)
+    )
+
+    hass.bus.async_fire("test", {"entity_id": "a.b"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert "test" not in hass.bus.async_listeners()
+    assert "Unable to remove unknown job listener" not in caplog.text
+
+
 async def test_eventbus_run_immediately_callback(hass: HomeAssistant) -> None:
     """Test we can call events immediately with a callback."""
     calls = []
@@ -1544,6 +1679,78 @@ async def test_statemachine_force_update(hass: HomeAssistant) -> None:
     assert len(events) == 1
 
 
+async def test_statemachine_set_many(hass: HomeAssistant) -> None:
+    """Test setting the state of multiple entities at once."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    seen_states = []
+
+    @ha.callback
+    def _listener(event: ha.Event[ha.EventStateChangedData]) -> None:
+        """Record the state machine contents when the first event fires."""
+        seen_states.append(
+            (hass.states.get("light.bowl"), hass.states.get("light.kitchen"))
+        )
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _listener)
+
+    context = ha.Context()
+    hass.states.async_set_many(
+        [
+            ("light.Bowl", "off", None),
+            ("light.kitchen", "on", {"brightness": 50}),
+            ("light.kitchen", "off", {"brightness": 50}),
+            ("light.bowl", "off", None),
+        ],
+        context=context,
+    )
+    await hass.async_block_till_done()
+
+    assert [
+        (
+            event.data["entity_id"],
+            event.data["old_state"] and event.data["old_state"].state,
+            event.data["new_state"].state,
+        )
+        for event in changed_events
+    ] == [
+        ("light.bowl", "on", "off"),
+        ("light.kitchen", None, "on"),
+        ("light.kitchen", "on", "off"),
+    ]
+    assert all(event.context is context for event in changed_events)
+    # All states are stored before the first event is fired
+    assert seen_states[0] == (
+        hass.states.get("light.bowl"),
+        hass.states.get("light.kitchen"),
+    )
+    assert hass.states.get("light.bowl").attributes == {}
+    assert hass.states.get("light.kitchen").attributes == {"brightness": 50}
+
+
+async def test_statemachine_set_many_invalid_state(hass: HomeAssistant) -> None:
+    """Test states stored before an invalid state in a batch still fire events."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with pytest.raises(InvalidStateError):
+        hass.states.async_set_many(
+            [
+                ("light.bowl", "on", None),
+                ("light.kitchen", "x" * 256, None),
+                ("light.hall", "on", None),
+            ]
+        )
+    await hass.async_block_till_done()
+
+    # The states before the invalid one are stored and their events fired,
+    # the states after it are not set
+    assert [event.data["entity_id"] for event in events] == ["light.bowl"]
+    assert events[0].data["new_state"] is hass.states.get("light.bowl")
+    assert hass.states.get("light.bowl").state == "on"
+    assert hass.states.get("light.kitchen") is None
+    assert hass.states.get("light.hall") is None
+
+
 async def test_statemachine_avoids_updating_attributes(hass: HomeAssistant) -> None:
     """Test async_set avoids recreating ReadOnly dicts when possible."""
     attrs = {"some_attr": "attr_value"}
@@ -2168,6 +2375,38 @@ def test_context() -> None:
     assert c.id is not None
 
 
+def test_context_lazy_id() -> None:
+    """Test the context id is generated when read and stays stable."""
+    with patch("homeassistant.core.time.time", return_value=1700000000.0):
+        context = ha.Context()
+    assert context._id is None
+
+    assert ulid_to_timestamp(context.id) == 1700000000000
+    assert context.id == context.id
+    assert context.id_bin == ulid_to_bytes(context.id)
+
+    context = ha.Context()
+    id_bin = context.id_bin
+    assert context.id_bin is id_bin
+    assert ulid_to_bytes(context.id) == id_bin
+    assert context.id_bin == id_bin
+
+    assert ha.Context(id="not-a-ulid").id_bin is None
+    context = ha.Context(id="01H0D6K3RFJAYAV2093ZW30PCW")
+    id_bin = context.id_bin
+    assert id_bin == ulid_to_bytes("01H0D6K3RFJAYAV2093ZW30PCW")
+    # The bytes of an explicit id are only converted once
+    with patch("homeassistant.core.ulid_to_bytes_or_none") as to_bytes:
+        assert context.id_bin is id_bin
+    assert not to_bytes.called
+
+    context = ha.Context(created=1600000000.0)
+    assert ulid_to_timestamp(context.id) == 1600000000000
+
+    event = ha.Event("test_event", time_fired_timestamp=1700000000.0)
+    assert ulid_to_timestamp(event.context.id) == 1700000000000
+
+
 def test_context_json_fragment() -> None:
     """Test context JSON fragments."""
     context1, context2 = (ha.Context(id="01H0D6K3RFJAYAV2093ZW30PCW") for _ in range(2))
@@ -2506,6 +2745,77 @@ async def test_async_entity_ids_count(hass: HomeAssistant) -> None:
     assert hass.states.async_entity_ids_count({"light", "vacuum"}) == 4
 
 
+async def test_domain_state_aggregates(hass: HomeAssistant) -> None:
+    """Test the state counts and numeric states of a domain."""
+    assert hass.states.async_domain_state_counts("light") == {}
+    assert list(hass.states.async_domain_numeric_states("sensor")) == []
+
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.frog", "on")
+    # Only the light domain is maintained, the sensor states are iterated
+    remove_light_consumer = hass.states.async_track_domain_aggregates("light")
+    hass.states.async_set("light.cow", "off")
+    hass.states.async_set("sensor.one", "1.5")
+    hass.states.async_set("sensor.two", "2")
+    hass.states.async_set("sensor.nan", "nan")
+    hass.states.async_set("sensor.unknown", "unknown")
+    assert hass.states.async_domain_state_counts("light") == {"on": 2, "off": 1}
+    assert sorted(hass.states.async_domain_numeric_states("sensor")) == [1.5, 2.0]
+
+    hass.states.async_set("light.bowl", "off")
+    hass.states.async_set("light.frog", "on", {"brightness": 100})
+    hass.states.async_remove("light.cow")
+    hass.states.async_set("sensor.two", "unavailable")
+    hass.states.async_set("sensor.unknown", "3")
+    assert hass.states.async_domain_state_counts("light") == {"on": 1, "off": 1}
+    assert sorted(hass.states.async_domain_numeric_states("sensor")) == [1.5, 3.0]
+
+    hass.states.async_remove("sensor.one")
+    assert list(hass.states.async_domain_numeric_states("sensor")) == [3.0]
+
+    states = hass.states._states
+    assert set(states._domain_state_counts) == {"light"}
+    assert set(states._domain_numeric_index) == {"light"}
+
+    # The aggregates are maintained until the last consumer is removed
+    remove_other_light_consumer = hass.states.async_track_domain_aggregates("light")
+    remove_light_consumer()
+    hass.states.async_set("light.bowl", "on")
+    assert states._domain_state_counts["light"] == {"on": 2}
+    remove_other_light_consumer()
+    assert states._domain_state_counts == {}
+    assert states._domain_numeric_index == {}
+    hass.states.async_set("light.frog", "off")
+    assert hass.states.async_domain_state_counts("light") == {"on": 1, "off": 1}
+
+
+async def test_domain_numeric_state_aggregates(hass: HomeAssistant) -> None:
+    """Test the running aggregates of the numeric states of a domain."""
+    hass.states.async_track_domain_aggregates("sensor")
+    numeric = hass.states.async_domain_numeric_states("sensor")
+    for idx in range(100):
+        hass.states.async_set(f"sensor.s{idx}", str(idx))
+    assert (numeric.sum(), numeric.min(), numeric.max()) == (4950.0, 0.0, 99.0)
+
+    # Values that changed are no longer the minimum or maximum
+    hass.states.async_set("sensor.s0", "50")
+    hass.states.async_set("sensor.s99", "unavailable")
+    assert (numeric.sum(), numeric.min(), numeric.max()) == (4901.0, 1.0, 98.0)
+
+    # The sum stays exact while values are replaced
+    hass.states.async_set("sensor.s1", "1e20")
+    hass.states.async_set("sensor.s2", "0.1")
+    hass.states.async_set("sensor.s1", "1")
+    assert numeric.sum() == math.fsum(numeric)
+
+    # Repeated updates do not grow the heaps without bound
+    for idx in range(1000):
+        hass.states.async_set("sensor.s3", str(idx))
+    assert len(numeric._min_heap) + len(numeric._max_heap) <= 4 * len(numeric) + 34
+    assert numeric.max() == 999.0
+    assert numeric.sum() == math.fsum(numeric)
+
+
 async def test_hassjob_forbid_coroutine() -> None:
     """Test hassjob forbids coroutines."""
 
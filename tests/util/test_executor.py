@@ -1,13 +1,17 @@
 """Test Home Assistant executor util."""
 
+import asyncio
+from collections.abc import Callable
 import concurrent.futures
+import threading
 import time
+from typing import Any
 from unittest.mock import patch
 
 import pytest
 
 from homeassistant.util import executor
-from homeassistant.util.executor import InterruptibleThreadPoolExecutor
+from homeassistant.util.executor import ExecutorLanes, InterruptibleThreadPoolExecutor
 
 
 async def test_executor_shutdown_can_interrupt_threads(
@@ -92,3 +96,146 @@ async def test_overall_timeout_reached(caplog: pytest.LogCaptureFixture) -> None
     assert finish - start < 3.0
 
     iexecutor.shutdown()
+
+
+async def test_executor_lanes_limit() -> None:
+    """Test jobs over the limit of a lane wait for a free worker."""
+    lanes = ExecutorLanes(asyncio.get_running_loop(), max_workers=4, default_limit=2)
+    event = threading.Event()
+
+    jobs = [lanes.async_run("slow", event.wait) for _ in range(3)]
+    other = lanes.async_run("other", time.sleep, 0)
+    stats = lanes.as_dict()
+    assert stats["running"] == 3
+    assert stats["queued"] == 1
+    assert stats["lanes"]["slow"] == {
+        "limit": 2,
+        "running": 2,
+        "queued": 1,
+        "max_queued": 1,
+        "jobs": 3,
+    }
+    await other
+
+    event.set()
+    assert await asyncio.gather(*jobs) == [True, True, True]
+    stats = lanes.as_dict()
+    assert stats["running"] == 0
+    assert stats["queued"] == 0
+    assert stats["lanes"]["slow"]["max_queued"] == 1
+
+    with pytest.raises(ValueError):
+        lanes.async_set_limit("slow", 0)
+
+
+async def test_executor_lanes_without_domain() -> None:
+    """Test jobs without a domain bypass the lanes but use the worker budget."""
+    lanes = ExecutorLanes(asyncio.get_running_loop(), max_workers=2, default_limit=1)
+    event = threading.Event()
+
+    jobs = [lanes.async_run(None, event.wait) for _ in range(2)]
+    waiting = lanes.async_run("slow", time.sleep, 0)
+    stats = lanes.as_dict()
+    assert stats["running"] == 2
+    assert stats["lanes"]["slow"]["queued"] == 1
+
+    event.set()
+    assert await asyncio.gather(*jobs) == [True, True]
+    assert await waiting is None
+    assert lanes.as_dict()["running"] == 0
+
+
+async def test_executor_lanes_round_robin() -> None:
+    """Test waiting jobs are started round robin over the lanes."""
+    lanes = ExecutorLanes(asyncio.get_running_loop(), max_workers=1)
+    started: list[str] = []
+    event = threading.Event()
+
+    blocker = lanes.async_run("blocker", event.wait)
+    jobs = [
+        lanes.async_run(domain, started.append, f"{domain}{idx}")
+        for domain in ("slow", "fast")
+        for idx in range(2)
+    ]
+    assert lanes.as_dict()["queued"] == 4
+
+    event.set()
+    await blocker
+    await asyncio.gather(*jobs)
+    assert started == ["slow0", "fast0", "slow1", "fast1"]
+
+
+async def test_executor_lanes_cancel_and_raise_limit() -> None:
+    """Test cancelling a waiting job and raising the limit of a lane."""
+    lanes = ExecutorLanes(asyncio.get_running_loop(), default_limit=1)
+    event = threading.Event()
+
+    running = lanes.async_run("slow", event.wait)
+    cancelled = lanes.async_run("slow", time.sleep, 0)
+    waiting = lanes.async_run("slow", time.sleep, 0)
+    cancelled.cancel()
+
+    lanes.async_set_limit("slow", 2)
+    assert await waiting is None
+    assert lanes.as_dict()["lanes"]["slow"]["running"] == 1
+
+    def _raise() -> None:
+        raise ValueError
+
+    failing = lanes.async_run("slow", _raise)
+    with pytest.raises(ValueError):
+        await failing
+    event.set()
+    assert await running is True
+
+
+async def test_executor_lanes_attributed_when_contended() -> None:
+    """Test jobs are only attributed to lanes once enough jobs run."""
+    attributed: list[Callable[..., Any]] = []
+
+    def _job_lane(
+        task: asyncio.Task[Any] | None, target: Callable[..., Any]
+    ) -> str | None:
+        attributed.append(target)
+        return "slow"
+
+    lanes = ExecutorLanes(
+        asyncio.get_running_loop(), max_workers=4, default_limit=2, job_lane=_job_lane
+    )
+    event = threading.Event()
+
+    jobs = [lanes.async_run_for_task(None, event.wait) for _ in range(2)]
+    assert attributed == []
+    assert lanes.as_dict()["lanes"] == {}
+
+    # The running jobs count towards the lane once it can be full
+    jobs.append(lanes.async_run_for_task(None, event.wait))
+    assert attributed == [event.wait] * 3
+    assert lanes.as_dict()["lanes"]["slow"] == {
+        "limit": 2,
+        "running": 2,
+        "queued": 1,
+        "max_queued": 1,
+        "jobs": 3,
+    }
+
+    event.set()
+    assert await asyncio.gather(*jobs) == [True, True, True]
+    assert lanes.as_dict()["running"] == 0
+    assert lanes.as_dict()["lanes"]["slow"]["running"] == 0
+
+
+async def test_executor_lanes_nested_job() -> None:
+    """Test jobs added by a running job are not queued behind it."""
+    loop = asyncio.get_running_loop()
+    lanes = ExecutorLanes(loop, max_workers=1, default_limit=1)
+
+    async def _add_inner_job() -> None:
+        await lanes.async_run("slow", time.sleep, 0)
+
+    def _outer_job() -> None:
+        asyncio.run_coroutine_threadsafe(_add_inner_job(), loop).result()
+
+    await asyncio.wait_for(lanes.async_run("slow", _outer_job), 5)
+    assert lanes.as_dict()["lanes"]["slow"]["jobs"] == 1
+    assert lanes.as_dict()["running"] == 0
@@ -0,0 +1,138 @@
+"""Test the task stats util."""
+
+import asyncio
+import functools
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.task_stats import (
+    TaskStats,
+    callable_domain,
+    coroutine_domain,
+    executor_job_domain,
+    filename_domain,
+)
+
+_INTEGRATION_SOURCE = """
+def job(event):
+    event.wait()
+    return 1
+
+async def coro(event):
+    await event.wait()
+    return 1
+
+async def add_job(hass, target, *args):
+    return await hass.async_add_executor_job(target, *args)
+"""
+
+
+def _integration_namespace(filename: str) -> dict[str, Any]:
+    """Return the namespace of code compiled as if it is part of a file."""
+    namespace: dict[str, Any] = {}
+    exec(compile(_INTEGRATION_SOURCE, filename, "exec"), namespace)  # noqa: S102
+    return namespace
+
+
+@pytest.mark.parametrize(
+    ("filename", "domain"),
+    [
+        ("/srv/homeassistant/components/hue/light.py", "hue"),
+        ("/config/custom_components/my_lights/light.py", "my_lights"),
+        ("/srv/homeassistant/components/hue.py", "hue"),
+        ("/srv/homeassistant/helpers/event.py", "homeassistant"),
+        ("/venv/lib/python3.12/site-packages/aiohue/v2/controllers.py", "aiohue"),
+        ("/venv/lib/python3.12/site-packages/six.py", "six"),
+        ("<string>", "unknown"),
+    ],
+)
+def test_filename_domain(filename: str, domain: str) -> None:
+    """Test attributing a source file to an integration."""
+    assert filename_domain(filename) == domain
+
+
+def test_callable_and_coroutine_domain() -> None:
+    """Test attributing callables and coroutines to an integration."""
+    namespace = _integration_namespace("/srv/homeassistant/components/slow/sensor.py")
+    assert callable_domain(namespace["job"]) == "slow"
+    assert callable_domain(functools.partial(namespace["job"], None)) == "slow"
+    assert callable_domain(TaskStats().as_dict) == "homeassistant"
+    assert callable_domain(print) == "builtins"
+
+    coro = namespace["coro"](None)
+    assert coroutine_domain(coro) == "slow"
+    coro.close()
+
+
+async def test_executor_job_domain(hass: HomeAssistant) -> None:
+    """Test executor jobs are run in the lane of the integration adding them."""
+    namespace = _integration_namespace("/srv/homeassistant/components/slow/sensor.py")
+    assert executor_job_domain(None, namespace["job"]) == ("slow", True)
+    assert executor_job_domain(None, print) == ("builtins", False)
+    task_stats = hass.task_stats = TaskStats()
+
+    # Library calls count towards the integration making them
+    await hass.async_create_task(namespace["add_job"](hass, time.sleep, 0))
+    assert hass.executor_lanes.as_dict()["lanes"]["slow"]["jobs"] == 1
+    assert task_stats.as_dict()["domains"]["slow"]["executor_jobs"] == 1
+
+    # Jobs that are not run for an integration bypass the lanes
+    await hass.async_add_executor_job(time.sleep, 0)
+    assert "time" not in hass.executor_lanes.as_dict()["lanes"]
+    assert task_stats.as_dict()["domains"]["time"]["executor_jobs"] == 1
+    hass.task_stats = None
+
+
+async def test_task_stats(hass: HomeAssistant) -> None:
+    """Test tasks and executor jobs are accounted per integration."""
+    namespace = _integration_namespace("/srv/homeassistant/components/slow/sensor.py")
+    task_stats = hass.task_stats = TaskStats()
+
+    event = asyncio.Event()
+    task = hass.async_create_task(namespace["coro"](event))
+    background_task = hass.async_create_background_task(
+        namespace["coro"](event), "slow background"
+    )
+    thread_event = threading.Event()
+    job = hass.async_add_executor_job(namespace["job"], thread_event)
+
+    stats = task_stats.as_dict()["domains"]["slow"]
+    assert stats["tasks_created"] == 2
+    assert stats["tasks_in_flight"] == 2
+    assert stats["executor_jobs"] == 1
+    assert stats["executor_in_flight"] == 1
+
+    event.set()
+    thread_event.set()
+    assert await task == 1
+    assert await background_task == 1
+    assert await job == 1
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    stats = task_stats.as_dict()["domains"]["slow"]
+    assert stats["tasks_created"] == 2
+    assert stats["tasks_in_flight"] == 0
+    assert stats["tasks_per_second"] > 0
+    assert stats["executor_jobs"] == 1
+    assert stats["executor_in_flight"] == 0
+    assert stats["executor_run_total_ms"] > 0
+    assert stats["executor_run_max_ms"] == stats["executor_run_total_ms"]
+    assert stats["executor_wait_max_ms"] == stats["executor_wait_total_ms"]
+
+    # Tasks that finish eagerly are counted but are never in flight
+    assert await hass.async_create_task(namespace["coro"](event)) == 1
+    assert task_stats.as_dict()["domains"]["slow"]["tasks_created"] == 3
+
+    task_stats.async_reset()
+    stats = task_stats.as_dict()["domains"]["slow"]
+    assert stats["tasks_created"] == 0
+    assert stats["executor_jobs"] == 0
+    assert stats["executor_run_total_ms"] == 0
+
+    hass.task_stats = None
+    await hass.async_add_executor_job(namespace["job"], thread_event)
+    assert task_stats.as_dict()["domains"]["slow"]["executor_jobs"] == 0